@@ -3,6 +3,7 @@ import pandas as pd  # Biblioteca para manipulação e análise de dados (DataFr
 import os  # Biblioteca para interagir com o sistema de arquivos e variáveis de ambiente
 from pathlib import Path  # Biblioteca para manipulação de caminhos de arquivos e pastas
 from dotenv import load_dotenv  # Biblioteca para carregar variáveis de ambiente a partir de um arquivo .env
+from utils.price_store import PriceStore  # Armazenamento binário (memmap) para leituras rápidas por intervalo de datas
 
 # Carrega as variáveis de ambiente do arquivo .env (se existir)
 if os.path.exists(".env"):
@@ -14,13 +15,21 @@ else:
 API_KEY = os.getenv("ALPHA_VANTAGE_API_KEY")  # Chave de acesso à API
 URL = os.getenv("ALPHA_VANTAGE_URL")  # URL da API
 
+# Chaves com que a Alpha Vantage responde (código 200) quando o limite de chamadas é atingido
+THROTTLE_KEYS = ("Note", "Information")
+
+class ApiThrottled(Exception):
+    """A Alpha Vantage recusou o pedido por excesso de chamadas (por minuto ou por dia)."""
+
 # Função para buscar dados da API da Alpha Vantage
-def fetch_stock_data(symbol):
+def fetch_stock_data(symbol, session=None, raise_on_throttle=False):
     """
     Busca os dados mensais ajustados de ações na API Alpha Vantage.
     
     Args:
         symbol (str): Símbolo da ação que queremos buscar.
+        session (requests.Session): Sessão HTTP partilhada entre pedidos (opcional, reutiliza as ligações).
+        raise_on_throttle (bool): Lança ApiThrottled quando o limite de chamadas é atingido, em vez de devolver None.
         
     Retorna:
         dict: Dados da ação em formato JSON, ou None em caso de erro.
@@ -34,13 +43,17 @@ def fetch_stock_data(symbol):
     }
 
     # Faz a solicitação GET para a API com os parâmetros definidos
-    response = requests.get(URL, params=params)
+    response = (session or requests).get(URL, params=params)
     
     # Verifica se a solicitação foi bem-sucedida (código HTTP 200)
     if response.status_code == 200:
         try:
             # Tenta converter a resposta da API de JSON para um dicionário Python
             data = response.json()
+
+            # Limite de chamadas atingido: quem gere uma quota precisa de parar, não só de saltar o símbolo
+            if raise_on_throttle and any(key in data for key in THROTTLE_KEYS):
+                raise ApiThrottled(next(data[key] for key in THROTTLE_KEYS if key in data))
             
             # Verifica se a chave "Monthly Adjusted Time Series" existe nos dados retornados
             if "Monthly Adjusted Time Series" in data:
@@ -51,6 +64,8 @@ def fetch_stock_data(symbol):
         except ValueError as e:
             # Exibe um erro caso haja problemas ao interpretar os dados JSON
             print(f"Erro ao interpretar o JSON: {e}")
+    elif response.status_code == 429 and raise_on_throttle:
+        raise ApiThrottled(f"Código {response.status_code}")
     else:
         # Exibe um erro caso a solicitação HTTP tenha falhado
         print(f"Erro ao buscar dados: Código {response.status_code}")
@@ -151,6 +166,9 @@ def main():
         
         # Salva os dados no arquivo CSV
         save_to_csv(df, symbol)
+
+        # Atualiza também o armazenamento binário da série (leituras por intervalo sem parsing)
+        PriceStore().write(symbol, df)
         
         # Exibe as primeiras 5 linhas do DataFrame no console
         print(df.head())
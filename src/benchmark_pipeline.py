@@ -0,0 +1,91 @@
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+import api_v2
+import webscraping_beautifulsoup
+from standin_servers import start_standin_server
+
+def _report(stage: str, results: list, elapsed: float):
+    succeeded = sum(1 for result in results if result)
+    print(f"📊 {stage}: {len(results)} calls in {elapsed:.2f}s "
+          f"({len(results) / elapsed if elapsed else 0:.1f}/s), {succeeded} ok, {len(results) - succeeded} failed")
+
+def benchmark_stocks(base_url: str, symbols: int, workers: int):
+    """Fetch and process the monthly adjusted series of `symbols` synthetic tickers."""
+    api_v2.URL = f"{base_url}/query"
+    api_v2.API_KEY = "standin"
+
+    def run(i):
+        time_series = api_v2.fetch_stock_data(f"SYM{i:04d}.LS")
+        return time_series is not None and not api_v2.process_data(time_series).empty
+
+    started_at = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(run, range(symbols)))
+    _report("Stocks (fetch_stock_data + process_data)", results, time.perf_counter() - started_at)
+
+def benchmark_currencies(base_url: str, pairs: int, workers: int):
+    """Fetch `pairs` currency rates from the x-rates stand-in."""
+    webscraping_beautifulsoup.CURRENCY_PAGE_URL = f"{base_url}/calculator/"
+    currencies = ["EUR", "USD", "GBP", "CHF", "JPY", "PLN", "BRL", "CAD"]
+
+    def run(i):
+        curr_from = currencies[i % len(currencies)]
+        curr_to = currencies[(i + 1 + i // len(currencies)) % len(currencies)]
+        return webscraping_beautifulsoup.fetch_currency_rates(curr_from, curr_to) is not None
+
+    started_at = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(run, range(pairs)))
+    _report("FX (fetch_currency_rates)", results, time.perf_counter() - started_at)
+
+def benchmark_news(base_url: str, pages: int, profile: str):
+    """Scrape `pages` search pages from the news stand-in with a real browser."""
+    # webscraping_selenium requires NEWS_PAGE_URL at import time, so it is imported once the stand-in is up
+    os.environ["NEWS_PAGE_URL"] = f"{base_url}/search"
+    import undetected_chromedriver as uc
+    import webscraping_selenium
+    from utils import browser_profiles
+    webscraping_selenium.NEWS_PAGE_URL = os.environ["NEWS_PAGE_URL"]
+
+    driver = uc.Chrome(options=browser_profiles.build_chrome_options(profile),
+                       headless=browser_profiles.get_profile(profile)["headless"])
+    try:
+        browser_profiles.apply_profile(driver, profile)
+        results = []
+        started_at = time.perf_counter()
+        for page in range(1, pages + 1):
+            url = webscraping_selenium.build_search_url(webscraping_selenium.PARAMS_TEMPLATE["kw"], page)
+            results.append(len(webscraping_selenium.scrape_news(driver, url)) > 0)
+        _report(f"News (scrape_news, profile '{profile}')", results, time.perf_counter() - started_at)
+    finally:
+        driver.quit()
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure pipeline throughput against the local stand-in servers (no network access).")
+    parser.add_argument("--symbols", type=int, default=1000)
+    parser.add_argument("--currency-pairs", type=int, default=100)
+    parser.add_argument("--news-pages", type=int, default=100, help="0 skips the browser-based news stage")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent fetches for the stock and FX stages")
+    parser.add_argument("--profile", default="lightweight", help="Browser profile for the news stage")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every stand-in response")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = start_standin_server(latency=args.latency, error_rate=args.error_rate,
+                                  throttle_rate=args.throttle_rate, news_pages=args.news_pages, seed=42)
+    print(f"🧪 Stand-in servers on {server.base_url}")
+    try:
+        if args.symbols:
+            benchmark_stocks(server.base_url, args.symbols, args.workers)
+        if args.currency_pairs:
+            benchmark_currencies(server.base_url, args.currency_pairs, args.workers)
+        if args.news_pages:
+            benchmark_news(server.base_url, args.news_pages, args.profile)
+    finally:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,302 @@
+import argparse
+import json
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+import requests
+import undetected_chromedriver as uc
+from selenium import webdriver
+from selenium.webdriver.chromium.remote_connection import ChromiumRemoteConnection
+from utils import browser_profiles
+
+DEFAULT_PORT = 8766
+DAEMON_URL = os.getenv("BROWSER_DAEMON_URL", f"http://127.0.0.1:{DEFAULT_PORT}")
+DEFAULT_SESSIONS = 2
+LEASE_TIMEOUT = 300         # seconds a lease lasts without a heartbeat
+LEASE_WAIT = 60             # seconds a client waits for an idle session
+HEALTH_CHECK_TIMEOUT = 10   # seconds for a session to answer before it is replaced
+REAP_INTERVAL = 5           # seconds between checks for expired leases
+
+def launch_driver(profile_name: str):
+    """Start a patched Chrome with a browser profile applied (the slow part the daemon keeps warm)."""
+    driver = uc.Chrome(options=browser_profiles.build_chrome_options(profile_name),
+                       headless=browser_profiles.get_profile(profile_name)["headless"])
+    browser_profiles.apply_profile(driver, profile_name)
+    return driver
+
+class BrowserPool:
+    """
+    Warm Chrome sessions handed out as time-limited leases.
+
+    A session is health-checked before each lease (and replaced if it does not answer),
+    reset to a blank page when it comes back, and reclaimed when its lease expires.
+    """
+
+    def __init__(self, profile_name: str = "lightweight", size: int = DEFAULT_SESSIONS, driver_factory=launch_driver):
+        self.profile_name = profile_name
+        self.size = size
+        self.driver_factory = driver_factory
+        self.sessions = []
+        self._lock = threading.Lock()
+        self._checks = ThreadPoolExecutor(max_workers=size)
+
+    def start(self):
+        for _ in range(self.size):
+            self.sessions.append({"driver": self.driver_factory(self.profile_name), "lease_id": None, "deadline": None, "leases": 0})
+        print(f"🔥 {self.size} warm '{self.profile_name}' browser sessions ready.")
+
+    def _is_healthy(self, driver) -> bool:
+        try:
+            return self._checks.submit(driver.execute_script, "return 1").result(timeout=HEALTH_CHECK_TIMEOUT) == 1
+        except (FutureTimeoutError, Exception):     # no answer in time, or the browser is gone
+            return False
+
+    def _replace_driver(self, session: dict):
+        try:
+            session["driver"].quit()
+        except Exception:
+            pass
+        session["driver"] = self.driver_factory(self.profile_name)
+        print("♻️ Unhealthy browser session replaced.")
+
+    def lease(self, timeout: float = LEASE_TIMEOUT):
+        """
+        Lease an idle session.
+
+        :return: Lease details (lease_id, executor_url, session_id, profile), or None if every session is leased.
+        """
+        with self._lock:
+            session = next((session for session in self.sessions if session["lease_id"] is None), None)
+            if session is None:
+                return None
+            session["lease_id"] = uuid.uuid4().hex
+            session["deadline"] = time.monotonic() + timeout
+
+        if not self._is_healthy(session["driver"]):
+            try:
+                self._replace_driver(session)
+            except Exception as e:
+                print(f"❌ Error starting a browser session: {e}")
+                with self._lock:
+                    session["lease_id"] = session["deadline"] = None
+                return None
+        session["leases"] += 1
+
+        driver = session["driver"]
+        return {
+            "lease_id": session["lease_id"],
+            "executor_url": driver.service.service_url,
+            "session_id": driver.session_id,
+            "profile": self.profile_name,
+            "timeout": timeout,
+        }
+
+    def _find(self, lease_id: str):
+        return next((session for session in self.sessions if lease_id and session["lease_id"] == lease_id), None)
+
+    def heartbeat(self, lease_id: str, timeout: float = LEASE_TIMEOUT) -> bool:
+        with self._lock:
+            session = self._find(lease_id)
+            if session is None:
+                return False
+            session["deadline"] = time.monotonic() + timeout
+            return True
+
+    def release(self, lease_id: str) -> bool:
+        with self._lock:
+            session = self._find(lease_id)
+            if session is None:
+                return False
+        try:
+            session["driver"].get("about:blank")
+        except Exception:
+            pass    # the next health check replaces it
+        with self._lock:
+            session["lease_id"] = session["deadline"] = None
+        return True
+
+    def reap(self) -> int:
+        """Reclaim the sessions whose lease expired (the client crashed or stopped sending heartbeats)."""
+        now = time.monotonic()
+        with self._lock:
+            expired = [session["lease_id"] for session in self.sessions if session["lease_id"] and session["deadline"] < now]
+        for lease_id in expired:
+            print(f"⌛ Lease {lease_id[:8]} expired, session reclaimed.")
+            self.release(lease_id)
+        return len(expired)
+
+    def status(self) -> dict:
+        with self._lock:
+            now = time.monotonic()
+            return {
+                "profile": self.profile_name,
+                "sessions": [{
+                    "leased": session["lease_id"] is not None,
+                    "expires_in": round(session["deadline"] - now, 1) if session["deadline"] else None,
+                    "leases": session["leases"],
+                } for session in self.sessions],
+            }
+
+    def close(self):
+        for session in self.sessions:
+            try:
+                session["driver"].quit()
+            except Exception:
+                pass
+        self._checks.shutdown(wait=False)
+
+class BrowserDaemonHandler(BaseHTTPRequestHandler):
+    """JSON API: POST /lease, /heartbeat, /release and GET /status."""
+
+    def do_GET(self):
+        if urlparse(self.path).path == "/status":
+            return self._send(200, self.server.pool.status())
+        return self._send(404, {"error": "Unknown path"})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length) or b"{}")
+        pool = self.server.pool
+        path = urlparse(self.path).path
+
+        if path == "/lease":
+            lease = pool.lease(float(body.get("timeout", LEASE_TIMEOUT)))
+            return self._send(200, lease) if lease else self._send(503, {"error": "No idle browser session"})
+        if path == "/heartbeat":
+            ok = pool.heartbeat(body.get("lease_id"), float(body.get("timeout", LEASE_TIMEOUT)))
+            return self._send(200, {"ok": True}) if ok else self._send(404, {"error": "Unknown or expired lease"})
+        if path == "/release":
+            ok = pool.release(body.get("lease_id"))
+            return self._send(200, {"ok": True}) if ok else self._send(404, {"error": "Unknown or expired lease"})
+        return self._send(404, {"error": "Unknown path"})
+
+    def _send(self, status: int, body: dict):
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_daemon(pool: BrowserPool, port: int = 0) -> ThreadingHTTPServer:
+    """
+    Serve the pool's leases in background threads (plus a reaper for expired leases).
+
+    :param pool: Started BrowserPool.
+    :param port: Port to listen on (0 picks a free one).
+    :return: The running server; its URL is `server.base_url`. Stop it with `server.shutdown()`.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", port), BrowserDaemonHandler)
+    server.daemon_threads = True
+    server.pool = pool
+    server.base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    def reap_forever():
+        while True:
+            time.sleep(REAP_INTERVAL)
+            pool.reap()
+
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    threading.Thread(target=reap_forever, daemon=True).start()
+    return server
+
+class AttachedChrome(webdriver.Remote):
+    """
+    Remote WebDriver attached to a session that already exists in the daemon's chromedriver,
+    instead of creating a new one. `quit()` only detaches: the browser stays warm in the daemon.
+    """
+
+    def __init__(self, executor_url: str, session_id: str):
+        self._attach_session_id = session_id
+        connection = ChromiumRemoteConnection(executor_url, vendor_prefix="goog", browser_name="chrome")
+        super().__init__(command_executor=connection, options=webdriver.ChromeOptions())
+
+    def start_session(self, capabilities: dict) -> None:
+        self.session_id = self._attach_session_id
+        self.caps = {}
+
+    def execute_cdp_cmd(self, cmd: str, cmd_args: dict):
+        return self.execute("executeCdpCommand", {"cmd": cmd, "params": cmd_args})["value"]
+
+    def quit(self):
+        self.session_id = None
+
+class DriverLease:
+    """
+    A daemon session leased by a scraper run, kept alive by heartbeats until released.
+
+    Usage:
+        with DriverLease() as driver:
+            driver.get(url)
+    """
+
+    def __init__(self, daemon_url: str = DAEMON_URL, timeout: float = LEASE_TIMEOUT, wait: float = LEASE_WAIT):
+        self.daemon_url = daemon_url.rstrip("/")
+        self.timeout = timeout
+        deadline = time.monotonic() + wait
+        while True:
+            response = requests.post(f"{self.daemon_url}/lease", json={"timeout": timeout}, timeout=HEALTH_CHECK_TIMEOUT + 5)
+            if response.status_code == 200:
+                break
+            if response.status_code != 503 or time.monotonic() > deadline:
+                raise TimeoutError(f"No browser session leased from {self.daemon_url}: {response.status_code} {response.text}")
+            time.sleep(0.5)
+
+        self.lease = response.json()
+        self.driver = AttachedChrome(self.lease["executor_url"], self.lease["session_id"])
+        self._stop = threading.Event()
+        threading.Thread(target=self._heartbeat, daemon=True).start()
+
+    def _heartbeat(self):
+        while not self._stop.wait(self.timeout / 3):
+            try:
+                requests.post(f"{self.daemon_url}/heartbeat", json={"lease_id": self.lease["lease_id"], "timeout": self.timeout}, timeout=5)
+            except requests.exceptions.RequestException as e:
+                print(f"⚠️ Browser daemon heartbeat failed: {e}")
+
+    def release(self):
+        """Hand the session back to the daemon (the browser keeps running)."""
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        self.driver.quit()
+        try:
+            requests.post(f"{self.daemon_url}/release", json={"lease_id": self.lease["lease_id"]}, timeout=HEALTH_CHECK_TIMEOUT + 5)
+        except requests.exceptions.RequestException as e:
+            print(f"⚠️ Could not release the browser session (it is reclaimed when the lease expires): {e}")
+
+    def __enter__(self):
+        return self.driver
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
+
+def main():
+    parser = argparse.ArgumentParser(description="Keep warm Chrome sessions that scraper runs lease through remote WebDriver.")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--sessions", type=int, default=DEFAULT_SESSIONS, help=f"Browser sessions to keep warm (default: {DEFAULT_SESSIONS})")
+    parser.add_argument("--profile", default="lightweight", choices=list(browser_profiles.BROWSER_PROFILES))
+    args = parser.parse_args()
+
+    pool = BrowserPool(args.profile, args.sessions)
+    pool.start()
+    server = start_daemon(pool, args.port)
+    print(f"🚀 Browser daemon listening on {server.base_url} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        print("🛑 Stopping the browser daemon...")
+    finally:
+        server.shutdown()
+        pool.close()
+
+if __name__ == "__main__":
+    main()
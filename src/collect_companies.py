@@ -0,0 +1,146 @@
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+import undetected_chromedriver as uc
+import company_registry
+import browser_daemon
+import stream_stocks
+from utils import save_tools, browser_profiles
+from webscraping_beautifulsoup import fetch_currency_rates
+from webscraping_selenium import build_search_url, scrape_news, load_existing_news
+
+DEFAULT_NEWS_PAGES = 3
+DEFAULT_FX_TARGETS = ["USD"]
+
+def create_session() -> requests.Session:
+    """One keep-alive HTTP session for every API and x-rates call of the run."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+@contextmanager
+def browser_session(profile_name: str = "lightweight", daemon_url: str = None):
+    """One browser for every company: leased from browser_daemon.py if `daemon_url` is given, started otherwise."""
+    if daemon_url:
+        with browser_daemon.DriverLease(daemon_url) as driver:
+            yield driver
+        return
+
+    driver = uc.Chrome(options=browser_profiles.build_chrome_options(profile_name),
+                       headless=browser_profiles.get_profile(profile_name)["headless"])
+    try:
+        browser_profiles.apply_profile(driver, profile_name)
+        yield driver
+    finally:
+        driver.quit()
+
+def collect_stocks(companies: list, session: requests.Session) -> int:
+    """Stream the prices of every ticker (each listed once) into the database."""
+    symbols = list(dict.fromkeys(ticker for company in companies for ticker in company["tickers"]))
+    return stream_stocks.stream_symbols(symbols, session=session)
+
+def collect_fx(companies: list, targets: list, session: requests.Session) -> int:
+    """Fetch the rate of each distinct (reporting currency, target) pair once."""
+    collected = 0
+    for curr_from, curr_to in company_registry.fx_pairs(companies, targets):
+        df = fetch_currency_rates(curr_from, curr_to, session=session)
+        if df is not None:
+            save_tools.save_to_csv(df, f"currency_exchange_rate_{curr_from}_{curr_to}.csv", append_data=True)
+            collected += len(df)
+    return collected
+
+def crawl_keyword(driver, keyword: str, max_pages: int, known_titles: set) -> list:
+    """
+    Scrape the newest search pages of a keyword until a page brings nothing new
+    (results are sorted by release date, so older pages are already known).
+
+    :param known_titles: Titles already saved; updated with the new ones.
+    """
+    new_articles = []
+    for page in range(1, max_pages + 1):
+        articles = [article for article in scrape_news(driver, build_search_url(keyword, page))
+                    if article["Title"] not in known_titles]
+        if not articles:
+            break
+        known_titles.update(article["Title"] for article in articles)
+        new_articles.extend(articles)
+    return new_articles
+
+def collect_news(companies: list, driver, max_pages: int = DEFAULT_NEWS_PAGES) -> int:
+    collected = 0
+    for company in companies:
+        filename = company_registry.news_filename(company)
+        known_titles = set(load_existing_news(filename, usecols=["Title"])["Title"].tolist())
+        new_articles = []
+        for keyword in company["keywords"]:
+            new_articles.extend(crawl_keyword(driver, keyword, max_pages, known_titles))
+        if new_articles:
+            save_tools.save_to_csv(pd.DataFrame(new_articles), filename, append_data=True)
+        print(f"📰 {company['name']}: {len(new_articles)} new articles")
+        collected += len(new_articles)
+    return collected
+
+def collect_all(companies: list, stocks: bool = True, fx: bool = True, news: bool = True, fx_targets: list = DEFAULT_FX_TARGETS,
+                news_pages: int = DEFAULT_NEWS_PAGES, profile_name: str = "lightweight", daemon_url: str = None) -> dict:
+    """
+    Collect stocks, FX and news for every company in one pass. API and x-rates calls share one
+    HTTP session and run in a background thread while the browser scrapes the news; the database
+    engine's connection pool is shared by every load.
+
+    :return: Rows collected per dataset.
+    """
+    collected = {"stocks": 0, "fx": 0, "news": 0}
+    session = create_session()
+
+    def collect_http():
+        if stocks:
+            collected["stocks"] = collect_stocks(companies, session)
+        if fx:
+            collected["fx"] = collect_fx(companies, fx_targets, session)
+
+    http_worker = ThreadPoolExecutor(max_workers=1)
+    http_result = http_worker.submit(collect_http)
+    try:
+        if news:
+            with browser_session(profile_name, daemon_url) as driver:
+                collected["news"] = collect_news(companies, driver, news_pages)
+    finally:
+        http_worker.shutdown(wait=True)
+        session.close()
+        # reported even when the news failed too, whose error is the one raised then
+        if http_result.exception() is not None:
+            print(f"❌ Stocks/FX collection failed: {http_result.exception()}")
+    http_result.result()    # a failed API/x-rates run must not look like 0 rows collected
+    return collected
+
+def main():
+    parser = argparse.ArgumentParser(description="Collect stocks, news and FX rates for every company of the registry in one pass.")
+    parser.add_argument("companies", nargs="*", help="Company names (default: every registered company)")
+    parser.add_argument("--registry", default=None, help="JSON company registry (default: company_registry.COMPANIES)")
+    parser.add_argument("--no-stocks", action="store_true")
+    parser.add_argument("--no-fx", action="store_true")
+    parser.add_argument("--no-news", action="store_true")
+    parser.add_argument("--fx-to", nargs="+", default=DEFAULT_FX_TARGETS, help="Currencies to convert the reporting currencies to (default: USD)")
+    parser.add_argument("--news-pages", type=int, default=DEFAULT_NEWS_PAGES, help=f"Maximum search pages per keyword (default: {DEFAULT_NEWS_PAGES})")
+    parser.add_argument("--profile", default="lightweight", choices=list(browser_profiles.BROWSER_PROFILES))
+    parser.add_argument("--daemon", nargs="?", const=browser_daemon.DAEMON_URL, default=None, metavar="URL",
+                        help="Lease a warm browser from browser_daemon.py instead of starting one")
+    args = parser.parse_args()
+
+    registry = company_registry.load_registry(args.registry)
+    companies = [company_registry.get_company(name, registry) for name in args.companies] if args.companies else registry
+
+    started_at = time.perf_counter()
+    collected = collect_all(companies, stocks=not args.no_stocks, fx=not args.no_fx, news=not args.no_news,
+                            fx_targets=args.fx_to, news_pages=args.news_pages, profile_name=args.profile, daemon_url=args.daemon)
+    print(f"⏱️ {len(companies)} companies in {time.perf_counter() - started_at:.1f}s: "
+          f"{collected['stocks']} price rows, {collected['fx']} rates, {collected['news']} articles")
+
+if __name__ == "__main__":
+    main()
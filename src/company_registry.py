@@ -0,0 +1,83 @@
+import json
+
+DEFAULT_COMPANY = "Jerónimo Martins"
+
+# Companies followed by the collectors:
+# - keywords: news search queries (quoted for an exact match)
+# - tickers: Alpha Vantage symbols (the first one is the main listing)
+# - currency: reporting currency, converted to the FX targets of the batch runner
+# - aliases: lowercase, accent-free names tag_news.py looks for in articles
+COMPANIES = [
+    {"name": "Jerónimo Martins", "keywords": ['"jerónimo martins"'], "tickers": ["JMT.LS"], "currency": "EUR",
+     "aliases": ["jeronimo martins", "pingo doce", "biedronka"]},
+    {"name": "Galp Energia", "keywords": ['"galp"'], "tickers": ["GALP.LS"], "currency": "EUR",
+     "aliases": ["galp"]},
+    {"name": "EDP", "keywords": ['"edp"'], "tickers": ["EDP.LS"], "currency": "EUR",
+     "aliases": ["edp", "energias de portugal"]},
+    {"name": "EDP Renováveis", "keywords": ['"edp renováveis"'], "tickers": ["EDPR.LS"], "currency": "EUR",
+     "aliases": ["edp renovaveis", "edpr"]},
+    {"name": "Sonae", "keywords": ['"sonae"'], "tickers": ["SON.LS"], "currency": "EUR",
+     "aliases": ["sonae", "continente"]},
+    {"name": "BCP", "keywords": ['"millennium bcp"'], "tickers": ["BCP.LS"], "currency": "EUR",
+     "aliases": ["bcp", "millennium bcp", "banco comercial portugues"]},
+    {"name": "NOS", "keywords": ['"nos sgps"'], "tickers": ["NOS.LS"], "currency": "EUR",
+     "aliases": ["nos sgps"]},
+    {"name": "Navigator", "keywords": ['"the navigator company"'], "tickers": ["NVG.LS"], "currency": "EUR",
+     "aliases": ["navigator company", "the navigator"]},
+    {"name": "Mota-Engil", "keywords": ['"mota-engil"'], "tickers": ["EGL.LS"], "currency": "EUR",
+     "aliases": ["mota-engil", "mota engil"]},
+    {"name": "CTT", "keywords": ['"ctt correios"'], "tickers": ["CTT.LS"], "currency": "EUR",
+     "aliases": ["ctt"]},
+]
+REQUIRED_FIELDS = ["name", "keywords", "tickers", "currency"]
+
+def load_registry(path: str = None) -> list:
+    """
+    Load the companies from a JSON file (a list of objects with the COMPANIES fields), or the built-in list.
+
+    :param path: JSON file path (None: COMPANIES).
+    """
+    if path is None:
+        return [dict(company) for company in COMPANIES]
+
+    with open(path, encoding="utf-8") as file:
+        companies = json.load(file)
+    for company in companies:
+        missing = [field for field in REQUIRED_FIELDS if not company.get(field)]
+        if missing:
+            raise ValueError(f"Company {company.get('name', '?')} in {path} is missing: {', '.join(missing)}")
+        company.setdefault("aliases", [company["name"].lower()])
+    return companies
+
+def get_company(name: str, companies: list = None) -> dict:
+    for company in companies or COMPANIES:
+        if company["name"].lower() == name.lower():
+            return company
+    raise ValueError(f"Unknown company '{name}'")
+
+def add_company_arguments(parser):
+    """`company`, `--all` and `--registry` options of the scripts that work on the news of a company."""
+    parser.add_argument("company", nargs="?", default=DEFAULT_COMPANY, help=f"Company name (default: {DEFAULT_COMPANY})")
+    parser.add_argument("--all", action="store_true", help="Every company of the registry")
+    parser.add_argument("--registry", default=None, help="JSON company registry (default: company_registry.COMPANIES)")
+
+def select_companies(args) -> tuple:
+    """
+    Resolve the `add_company_arguments` options.
+
+    :return: (whole registry, selected companies).
+    """
+    registry = load_registry(args.registry)
+    return registry, registry if args.all else [get_company(args.company, registry)]
+
+def news_filename(company: dict) -> str:
+    """News CSV of a company in the data folder (e.g. "jerónimo martins_news.csv")."""
+    return f"{company['name'].lower()}_news.csv"
+
+def fx_pairs(companies: list, targets: list) -> list:
+    """Distinct (reporting currency, target) pairs of the companies."""
+    return sorted({(company["currency"], target) for company in companies for target in targets if company["currency"] != target})
+
+if __name__ == "__main__":
+    # do nothing
+    None
@@ -0,0 +1,223 @@
+import glob
+import os
+import re
+import time
+from collections import OrderedDict, deque
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from utils import schemas, validation
+from utils.save_tools import OUTPUT_DIR
+from webscraping_beautifulsoup import fetch_currency_rates
+
+FX_FILENAME_PATTERN = re.compile(r"currency_exchange_rate_([A-Z]{3})_([A-Z]{3})\.csv$")
+LIVE_RATE_TTL = 300         # seconds a live rate is reused
+LIVE_RATE_CACHE_SIZE = 128  # currency pairs kept in the live rate cache
+
+def to_unix_seconds(values) -> np.ndarray:
+    """Convert timestamps (datetime, str, pd.Timestamp, unix seconds or array-likes of them) to unix seconds. Naive values are taken as UTC."""
+    if np.isscalar(values) or isinstance(values, (datetime, np.datetime64)):
+        values = [values]
+    if np.asarray(values).dtype.kind in "iuf":
+        return np.asarray(values, dtype=np.int64)
+    return pd.DatetimeIndex(pd.to_datetime(values, utc=True)).asi8 // 10**9
+
+class RateIndex:
+    """
+    In-memory, per-pair index of historical rates sorted by timestamp.
+
+    As-of lookups (the last rate at or before a timestamp) are binary searches
+    (np.searchsorted), so a whole series is converted in one vectorized call.
+    Pairs that were not collected are derived from the inverse pair or chained
+    through intermediate currencies (e.g. GBP->USD via EUR).
+    """
+
+    def __init__(self):
+        self._pairs = {}
+        self._paths = {}
+
+    def add_rates(self, curr_from: str, curr_to: str, timestamps, rates):
+        """
+        Add (or merge) observations for a currency pair.
+
+        :param timestamps: Observation times (see `to_unix_seconds`).
+        :param rates: Units of `curr_to` for one unit of `curr_from`.
+        """
+        timestamps = to_unix_seconds(timestamps)
+        rates = np.asarray(rates, dtype=np.float64)
+        if len(timestamps) == 0:
+            return      # e.g. a CSV whose rates all failed validation: an empty pair would break the as-of lookups
+        if (curr_from, curr_to) in self._pairs:
+            old_timestamps, old_rates = self._pairs[(curr_from, curr_to)]
+            timestamps = np.concatenate([old_timestamps, timestamps])
+            rates = np.concatenate([old_rates, rates])
+
+        order = np.argsort(timestamps, kind="stable")
+        self._pairs[(curr_from, curr_to)] = (timestamps[order], rates[order])
+        self._paths.clear()
+
+    def load_directory(self, directory: str = OUTPUT_DIR):
+        """Index every `currency_exchange_rate_{from}_{to}.csv` written by webscraping_beautifulsoup."""
+        for path in glob.glob(os.path.join(directory, "currency_exchange_rate_*.csv")):
+            match = FX_FILENAME_PATTERN.search(os.path.basename(path))
+            if not match:
+                continue
+            df = schemas.read_dataset(path, "fx", usecols=["timestamp", "rate"])
+            df, _ = validation.validate(df, "fx")     # drop missing and non-positive rates
+            self.add_rates(match.group(1), match.group(2), df["timestamp"].to_numpy(dtype="int64"), df["rate"].to_numpy())
+        return self
+
+    def currencies(self) -> set:
+        return {currency for pair in self._pairs for currency in pair}
+
+    def _find_path(self, curr_from: str, curr_to: str) -> list:
+        """Shortest chain of (pair, inverted) legs from one currency to another (breadth-first search)."""
+        key = (curr_from, curr_to)
+        if key in self._paths:
+            return self._paths[key]
+
+        neighbours = {}
+        for pair_from, pair_to in self._pairs:
+            neighbours.setdefault(pair_from, []).append((pair_to, (pair_from, pair_to), False))
+            neighbours.setdefault(pair_to, []).append((pair_from, (pair_from, pair_to), True))
+
+        previous = {curr_from: None}
+        queue = deque([curr_from])
+        while queue and curr_to not in previous:
+            currency = queue.popleft()
+            for next_currency, pair, inverted in neighbours.get(currency, []):
+                if next_currency not in previous:
+                    previous[next_currency] = (currency, pair, inverted)
+                    queue.append(next_currency)
+
+        if curr_to not in previous:
+            raise KeyError(f"No rates available to convert {curr_from} to {curr_to}")
+
+        path = []
+        currency = curr_to
+        while previous[currency] is not None:
+            currency, pair, inverted = previous[currency]
+            path.insert(0, (pair, inverted))
+
+        self._paths[key] = path
+        return path
+
+    def rates_at(self, curr_from: str, curr_to: str, at, backfill: bool = False) -> np.ndarray:
+        """
+        Vectorized as-of rates for many timestamps.
+
+        :param at: Timestamps (see `to_unix_seconds`).
+        :param backfill: Use the first known rate for timestamps before it instead of NaN.
+        """
+        timestamps = to_unix_seconds(at)
+        result = np.ones(len(timestamps), dtype=np.float64)
+        if curr_from == curr_to:
+            return result
+
+        for pair, inverted in self._find_path(curr_from, curr_to):
+            pair_timestamps, pair_rates = self._pairs[pair]
+            positions = np.searchsorted(pair_timestamps, timestamps, side="right") - 1
+            before_first = positions < 0
+            rates = pair_rates[np.clip(positions, 0, None)]
+            if not backfill:
+                rates = np.where(before_first, np.nan, rates)
+            result *= 1 / rates if inverted else rates
+
+        return result
+
+    def rate_at(self, curr_from: str, curr_to: str, at, backfill: bool = False) -> float:
+        """As-of rate for a single timestamp."""
+        return float(self.rates_at(curr_from, curr_to, at, backfill)[0])
+
+    def latest_rate(self, curr_from: str, curr_to: str) -> float:
+        """Most recent indexed rate for a pair (direct or derived)."""
+        latest = max(timestamps[-1] for timestamps, _ in self._pairs.values()) if self._pairs else 0
+        return self.rate_at(curr_from, curr_to, int(latest))
+
+class LiveRateCache:
+    """LRU cache of live rates where each entry expires after `ttl` seconds."""
+
+    def __init__(self, max_size: int = LIVE_RATE_CACHE_SIZE, ttl: float = LIVE_RATE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+
+    def get(self, curr_from: str, curr_to: str):
+        key = (curr_from, curr_to)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        rate, stored_at = entry
+        if time.monotonic() - stored_at > self.ttl:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return rate
+
+    def put(self, curr_from: str, curr_to: str, rate: float):
+        self._entries[(curr_from, curr_to)] = (rate, time.monotonic())
+        self._entries.move_to_end((curr_from, curr_to))
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+_rate_index = None
+_live_rates = LiveRateCache()
+
+def get_rate_index(reload: bool = False) -> RateIndex:
+    """Shared rate index built from the FX CSVs in the data folder (loaded on first use)."""
+    global _rate_index
+    if _rate_index is None or reload:
+        _rate_index = RateIndex().load_directory()
+    return _rate_index
+
+def get_live_rate(curr_from: str, curr_to: str) -> float:
+    """
+    Current rate for a pair, served from the TTL cache when fresh.
+    Falls back to the latest indexed rate when the rate page cannot be reached.
+    """
+    rate = _live_rates.get(curr_from, curr_to)
+    if rate is not None:
+        return rate
+
+    df = fetch_currency_rates(curr_from, curr_to)
+    if df is None:
+        return get_rate_index().latest_rate(curr_from, curr_to)
+
+    rate = float(df["rate"].iloc[0])
+    _live_rates.put(curr_from, curr_to, rate)
+    return rate
+
+def convert(amount: float, curr_from: str, curr_to: str, at=None, backfill: bool = False) -> float:
+    """
+    Convert an amount between currencies.
+
+    :param amount: Amount in `curr_from`.
+    :param at: Timestamp for an as-of conversion; None uses the live rate.
+    :param backfill: Use the first known rate for timestamps before it instead of NaN.
+    """
+    curr_from, curr_to = curr_from.upper(), curr_to.upper()
+    if curr_from == curr_to:
+        return amount
+    if at is None:
+        return amount * get_live_rate(curr_from, curr_to)
+    return amount * get_rate_index().rate_at(curr_from, curr_to, at, backfill=backfill)
+
+def convert_series(series: pd.Series, curr_from: str, curr_to: str, at=None, backfill: bool = False) -> pd.Series:
+    """
+    Convert a whole Series in one vectorized call, e.g. a price series indexed by date.
+
+    :param series: Amounts in `curr_from`.
+    :param at: Timestamps, one per value; defaults to the Series' DatetimeIndex (live rate otherwise).
+    :param backfill: Use the first known rate for timestamps before it instead of NaN.
+    """
+    curr_from, curr_to = curr_from.upper(), curr_to.upper()
+    values = pd.to_numeric(series, errors="coerce")
+    if at is None and isinstance(series.index, pd.DatetimeIndex):
+        at = series.index
+    if at is None:
+        return values * convert(1.0, curr_from, curr_to)
+    return values * get_rate_index().rates_at(curr_from, curr_to, at, backfill=backfill)
+
+if __name__ == "__main__":
+    # do nothing
+    None
@@ -0,0 +1,88 @@
+import argparse
+import os
+import pandas as pd
+from sqlalchemy import Column, String, Date, Float, text
+from utils.sqlalchemy.config import engine, does_table_exist, create_table_if_not_exists, insert_data, ID_TYPE
+from utils import schemas, validation
+from utils.save_tools import OUTPUT_DIR
+from utils.stock_analytics import compute_analytics, select_new_periods
+import company_registry
+
+TABLE_NAME = "monthly_adjusted_analytics"
+DEFAULT_SYMBOLS = company_registry.get_company(company_registry.DEFAULT_COMPANY)["tickers"]
+PRICES_FILENAME_TEMPLATE = "{symbol}_monthly_adjusted_data.csv"   # written by api_v2.save_to_csv
+
+def load_saved_prices(symbol: str) -> pd.DataFrame:
+    """Loads the monthly adjusted prices saved by api_v2 for a symbol."""
+    path = os.path.join(OUTPUT_DIR, PRICES_FILENAME_TEMPLATE.format(symbol=symbol))
+    if not os.path.exists(path):
+        print(f"⚠️ No saved prices found for {symbol} at {path}")
+        return pd.DataFrame()
+
+    df = schemas.read_dataset(path, "stock")
+    print(f"\n📈 Saved prices loaded: found {len(df)} periods for {symbol}")
+    return df
+
+def create_analytics_table():
+    columns = [
+        Column("id", ID_TYPE, primary_key=True, autoincrement=True),
+        Column("symbol", String, nullable=False),
+        Column("date", Date, nullable=False),
+        Column("price_return", Float),
+        Column("total_return", Float),
+        Column("log_return", Float),
+        Column("rolling_volatility", Float),
+        Column("drawdown", Float),
+        Column("trailing_dividend_yield", Float),
+        Column("adjustment_factor", Float),
+        Column("reconciliation_gap", Float),
+    ]
+    create_table_if_not_exists(TABLE_NAME, columns, unique_constraints=[("symbol", "date")])
+
+def get_last_stored_date(symbol: str):
+    """
+    Return the most recent period already materialized for a symbol, or None.
+
+    :param symbol: Stock symbol.
+    """
+    if not does_table_exist(TABLE_NAME):
+        return None
+
+    with engine.connect() as conn:
+        query = text(f"SELECT MAX(date) FROM {TABLE_NAME} WHERE symbol = :symbol")
+        return conn.execute(query, {"symbol": symbol}).scalar()
+
+def to_records(df: pd.DataFrame, symbol: str) -> list[dict]:
+    """Convert the analytics frame to database records (NaN becomes NULL)."""
+    df = df.copy()
+    df["date"] = df["date"].dt.date
+    df.insert(0, "symbol", symbol)
+    df = df.astype(object).where(df.notna(), None)
+    return df.to_dict(orient="records")
+
+def refresh_symbol(symbol: str):
+    prices = load_saved_prices(symbol)
+    if prices.empty:
+        return
+    prices = validation.validate_and_quarantine(prices.assign(symbol=symbol).sort_values("date"), "stock").drop(columns="symbol")
+
+    analytics = compute_analytics(prices)
+    new_periods = select_new_periods(analytics, get_last_stored_date(symbol))
+    if new_periods.empty:
+        print(f"✅ Analytics for {symbol} are up to date.")
+        return
+
+    insert_data(TABLE_NAME, to_records(new_periods, symbol), conflict_columns=["symbol", "date"])
+    print(f"✅ {len(new_periods)} periods refreshed for {symbol}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Materialize stock analytics (returns, volatility, drawdowns, dividend yield).")
+    parser.add_argument("symbols", nargs="*", default=DEFAULT_SYMBOLS, help=f"Symbols to refresh (default: {' '.join(DEFAULT_SYMBOLS)})")
+    args = parser.parse_args()
+
+    create_analytics_table()
+    for symbol in args.symbols:
+        refresh_symbol(symbol)
+
+if __name__ == "__main__":
+    main()
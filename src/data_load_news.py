@@ -1,20 +1,24 @@
-from sqlalchemy import create_engine, Column, String, Text, BigInteger, DateTime
-from utils.sqlalchemy.config import engine, create_table_if_not_exists, insert_data
+from sqlalchemy import create_engine, Column, String, Text, DateTime, Float
+from utils.sqlalchemy.config import engine, create_table_if_not_exists, add_columns_if_not_exist, insert_data, ID_TYPE
+from utils.sqlalchemy import partitioning
+from utils import validation
+import company_registry
 from utils.save_tools import load_existing_dataframe
+import argparse
 import pandas as pd
 import re
 
 FILES_TO_DEPLOY = {
     "news": {
-        "filename": "jerónimo martins_news.csv",
+        "filename": company_registry.news_filename(company_registry.get_company(company_registry.DEFAULT_COMPANY)),
         "columns": ["Date", "Title", "Link", "Summary"]
     },
 }
 TABLE_NAME = "news"
 
-def load_saved_news() -> pd.DataFrame:
-    df = load_existing_dataframe(FILES_TO_DEPLOY["news"]["filename"], FILES_TO_DEPLOY["news"]["columns"])
-    print(f"\n📰 Saved news loaded: found {len(df)} news in file")
+def load_saved_news(filename: str = FILES_TO_DEPLOY["news"]["filename"]) -> pd.DataFrame:
+    df = load_existing_dataframe(filename, FILES_TO_DEPLOY["news"]["columns"], dataset="news")
+    print(f"\n📰 Saved news loaded: found {len(df)} news in {filename}")
     # print(df.head())
     return df
 
@@ -36,7 +40,15 @@ def clean_data(df: pd.DataFrame) -> pd.DataFrame:
     df.columns = [to_snake_case(col) for col in df.columns]
     return df
 
-def deploy_to_database(df: pd.DataFrame):
+def drop_expired_rows(df: pd.DataFrame, retain_months: int) -> pd.DataFrame:
+    """Rows still inside the retention window: older months were detached and must not be recreated."""
+    cutoff = partitioning.retention_cutoff(retain_months)
+    expired = df["date"] < cutoff
+    if expired.any():
+        print(f"🗄️ {expired.sum()} news older than {cutoff:%Y-%m} skipped (outside the retention window).")
+    return df[~expired]
+
+def deploy_to_database(df: pd.DataFrame, partitioned: bool = False, retain_months: int = None):
     try:
         conn = engine.connect()
         print("🚀 Connected to the database!")
@@ -44,16 +56,43 @@ def deploy_to_database(df: pd.DataFrame):
         print("❌ Error connecting to the database:", e)
         exit(1)
     
+    if partitioned and not partitioning.supports_partitioning():
+        print("⚠️ Partitioning is only supported on PostgreSQL, creating a regular table.")
+        partitioned = False
+
     columns = [
-        Column("id", BigInteger, primary_key=True, autoincrement=True),
-        Column("date", DateTime, nullable=False),
+        Column("id", ID_TYPE, primary_key=True, autoincrement=True),
+        # partitioned tables need the partition key in the primary key
+        Column("date", DateTime, nullable=False, primary_key=partitioned),
         Column("title", String, nullable=False),
         Column("link", String),
         Column("summary", Text),
     ]
-    create_table_if_not_exists(TABLE_NAME, columns, unique_constraints=[("date", "title")])
+    # Filled by tag_news.py
+    tag_columns = [
+        Column("sentiment", Float),
+        Column("companies", String),
+        Column("tickers", String),
+    ]
+    if partitioned:
+        partitioning.create_partitioned_table(TABLE_NAME, columns + tag_columns, partition_column="date",
+                                              unique_constraints=[("date", "title")], brin_columns=["date"])
+    else:
+        create_table_if_not_exists(TABLE_NAME, columns + tag_columns, unique_constraints=[("date", "title")])
+    add_columns_if_not_exist(TABLE_NAME, tag_columns)
+
+    # Rows that would fail the insert (e.g. unparseable dates) are quarantined instead
+    df = validation.validate_and_quarantine(df, "news")
 
-    insert_data(TABLE_NAME, df.to_dict(orient="records"), conflict_columns=["date", "title"])
+    # Monthly partitions are created on demand for the rows about to be inserted
+    if partitioning.is_partitioned(TABLE_NAME):
+        if retain_months is not None:
+            df = drop_expired_rows(df, retain_months)
+        partitioning.ensure_month_partitions(TABLE_NAME, df["date"])
+
+    # typed columns hold pd.NA/NaT for missing values, the database driver expects None
+    records = df.astype(object).where(df.notna(), None).to_dict(orient="records")
+    insert_data(TABLE_NAME, records, conflict_columns=["date", "title"])
 
     try:
         conn.close()
@@ -62,10 +101,28 @@ def deploy_to_database(df: pd.DataFrame):
         exit(1)
 
 def main():
-    df = load_saved_news()
+    parser = argparse.ArgumentParser(description="Load the saved news into the database.")
+    company_registry.add_company_arguments(parser)
+    parser.add_argument("--partitioned", action="store_true",
+                        help="Create the news table partitioned by month with a BRIN index on date (PostgreSQL, new tables only)")
+    parser.add_argument("--retain-months", type=int, default=None,
+                        help="Detach the monthly partitions older than this many months")
+    parser.add_argument("--no-archive", action="store_true",
+                        help="With --retain-months, keep old partitions as standalone tables instead of moving them to news_archive")
+    args = parser.parse_args()
+
+    _, companies = company_registry.select_companies(args)
+    # one table for every company: an article found by several searches is loaded once (see clean_data)
+    df = pd.concat([load_saved_news(company_registry.news_filename(company)) for company in companies], ignore_index=True)
     df = clean_data(df)
 
-    deploy_to_database(df)
+    deploy_to_database(df, partitioned=args.partitioned, retain_months=args.retain_months)
+
+    if args.retain_months is not None:
+        if partitioning.is_partitioned(TABLE_NAME):
+            partitioning.apply_retention(TABLE_NAME, args.retain_months, archive=not args.no_archive, unique_columns=["date", "title"])
+        else:
+            print(f"⚠️ Table '{TABLE_NAME}' is not partitioned, retention skipped.")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
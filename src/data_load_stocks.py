@@ -4,6 +4,7 @@ import pandas as pd
 import traceback
 from psycopg2.extras import execute_values
 from dotenv import load_dotenv
+from utils import validation
 
 # Load environment variables
 load_dotenv()
@@ -58,7 +59,9 @@ try:
     df.columns = ["date", "open", "high", "low", "close", "adjusted_close", "volume", "dividend_amount"]
 
     # Convert columns to appropriate data types if necessary
-    df["date"] = pd.to_datetime(df["date"]).dt.date  # Ensure date is in the correct format
+    df["date"] = pd.to_datetime(df["date"], errors="coerce")
+    df = validation.validate_and_quarantine(df.sort_values("date"), "stock")
+    df = df.assign(date=df["date"].dt.date)  # Ensure date is in the correct format
 
     # Prepare bulk insert query
     insert_query = """
@@ -0,0 +1,245 @@
+import argparse
+import glob
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+import pandas as pd
+from utils import schemas, save_tools
+from utils.save_tools import OUTPUT_DIR
+from tag_news import COMPANY_ENTITIES
+
+EXPORT_DIR = os.path.join(OUTPUT_DIR, "powerbi")
+MANIFEST_FILENAME = "manifest.json"
+
+PRICES_PATTERN = re.compile(r"(.+)_monthly_adjusted_data\.csv$")
+FX_PATTERN = re.compile(r"currency_exchange_rate_([A-Z]{3})_([A-Z]{3})\.csv$")
+NEWS_PATTERN = re.compile(r"(.+)_news\.csv$")
+
+def to_date_key(dates: pd.Series) -> pd.Series:
+    """Integer surrogate key of a date (YYYYMMDD)."""
+    dates = pd.to_datetime(dates)
+    return (dates.dt.year * 10000 + dates.dt.month * 100 + dates.dt.day).astype("int32")
+
+def load_prices(directory: str = OUTPUT_DIR) -> pd.DataFrame:
+    frames = []
+    for path in glob.glob(os.path.join(directory, "*_monthly_adjusted_data.csv")):
+        symbol = PRICES_PATTERN.search(os.path.basename(path)).group(1)
+        df = schemas.read_dataset(path, "stock")
+        df["symbol"] = symbol
+        frames.append(df)
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=["date", "symbol"])
+
+def load_fx(directory: str = OUTPUT_DIR) -> pd.DataFrame:
+    frames = []
+    for path in glob.glob(os.path.join(directory, "currency_exchange_rate_*.csv")):
+        if not FX_PATTERN.search(os.path.basename(path)):
+            continue
+        df = schemas.read_dataset(path, "fx", usecols=["timestamp", "from", "to", "rate"])
+        frames.append(df)
+    if not frames:
+        return pd.DataFrame(columns=["timestamp", "from", "to", "rate", "date"])
+    df = pd.concat(frames, ignore_index=True)
+    df["date"] = pd.to_datetime(df["timestamp"], unit="s")
+    return df
+
+def load_news(directory: str = OUTPUT_DIR) -> pd.DataFrame:
+    frames = []
+    for path in glob.glob(os.path.join(directory, "*_news.csv")):
+        df = schemas.read_dataset(path, "news")
+        df["keyword"] = NEWS_PATTERN.search(os.path.basename(path)).group(1)
+        frames.append(df)
+    if not frames:
+        return pd.DataFrame(columns=["Date", "Title", "Link", "Summary", "keyword", "date"])
+    df = pd.concat(frames, ignore_index=True)
+    df["date"] = df["Date"]
+    return df.dropna(subset=["date"])
+
+def build_dim_date(*date_series) -> pd.DataFrame:
+    """One row per calendar day between the first and last date of the facts."""
+    dates = pd.concat([pd.to_datetime(series) for series in date_series if len(series)])
+    if dates.empty:
+        return pd.DataFrame(columns=["date_key", "date"])
+    days = pd.Series(pd.date_range(dates.min().normalize(), dates.max().normalize(), freq="D"))
+    return pd.DataFrame({
+        "date_key": to_date_key(days),
+        "date": days.dt.date,
+        "year": days.dt.year.astype("int16"),
+        "quarter": days.dt.quarter.astype("int8"),
+        "month": days.dt.month.astype("int8"),
+        "month_name": days.dt.month_name(),
+        "day": days.dt.day.astype("int8"),
+        "day_of_week": days.dt.dayofweek.astype("int8"),
+        "is_month_end": days.dt.is_month_end,
+    })
+
+def build_dimension(previous: pd.DataFrame, values, key_column: str, value_column: str) -> pd.DataFrame:
+    """
+    Extend a dimension with new members, keeping the surrogate keys already handed out
+    (so existing fact partitions stay valid).
+    """
+    previous = previous if previous is not None else pd.DataFrame(columns=[key_column, value_column])
+    known = set(previous[value_column])
+    new_values = sorted(set(values) - known)
+    next_key = int(previous[key_column].max()) + 1 if len(previous) else 1
+    new_rows = pd.DataFrame({key_column: range(next_key, next_key + len(new_values)), value_column: new_values})
+    dimension = pd.concat([previous, new_rows], ignore_index=True)
+    dimension[key_column] = dimension[key_column].astype("int32")
+    return dimension
+
+def build_fact_price(prices: pd.DataFrame, dim_symbol: pd.DataFrame) -> pd.DataFrame:
+    keys = dict(zip(dim_symbol["symbol"], dim_symbol["symbol_key"]))
+    fact = pd.DataFrame({
+        "date_key": to_date_key(prices["date"]),
+        "symbol_key": prices["symbol"].map(keys).astype("int32"),
+    })
+    for column in ["open", "high", "low", "close", "adjusted_close", "dividend_amount"]:
+        fact[column] = pd.to_numeric(prices[column], errors="coerce").astype("float64")
+    fact["volume"] = pd.to_numeric(prices["volume"], errors="coerce").astype("Int64")
+    fact["period"] = prices["date"].dt.strftime("%Y-%m")
+    return fact
+
+def build_fact_fx(fx: pd.DataFrame, dim_currency: pd.DataFrame) -> pd.DataFrame:
+    keys = dict(zip(dim_currency["currency"], dim_currency["currency_key"]))
+    return pd.DataFrame({
+        "date_key": to_date_key(fx["date"]),
+        "timestamp": fx["timestamp"].astype("int64"),
+        "from_currency_key": fx["from"].map(keys).astype("int32"),
+        "to_currency_key": fx["to"].map(keys).astype("int32"),
+        "rate": fx["rate"].astype("float64"),
+        "period": fx["date"].dt.strftime("%Y-%m"),
+    })
+
+def build_fact_news(news: pd.DataFrame, dim_symbol: pd.DataFrame) -> pd.DataFrame:
+    keys = dict(zip(dim_symbol["symbol"], dim_symbol["symbol_key"]))
+    # First ticker mentioned by the article (set by tag_news.py), if any
+    tickers = news["tickers"] if "tickers" in news.columns else pd.Series(pd.NA, index=news.index)
+    first_ticker = tickers.astype(object).fillna("").astype(str).str.split(";").str[0].str.strip()
+    return pd.DataFrame({
+        "date_key": to_date_key(news["date"]),
+        "symbol_key": first_ticker.map(keys).astype("Int32"),
+        "title": news["Title"].astype("string"),
+        "link": news["Link"].astype("string"),
+        "summary": news["Summary"].astype("string"),
+        "sentiment": pd.to_numeric(news["sentiment"], errors="coerce") if "sentiment" in news.columns else float("nan"),
+        "keyword": news["keyword"].astype("category"),
+        "period": news["date"].dt.strftime("%Y-%m"),
+    })
+
+def frame_hash(df: pd.DataFrame) -> str:
+    return hashlib.sha256(pd.util.hash_pandas_object(df, index=False).values.tobytes()).hexdigest()
+
+def write_parquet(df: pd.DataFrame, path: str):
+    """Write to a temporary file and rename it, so PowerBI never reads a half-written file."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    file_descriptor, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    os.close(file_descriptor)
+    try:
+        df.to_parquet(temp_path, index=False, compression="zstd")
+        save_tools.copy_file_mode(temp_path, path)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+def write_if_changed(df: pd.DataFrame, relative_path: str, manifest: dict, export_dir: str) -> bool:
+    """Write a table or partition only when its content changed since the last export."""
+    content_hash = frame_hash(df)
+    if manifest.get(relative_path) == content_hash and os.path.exists(os.path.join(export_dir, relative_path)):
+        return False
+    write_parquet(df, os.path.join(export_dir, relative_path))
+    manifest[relative_path] = content_hash
+    return True
+
+def write_fact_partitions(fact: pd.DataFrame, name: str, manifest: dict, export_dir: str) -> int:
+    written = 0
+    for period, partition in fact.groupby("period", sort=True):
+        partition = partition.drop(columns="period").sort_values(list(partition.columns[:2])).reset_index(drop=True)
+        written += write_if_changed(partition, f"{name}/period={period}/part-0.parquet", manifest, export_dir)
+    return written
+
+def remove_stale_partitions(name: str, periods: set, manifest: dict, export_dir: str) -> int:
+    """Delete the partitions of a fact table whose period is no longer in the source, with their manifest entries."""
+    prefix = f"{name}/period="
+    stale = {key.split("/")[1] for key in manifest if key.startswith(prefix)}
+    table_dir = os.path.join(export_dir, name)
+    if os.path.isdir(table_dir):
+        stale |= {folder for folder in os.listdir(table_dir) if folder.startswith("period=")}
+    stale -= {f"period={period}" for period in periods}
+
+    for folder in stale:
+        shutil.rmtree(os.path.join(table_dir, folder), ignore_errors=True)
+        for key in [key for key in manifest if key.startswith(f"{name}/{folder}/")]:
+            del manifest[key]
+    return len(stale)
+
+def read_dimension(export_dir: str, name: str):
+    path = os.path.join(export_dir, f"{name}.parquet")
+    return pd.read_parquet(path) if os.path.exists(path) else None
+
+def export_star_schema(source_dir: str = OUTPUT_DIR, export_dir: str = EXPORT_DIR) -> dict:
+    """
+    Build the star schema from the collected CSVs and write only the tables/partitions that changed.
+
+    :return: Number of files written per table.
+    """
+    manifest_path = os.path.join(export_dir, MANIFEST_FILENAME)
+    manifest = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path, encoding="utf-8") as file:
+            manifest = json.load(file)
+
+    prices, fx, news = load_prices(source_dir), load_fx(source_dir), load_news(source_dir)
+
+    dim_symbol = build_dimension(read_dimension(export_dir, "dim_symbol"), prices["symbol"].unique(), "symbol_key", "symbol")
+    companies = {entity["ticker"]: company for company, entity in COMPANY_ENTITIES.items()}
+    dim_symbol["company"] = dim_symbol["symbol"].map(companies).fillna(dim_symbol["symbol"])
+    dim_currency = build_dimension(read_dimension(export_dir, "dim_currency"),
+                                   set(fx["from"]) | set(fx["to"]), "currency_key", "currency")
+    dim_date = build_dim_date(prices["date"], fx["date"], news["date"])
+
+    written = {
+        "dim_date": int(write_if_changed(dim_date, "dim_date.parquet", manifest, export_dir)),
+        "dim_symbol": int(write_if_changed(dim_symbol, "dim_symbol.parquet", manifest, export_dir)),
+        "dim_currency": int(write_if_changed(dim_currency, "dim_currency.parquet", manifest, export_dir)),
+        "fact_price": 0,
+        "fact_fx": 0,
+        "fact_news": 0,
+    }
+    periods = {"fact_price": set(), "fact_fx": set(), "fact_news": set()}
+    if len(prices):
+        fact_price = build_fact_price(prices, dim_symbol)
+        written["fact_price"] = write_fact_partitions(fact_price, "fact_price", manifest, export_dir)
+        periods["fact_price"] = set(fact_price["period"])
+    if len(fx):
+        fact_fx = build_fact_fx(fx, dim_currency)
+        written["fact_fx"] = write_fact_partitions(fact_fx, "fact_fx", manifest, export_dir)
+        periods["fact_fx"] = set(fact_fx["period"])
+    if len(news):
+        fact_news = build_fact_news(news, dim_symbol)
+        written["fact_news"] = write_fact_partitions(fact_news, "fact_news", manifest, export_dir)
+        periods["fact_news"] = set(fact_news["period"])
+    for name, fact_periods in periods.items():
+        removed = remove_stale_partitions(name, fact_periods, manifest, export_dir)
+        if removed:
+            print(f"🧹 {name}: {removed} partition(s) no longer in the source removed")
+
+    os.makedirs(export_dir, exist_ok=True)
+    with open(manifest_path, "w", encoding="utf-8") as file:
+        json.dump(manifest, file, indent=2, sort_keys=True)
+    return written
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the collected data as a star schema of Parquet files for PowerBI.")
+    parser.add_argument("--export-dir", default=EXPORT_DIR, help=f"Output folder (default: {EXPORT_DIR})")
+    args = parser.parse_args()
+
+    written = export_star_schema(export_dir=args.export_dir)
+    for table, count in written.items():
+        print(f"{'📦' if count else '✅'} {table}: {count} file(s) written")
+
+if __name__ == "__main__":
+    main()
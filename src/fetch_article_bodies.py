@@ -0,0 +1,185 @@
+import argparse
+import asyncio
+import hashlib
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from urllib.parse import urlparse
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup
+from utils import save_tools
+import company_registry
+
+BODIES_FILENAME = "article_bodies.csv"
+BODIES_COLUMNS = ["link_hash", "link", "status", "etag", "last_modified", "fetched_at", "article_body"]
+
+MAX_CONCURRENCY = 16        # requests in flight across all hosts
+PER_HOST_CONCURRENCY = 2    # requests in flight per host
+PER_HOST_DELAY = 0.5        # seconds a host slot is held after each request
+REQUEST_TIMEOUT = 15
+HEADERS = {"User-Agent": "Mozilla/5.0 (compatible; company-info-gatherer)"}
+NOISE_TAGS = ["script", "style", "noscript", "nav", "header", "footer", "aside", "form", "iframe"]
+
+def hash_link(link: str) -> str:
+    return hashlib.sha256(link.encode("utf-8")).hexdigest()
+
+def extract_main_text(html: str) -> str:
+    """
+    Extract the readable article text from a page.
+
+    Uses the <article> element when there is one, otherwise the block with the most paragraph text.
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    for tag in soup(NOISE_TAGS):
+        tag.decompose()
+
+    candidates = soup.find_all("article") or [paragraph.parent for paragraph in soup.find_all("p")]
+    if not candidates:
+        return ""
+
+    def paragraphs_text(element):
+        paragraphs = [p.get_text(" ", strip=True) for p in element.find_all("p")]
+        return "\n\n".join(text for text in paragraphs if text)
+
+    best = max(candidates, key=lambda element: len(paragraphs_text(element)))
+    return paragraphs_text(best) or best.get_text(" ", strip=True)
+
+def create_session() -> requests.Session:
+    """HTTP session with connection reuse and retries (with backoff) on throttling and server errors."""
+    retry = Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["GET"],
+        respect_retry_after_header=True,
+    )
+    adapter = HTTPAdapter(max_retries=retry, pool_connections=1, pool_maxsize=PER_HOST_CONCURRENCY)
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+def fetch_body(session: requests.Session, link: str, previous: dict = None) -> dict:
+    """
+    Fetch one article, sending conditional headers when a previous version is known.
+
+    :param session: Session for the article's host.
+    :param link: Article URL.
+    :param previous: Previously stored record for the link (etag, last_modified, article_body).
+    """
+    headers = {}
+    if previous:
+        if isinstance(previous.get("etag"), str):
+            headers["If-None-Match"] = previous["etag"]
+        if isinstance(previous.get("last_modified"), str):
+            headers["If-Modified-Since"] = previous["last_modified"]
+
+    record = {
+        "link_hash": hash_link(link),
+        "link": link,
+        "fetched_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+    }
+    try:
+        response = session.get(link, headers=headers, timeout=REQUEST_TIMEOUT)
+        if response.status_code == 304 and previous:
+            return {**previous, **record, "status": 304}
+
+        response.raise_for_status()
+        record.update({
+            "status": response.status_code,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "article_body": extract_main_text(response.text),
+        })
+    except requests.exceptions.RequestException as e:
+        print(f"❌ Error fetching {link}: {e}")
+        record.update({"status": getattr(e.response, "status_code", None), "article_body": None})
+    return record
+
+async def fetch_bodies(links: list[str], previous_records: dict = None) -> list[dict]:
+    """
+    Fetch many articles concurrently, limiting the requests in flight globally and per host.
+
+    :param links: Article URLs.
+    :param previous_records: Stored records by link hash, used for conditional GETs.
+    """
+    previous_records = previous_records or {}
+    global_limit = asyncio.Semaphore(MAX_CONCURRENCY)
+    host_limits = {}
+    sessions = {}
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=MAX_CONCURRENCY)
+
+    async def fetch(link):
+        host = urlparse(link).netloc
+        if host not in host_limits:
+            host_limits[host] = asyncio.Semaphore(PER_HOST_CONCURRENCY)
+            sessions[host] = create_session()
+
+        # The global slot is only held during the request: links waiting on a busy host
+        # (or on its politeness delay) must not keep the other hosts from being fetched
+        async with host_limits[host]:
+            previous = previous_records.get(hash_link(link))
+            async with global_limit:
+                record = await loop.run_in_executor(executor, fetch_body, sessions[host], link, previous)
+            await asyncio.sleep(PER_HOST_DELAY)
+            return record
+
+    try:
+        return await asyncio.gather(*(fetch(link) for link in links))
+    finally:
+        executor.shutdown(wait=False)
+        for session in sessions.values():
+            session.close()
+
+def select_links_to_fetch(news_df: pd.DataFrame, bodies_df: pd.DataFrame, refresh: bool = False) -> list[str]:
+    """
+    Return the news links that still need a body. Links whose previous fetch failed are retried.
+
+    :param news_df: Scraped news (with a `Link` column).
+    :param bodies_df: Stored article bodies (with a `link_hash` column).
+    :param refresh: Also return already fetched links (they are revalidated with conditional GETs).
+    """
+    links = news_df["Link"].dropna()
+    links = links[links.str.startswith("http")].drop_duplicates()
+    if refresh:
+        return links.tolist()
+
+    fetched = pd.to_numeric(bodies_df["status"], errors="coerce").between(200, 399)
+    fetched_hashes = set(bodies_df.loc[fetched, "link_hash"])
+    return [link for link in links if hash_link(link) not in fetched_hashes]
+
+def main():
+    parser = argparse.ArgumentParser(description="Fetch the article bodies of the scraped news.")
+    company_registry.add_company_arguments(parser)
+    parser.add_argument("--news-file", default=None, help="News CSV in the data folder (default: the news files of the selected companies)")
+    parser.add_argument("--refresh", action="store_true", help="Revalidate already fetched articles with conditional GETs")
+    args = parser.parse_args()
+
+    _, companies = company_registry.select_companies(args)
+    news_files = [args.news_file] if args.news_file else [company_registry.news_filename(company) for company in companies]
+    news_df = pd.concat([save_tools.load_existing_dataframe(news_file, columns=["Link"], dataset="news", usecols=["Link"])
+                         for news_file in news_files], ignore_index=True)
+    bodies_df = save_tools.load_existing_dataframe(BODIES_FILENAME, columns=BODIES_COLUMNS)
+
+    links = select_links_to_fetch(news_df, bodies_df, refresh=args.refresh)
+    if not links:
+        print("✅ All article bodies are already fetched.")
+        return
+
+    print(f"🔍 Fetching {len(links)} articles...")
+    previous_records = {record["link_hash"]: record for record in bodies_df.to_dict(orient="records")}
+    started_at = time.perf_counter()
+    records = asyncio.run(fetch_bodies(links, previous_records))
+    print(f"⏱️ Fetched {len(records)} articles in {time.perf_counter() - started_at:.1f}s")
+
+    new_bodies_df = pd.DataFrame(records, columns=BODIES_COLUMNS)
+    updated_bodies_df = pd.concat([bodies_df, new_bodies_df]).drop_duplicates(subset=["link_hash"], keep="last")
+    save_tools.save_to_csv(updated_bodies_df, BODIES_FILENAME, ignore_overwrite=True, append_data=False)
+
+if __name__ == "__main__":
+    main()
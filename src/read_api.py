@@ -0,0 +1,283 @@
+import argparse
+import base64
+import binascii
+import glob
+import hashlib
+import json
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+import currency_converter
+from data_load_news import TABLE_NAME as NEWS_TABLE
+from stream_stocks import TABLE_NAME as PRICES_TABLE
+from utils import save_tools
+from utils.sqlalchemy import config
+
+DEFAULT_PORT = 8780
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+CACHE_SIZE = 256        # responses kept in the result cache
+CACHE_TTL = 300         # seconds a cached response is served without checking the source again (writes from other hosts)
+
+class BadRequest(ValueError):
+    """Invalid query parameters (answered with 400)."""
+
+class ResultCache:
+    """
+    LRU cache of encoded responses. An entry is only served while the version of its source
+    (see `config.table_version`) is the one it was computed from, and for at most `ttl` seconds.
+    """
+
+    def __init__(self, max_size: int = CACHE_SIZE, ttl: float = CACHE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, version):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[2] != version or time.monotonic() - entry[3] > self.ttl:
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0], entry[1]
+
+    def put(self, key, version, body: bytes, etag: str):
+        with self._lock:
+            self._entries[key] = (body, etag, version, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+def encode_cursor(values: list) -> str:
+    """Opaque keyset cursor: the sort key of the last row of a page."""
+    return base64.urlsafe_b64encode(json.dumps(values, default=str).encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str, size: int) -> list:
+    """Sort key of a cursor, which must hold `size` values (a cursor of another endpoint is rejected)."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (ValueError, binascii.Error):
+        raise BadRequest("Invalid cursor")
+    if not isinstance(values, list) or len(values) != size or not all(isinstance(value, (str, int)) for value in values):
+        raise BadRequest("Invalid cursor")
+    return values
+
+def escape_like(value: str) -> str:
+    """Escape the LIKE wildcards of a search term (queries use ESCAPE '\\')."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+def _param(params: dict, name: str, required: bool = False):
+    value = params.get(name, [None])[0]
+    if required and not value:
+        raise BadRequest(f"Missing parameter '{name}'")
+    return value
+
+def _page_size(params: dict) -> int:
+    try:
+        limit = int(_param(params, "limit") or DEFAULT_PAGE_SIZE)
+    except ValueError:
+        raise BadRequest("'limit' must be an integer")
+    return min(max(limit, 1), MAX_PAGE_SIZE)
+
+def _add_date_range(params: dict, conditions: list, bindings: dict):
+    """
+    `start` and `end` (both included) as ISO dates or date-times. A date-only `end` covers the whole day.
+    Bounds are bound as ISO text, which compares correctly with dates stored by both backends.
+    """
+    for name in ("start", "end"):
+        value = _param(params, name)
+        if not value:
+            continue
+        try:
+            parsed = datetime.fromisoformat(value)
+        except ValueError:
+            raise BadRequest(f"'{name}' must be an ISO date")
+        date_only = len(value) == 10
+        if name == "start":
+            conditions.append("date >= :start")
+            bindings["start"] = parsed.date().isoformat() if date_only else parsed.isoformat(sep=" ")
+        elif date_only:
+            conditions.append("date < :end")
+            bindings["end"] = (parsed + timedelta(days=1)).date().isoformat()
+        else:
+            conditions.append("date <= :end")
+            bindings["end"] = parsed.isoformat(sep=" ")
+
+def _fetch_page(query: str, bindings: dict, limit: int, key_columns: list) -> dict:
+    """Run a keyset-paginated query (one extra row tells whether there is a next page)."""
+    with config.engine.connect() as conn:   # borrowed from (and returned to) the engine's pool
+        rows = [dict(row) for row in conn.execute(text(query), {**bindings, "limit": limit + 1}).mappings()]
+    next_cursor = encode_cursor([rows[limit - 1][column] for column in key_columns]) if len(rows) > limit else None
+    return {"items": rows[:limit], "next_cursor": next_cursor}
+
+def query_prices(params: dict) -> dict:
+    """GET /prices?symbol=JMT.LS&start=2020-01-01&end=2024-12-31&limit=100&cursor=..., oldest first."""
+    conditions, bindings = ["symbol = :symbol"], {"symbol": _param(params, "symbol", required=True)}
+    _add_date_range(params, conditions, bindings)
+    cursor = _param(params, "cursor")
+    if cursor:
+        conditions.append("date > :after_date")
+        bindings["after_date"] = decode_cursor(cursor, 1)[0]
+
+    query = (f"SELECT symbol, date, open, high, low, close, adjusted_close, volume, dividend_amount FROM {PRICES_TABLE} "
+             f"WHERE {' AND '.join(conditions)} ORDER BY date LIMIT :limit")
+    return _fetch_page(query, bindings, _page_size(params), ["date"])
+
+def query_news(params: dict) -> dict:
+    """GET /news?q=biedronka&start=2024-01-01&end=2024-06-30&limit=100&cursor=..., newest first."""
+    conditions, bindings = [], {}
+    keyword = _param(params, "q")
+    if keyword:
+        # "%" and "_" in the keyword are searched for literally
+        conditions.append("(LOWER(title) LIKE :pattern ESCAPE '\\' OR LOWER(summary) LIKE :pattern ESCAPE '\\')")
+        bindings["pattern"] = f"%{escape_like(keyword.lower())}%"
+    _add_date_range(params, conditions, bindings)
+    cursor = _param(params, "cursor")
+    if cursor:
+        # (date, id) is unique, so rows with the same date are neither skipped nor repeated
+        conditions.append("(date < :after_date OR (date = :after_date AND id < :after_id))")
+        bindings["after_date"], bindings["after_id"] = decode_cursor(cursor, 2)
+
+    where = f"WHERE {' AND '.join(conditions)} " if conditions else ""
+    query = (f"SELECT id, date, title, link, summary, sentiment, companies, tickers FROM {NEWS_TABLE} "
+             f"{where}ORDER BY date DESC, id DESC LIMIT :limit")
+    return _fetch_page(query, bindings, _page_size(params), ["date", "id"])
+
+def fx_version() -> tuple:
+    """Version of the FX rates: the FX CSVs are appended to by the scrapers, not loaded into a table."""
+    paths = sorted(glob.glob(os.path.join(save_tools.OUTPUT_DIR, "currency_exchange_rate_*.csv")))
+    return tuple((path, stat.st_mtime_ns, stat.st_size) for path, stat in ((path, os.stat(path)) for path in paths))
+
+_rate_index = (None, None)
+_rate_index_lock = threading.Lock()
+
+def get_rate_index(version: tuple) -> currency_converter.RateIndex:
+    """Rate index of the FX CSVs, rebuilt only when they changed."""
+    global _rate_index
+    with _rate_index_lock:
+        if _rate_index[0] != version or _rate_index[1] is None:
+            _rate_index = (version, currency_converter.RateIndex().load_directory(save_tools.OUTPUT_DIR))
+        return _rate_index[1]
+
+def query_fx(params: dict) -> dict:
+    """GET /fx?from=EUR&to=USD&at=2024-01-31T12:00:00&at=1706702400: as-of rates (the latest rate without `at`)."""
+    curr_from = _param(params, "from", required=True).upper()
+    curr_to = _param(params, "to", required=True).upper()
+    index = get_rate_index(fx_version())
+
+    at = params.get("at", [])
+    if not at:
+        return {"from": curr_from, "to": curr_to, "items": [{"at": None, "rate": index.latest_rate(curr_from, curr_to)}]}
+    try:
+        timestamps = [int(value) if value.isdigit() else int(currency_converter.to_unix_seconds(value)[0]) for value in at]
+    except ValueError:
+        raise BadRequest("'at' must be ISO date-times or unix seconds")
+    rates = index.rates_at(curr_from, curr_to, timestamps, backfill=_param(params, "backfill") == "true")
+    return {"from": curr_from, "to": curr_to,
+            "items": [{"at": value, "rate": None if math.isnan(rate) else float(rate)} for value, rate in zip(at, rates)]}
+
+# path -> (query, version of the data it reads)
+ENDPOINTS = {
+    "/prices": (query_prices, lambda: config.table_version(PRICES_TABLE)),
+    "/news": (query_news, lambda: config.table_version(NEWS_TABLE)),
+    "/fx": (query_fx, fx_version),
+}
+
+class ReadApiHandler(BaseHTTPRequestHandler):
+    """JSON API: GET /prices, /news and /fx, with ETags (If-None-Match gets a 304) and a shared result cache."""
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        endpoint = ENDPOINTS.get(parsed.path)
+        if endpoint is None:
+            return self._send(404, {"error": "Unknown path"})
+        query, source_version = endpoint
+        params = parse_qs(parsed.query)
+
+        key = (parsed.path, tuple(sorted((name, tuple(values)) for name, values in params.items())))
+        version = source_version()      # read before the query: a concurrent write invalidates the entry
+        cached = self.server.cache.get(key, version)
+        if cached is None:
+            try:
+                payload = query(params)
+            except BadRequest as e:
+                return self._send(400, {"error": str(e)})
+            except KeyError as e:
+                return self._send(404, {"error": str(e).strip("'")})
+            except SQLAlchemyError as e:
+                print(f"❌ Error querying the database: {e}")
+                return self._send(503, {"error": "Database query failed"})
+            body = json.dumps(payload, default=str).encode("utf-8")
+            cached = (body, f'"{hashlib.sha1(body).hexdigest()}"')
+            self.server.cache.put(key, version, *cached)
+
+        body, etag = cached
+        if etag in [tag.strip() for tag in self.headers.get("If-None-Match", "").split(",")]:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self._send(200, body, etag)
+
+    def _send(self, status: int, body, etag: str = None):
+        payload = body if isinstance(body, bytes) else json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        if etag:
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")   # clients revalidate with If-None-Match
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_server(port: int = 0, cache: ResultCache = None) -> ThreadingHTTPServer:
+    """
+    Serve the read API in background threads. Every request borrows a connection from the
+    database engine's pool, which also bounds the number of concurrent queries.
+
+    :param port: Port to listen on (0 picks a free one).
+    :param cache: Result cache (default: a new one with CACHE_SIZE entries).
+    :return: The running server; its URL is `server.base_url`. Stop it with `server.shutdown()`.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", port), ReadApiHandler)
+    server.daemon_threads = True
+    server.cache = cache or ResultCache()
+    server.base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the collected prices, news and FX rates as a cached JSON read API.")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--cache-size", type=int, default=CACHE_SIZE, help=f"Responses kept in memory (default: {CACHE_SIZE})")
+    parser.add_argument("--ttl", type=float, default=CACHE_TTL, help=f"Seconds a cached response is reused at most (default: {CACHE_TTL})")
+    args = parser.parse_args()
+
+    server = start_server(args.port, ResultCache(args.cache_size, args.ttl))
+    print(f"🚀 Read API listening on {server.base_url} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        print("🛑 Stopping the read API...")
+    finally:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import islice
+from urllib.parse import urlsplit, parse_qs
+import pandas as pd
+import zstandard
+from utils import save_tools
+from utils.page_archive import PageArchive, make_decompressors, decode_record
+from utils.news_parsing import NEWS_ARCHIVE_SOURCE, parse_news_html
+from webscraping_beautifulsoup import ARCHIVE_SOURCE as FX_ARCHIVE_SOURCE, parse_currency_rate, build_rate_frame
+
+CHUNK_SIZE = 200                # pages per task sent to a worker
+OUTPUT_PREFIX = "reparsed_"     # rebuilt datasets are written next to the originals, never over them
+
+def parse_fx_page(page: dict) -> list[dict]:
+    query = parse_qs(urlsplit(page["url"]).query)
+    curr_from, curr_to = query.get("from", [None])[0], query.get("to", [None])[0]
+    if not curr_from or not curr_to:
+        return []
+    rate = parse_currency_rate(page["html"], curr_to)
+    if rate is None:
+        return []
+    return build_rate_frame(curr_from, curr_to, rate, page["fetched_at"]).to_dict(orient="records")
+
+def parse_news_page(page: dict) -> list[dict]:
+    keyword = parse_qs(urlsplit(page["url"]).query).get("kw", [""])[0].strip('"')
+    return [{**article, "keyword": keyword, "fetched_at": page["fetched_at"]} for article in parse_news_html(page["html"], page["url"])]
+
+DATASETS = {
+    "fx": (FX_ARCHIVE_SOURCE, parse_fx_page),
+    "news": (NEWS_ARCHIVE_SOURCE, parse_news_page),
+}
+
+_decompressors = None
+
+def _init_worker(dictionaries: dict):
+    global _decompressors
+    _decompressors = make_decompressors({version: zstandard.ZstdCompressionDict(data) for version, data in dictionaries.items()})
+
+def _parse_chunk(dataset: str, frames: list) -> list[dict]:
+    parse_page = DATASETS[dataset][1]
+    records = []
+    for version, frame in frames:
+        records.extend(parse_page(decode_record(version, frame, _decompressors)))
+    return records
+
+def _chunks(iterable, size: int):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+def reparse(dataset: str, workers: int = None, archive: PageArchive = None) -> pd.DataFrame:
+    """
+    Run the extractor of a dataset over every archived page, in a process pool.
+    Workers receive compressed pages and decompress them themselves.
+
+    :param dataset: "fx" or "news".
+    :param workers: Worker processes (default: number of cores).
+    :param archive: Archive to read (default: the one the scraper writes for the dataset).
+    :return: One row per extracted rate or article, in fetch order.
+    """
+    source, _ = DATASETS[dataset]
+    archive = archive or PageArchive(source)
+    dictionaries = {version: dictionary.as_bytes() for version, dictionary in archive.dictionaries().items()}
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(dictionaries,)) as executor:
+        results = executor.map(partial(_parse_chunk, dataset), _chunks(archive.iter_frames(), CHUNK_SIZE))
+        return pd.DataFrame([record for chunk in results for record in chunk])
+
+def save_reparsed(df: pd.DataFrame, dataset: str):
+    """Write the rebuilt dataset with the scrapers' file layout, prefixed with OUTPUT_PREFIX."""
+    if dataset == "fx":
+        for (curr_from, curr_to), rates in df.groupby(["from", "to"]):
+            save_tools.save_to_csv(rates.sort_values("timestamp"), f"{OUTPUT_PREFIX}currency_exchange_rate_{curr_from}_{curr_to}.csv", ignore_overwrite=True)
+    else:
+        for keyword, news in df.groupby("keyword"):
+            # the latest fetch of an article wins
+            news = news.drop_duplicates(subset=["Title"], keep="last")[["Title", "Date", "Link", "Summary"]]
+            save_tools.save_to_csv(news, f"{OUTPUT_PREFIX}{keyword}_news.csv", ignore_overwrite=True)
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild the FX or news datasets from the raw page archive, without network access.")
+    parser.add_argument("dataset", choices=list(DATASETS))
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: number of cores)")
+    parser.add_argument("--train-dictionary", action="store_true", help="Retrain the compression dictionary on the archived pages first")
+    args = parser.parse_args()
+
+    archive = PageArchive(DATASETS[args.dataset][0])
+    if args.train_dictionary:
+        archive.train_dictionary()
+    stats = archive.stats()
+    print(f"🗄️ {stats['pages']} pages archived, {stats['compressed_bytes'] / 1024:.0f} KiB "
+          f"({stats['original_bytes'] / max(stats['compressed_bytes'], 1):.1f}x compression)")
+
+    started_at = time.perf_counter()
+    df = reparse(args.dataset, args.workers, archive)
+    print(f"⏱️ {len(df)} rows extracted in {time.perf_counter() - started_at:.1f}s")
+    if not df.empty:
+        save_reparsed(df, args.dataset)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+import argparse
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qsl
+import numpy as np
+import pandas as pd
+import requests
+from dotenv import load_dotenv
+
+if os.path.exists(".env"):
+    load_dotenv()
+
+RECORDINGS_DIR = "./data/recordings"
+DEFAULT_PORT = 8765
+
+# Local path served for each third-party service and the real endpoint it stands in for
+SERVICES = {
+    "/query": {"name": "alpha_vantage", "upstream": os.getenv("ALPHA_VANTAGE_URL")},
+    "/calculator/": {"name": "x_rates", "upstream": "https://x-rates.com/calculator/"},
+    "/search": {"name": "news", "upstream": os.getenv("NEWS_PAGE_URL")},
+}
+IGNORED_PARAMS = {"apikey"}     # never part of a recording key (and never stored)
+
+DEFAULT_CONFIG = {
+    "latency": 0.0,         # seconds added to every response
+    "jitter": 0.0,          # random extra latency, up to this many seconds
+    "error_rate": 0.0,      # share of requests answered with HTTP 500
+    "throttle_rate": 0.0,   # share of requests answered with the service's throttling response
+    "news_pages": 100,      # pages with results in the news search
+    "record": False,        # proxy to the real service and store its responses
+    "seed": None,
+}
+
+AV_THROTTLE_NOTE = ("Thank you for using Alpha Vantage! Our standard API call frequency is 5 calls per minute "
+                    "and 500 calls per day.")
+
+def recording_key(service: str, params: dict) -> str:
+    """Stable key of a request: the service and its sorted parameters (secrets excluded)."""
+    relevant = sorted((key, value) for key, value in params.items() if key not in IGNORED_PARAMS)
+    return hashlib.sha1(json.dumps([service, relevant]).encode("utf-8")).hexdigest()
+
+def recording_path(service: str, params: dict) -> str:
+    return os.path.join(RECORDINGS_DIR, service, f"{recording_key(service, params)}.json")
+
+def save_recording(service: str, params: dict, status: int, content_type: str, body: str):
+    path = recording_path(service, params)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump({"status": status, "content_type": content_type, "body": body}, file, ensure_ascii=False)
+
+def load_recording(service: str, params: dict):
+    path = recording_path(service, params)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)
+
+def _seeded_random(*parts) -> np.random.Generator:
+    seed = int(hashlib.sha1("|".join(map(str, parts)).encode("utf-8")).hexdigest()[:8], 16)
+    return np.random.default_rng(seed)
+
+def synthetic_alpha_vantage(params: dict) -> tuple:
+    """Deterministic TIME_SERIES_MONTHLY_ADJUSTED payload for any symbol (20 years of month ends)."""
+    symbol = params.get("symbol", "DEMO")
+    rng = _seeded_random("alpha_vantage", symbol)
+    dates = pd.date_range(end=pd.Timestamp.today().normalize(), periods=240, freq="ME")
+    close = 10 * np.exp(np.cumsum(rng.normal(0.005, 0.06, len(dates))))
+    dividends = np.where(dates.month == 5, np.round(close * 0.02, 4), 0.0)
+    # Each dividend scales down every earlier price by (1 - dividend / close)
+    factors = 1 - dividends / close
+    adjusted = close * np.cumprod(factors[::-1])[::-1] / factors
+
+    series = {}
+    for date, price, adjusted_price, dividend in zip(dates, close, adjusted, dividends):
+        series[date.strftime("%Y-%m-%d")] = {
+            "1. open": f"{price * 0.98:.4f}",
+            "2. high": f"{price * 1.05:.4f}",
+            "3. low": f"{price * 0.95:.4f}",
+            "4. close": f"{price:.4f}",
+            "5. adjusted close": f"{adjusted_price:.4f}",
+            "6. volume": str(int(rng.integers(1e5, 1e7))),
+            "7. dividend amount": f"{dividend:.4f}",
+        }
+    body = {"Meta Data": {"2. Symbol": symbol}, "Monthly Adjusted Time Series": series}
+    return 200, "application/json", json.dumps(body)
+
+def synthetic_x_rates(params: dict) -> tuple:
+    """Calculator page with the `span.ccOutputRslt` element fetch_currency_rates reads."""
+    curr_from, curr_to = params.get("from", "EUR"), params.get("to", "USD")
+    rate = 1.0 if curr_from == curr_to else float(_seeded_random("x_rates", curr_from, curr_to).uniform(0.5, 2.0))
+    body = (f'<html><body><div class="ccOutputTrail">{curr_from} to {curr_to}</div>'
+            f'<span class="ccOutputRslt">{rate:,.6f}<span class="ccOutputCode"> {curr_to}</span></span>'
+            f'</body></html>')
+    return 200, "text/html; charset=utf-8", body
+
+def synthetic_news(params: dict, news_pages: int) -> tuple:
+    """Search results page matching utils.news_parsing.PAGE_ELEMENTS_SELECTORS (10 articles per page)."""
+    keyword = params.get("kw", "").strip('"')
+    page = int(params.get("pg", 1))
+    articles = []
+    if page <= news_pages:
+        published = datetime(2025, 1, 1) - timedelta(days=page)
+        for position in range(10):
+            article_id = f"{page}-{position}"
+            date = (published - timedelta(hours=position)).strftime("%d-%m-%Y %H:%M")
+            articles.append(
+                f'<div class="article"><h3><a href="/articles/{article_id}">{keyword} article {article_id}</a></h3>'
+                f'<div class="item-info"><a href="/articles/{article_id}">{date}</a></div>'
+                f'<div><div><a href="/articles/{article_id}"><img src="/img/{article_id}.jpg"></a></div>'
+                f'<div><a href="/articles/{article_id}">Summary of {keyword} article {article_id}</a></div></div></div>'
+            )
+
+    pagination = "".join(f'<li class="page-item"><a href="?pg={number}">{number}</a></li>'
+                         for number in range(page + 1, min(page + 5, news_pages) + 1))
+    body = (f'<html><body><div class="search-results"><div class="article-category">{"".join(articles)}</div></div>'
+            f'<ul class="pagination"><li class="page-item active"><a>{page}</a></li>{pagination}</ul></body></html>')
+    return 200, "text/html; charset=utf-8", body
+
+def throttled_response(service: str) -> tuple:
+    if service == "alpha_vantage":
+        return 200, "application/json", json.dumps({"Note": AV_THROTTLE_NOTE})
+    return 429, "text/plain", "Too Many Requests"
+
+class StandinRequestHandler(BaseHTTPRequestHandler):
+    """Serves recorded (or synthetic) responses of the third-party services with configurable faults."""
+
+    def do_GET(self):
+        config = self.server.config
+        parsed = urlparse(self.path)
+        params = dict(parse_qsl(parsed.query))
+        service = SERVICES.get(parsed.path)
+        if service is None:
+            return self._send(404, "text/plain", "Unknown stand-in path")
+
+        delay = config["latency"] + (self.server.random.uniform(0, config["jitter"]) if config["jitter"] else 0)
+        if delay:
+            time.sleep(delay)
+
+        if config["throttle_rate"] and self.server.random.random() < config["throttle_rate"]:
+            return self._send(*throttled_response(service["name"]))
+        if config["error_rate"] and self.server.random.random() < config["error_rate"]:
+            return self._send(500, "text/plain", "Internal Server Error")
+
+        if config["record"]:
+            return self._send(*self._record(service, params))
+
+        recording = load_recording(service["name"], params)
+        if recording:
+            return self._send(recording["status"], recording["content_type"], recording["body"])
+
+        if service["name"] == "alpha_vantage":
+            return self._send(*synthetic_alpha_vantage(params))
+        if service["name"] == "x_rates":
+            return self._send(*synthetic_x_rates(params))
+        return self._send(*synthetic_news(params, config["news_pages"]))
+
+    def _record(self, service: dict, params: dict) -> tuple:
+        """Forward the request to the real service once and store the response for replay."""
+        if not service["upstream"]:
+            return 502, "text/plain", f"No upstream configured for {service['name']}"
+        try:
+            upstream_params = dict(params)
+            if service["name"] == "alpha_vantage" and os.getenv("ALPHA_VANTAGE_API_KEY"):
+                upstream_params["apikey"] = os.getenv("ALPHA_VANTAGE_API_KEY")
+            response = requests.get(service["upstream"], params=upstream_params, timeout=30)
+        except requests.exceptions.RequestException as e:
+            return 502, "text/plain", f"Upstream error: {e}"
+
+        content_type = response.headers.get("Content-Type", "text/plain")
+        save_recording(service["name"], params, response.status_code, content_type, response.text)
+        print(f"📼 Recorded {service['name']} {params}")
+        return response.status_code, content_type, response.text
+
+    def _send(self, status: int, content_type: str, body: str):
+        payload = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass    # keep benchmarks quiet
+
+def start_standin_server(port: int = 0, **config) -> ThreadingHTTPServer:
+    """
+    Start the stand-in server in a background thread.
+
+    :param port: Port to listen on (0 picks a free one).
+    :param config: Overrides of DEFAULT_CONFIG (latency, jitter, error_rate, throttle_rate, news_pages, record, seed).
+    :return: The running server; its URL is `server.base_url`. Stop it with `server.shutdown()`.
+    """
+    unknown = set(config) - set(DEFAULT_CONFIG)
+    if unknown:
+        raise ValueError(f"Unknown stand-in options: {', '.join(sorted(unknown))}")
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), StandinRequestHandler)
+    server.daemon_threads = True
+    server.config = {**DEFAULT_CONFIG, **config}
+    server.random = random.Random(server.config["seed"])
+    server.base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-ins for Alpha Vantage, x-rates and the news search page.")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Random extra latency (seconds)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of HTTP 500 responses")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Share of throttling responses")
+    parser.add_argument("--news-pages", type=int, default=100, help="Pages with news results")
+    parser.add_argument("--record", action="store_true", help="Proxy to the real services and record their responses")
+    args = parser.parse_args()
+
+    server = start_standin_server(
+        port=args.port, latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate, news_pages=args.news_pages, record=args.record,
+    )
+    print(f"🧪 Stand-in servers listening on {server.base_url}")
+    print(f"   ALPHA_VANTAGE_URL={server.base_url}/query")
+    print(f"   NEWS_PAGE_URL={server.base_url}/search")
+    print(f"   x-rates calculator: {server.base_url}/calculator/")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
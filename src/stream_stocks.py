@@ -0,0 +1,138 @@
+import argparse
+import os
+import queue
+import threading
+import time
+import pandas as pd
+import requests
+from sqlalchemy import Column, String, Date, Float, BigInteger
+from api_v2 import fetch_stock_data, process_data
+from data_load_analytics import DEFAULT_SYMBOLS, PRICES_FILENAME_TEMPLATE
+from utils import save_tools, validation
+from utils.price_store import PriceStore
+from utils.sqlalchemy.config import create_table_if_not_exists, insert_data, ID_TYPE
+
+# One row per (symbol, month); the legacy `monthly_adjusted_data` table is keyed on date only
+TABLE_NAME = "monthly_adjusted_prices"
+QUEUE_SIZE = 4                  # parsed frames waiting to be loaded (bounds memory)
+PARQUET_SUBDIR = "parquet"     # Parquet archives go to ./data/parquet
+ARCHIVE_FORMATS = ["csv", "parquet", "store"]
+_DONE = object()                # end-of-stream marker
+
+def create_prices_table():
+    columns = [
+        Column("id", ID_TYPE, primary_key=True, autoincrement=True),
+        Column("symbol", String, nullable=False),
+        Column("date", Date, nullable=False),
+        Column("open", Float),
+        Column("high", Float),
+        Column("low", Float),
+        Column("close", Float),
+        Column("adjusted_close", Float),
+        Column("volume", BigInteger),
+        Column("dividend_amount", Float),
+    ]
+    create_table_if_not_exists(TABLE_NAME, columns, unique_constraints=[("symbol", "date")])
+
+def to_price_frame(df: pd.DataFrame, symbol: str) -> pd.DataFrame:
+    """Type the frame returned by `api_v2.process_data` (the API sends every value as text)."""
+    prices = df.apply(pd.to_numeric, errors="coerce").reset_index()
+    prices["volume"] = prices["volume"].astype("Int64")
+    prices.insert(0, "symbol", symbol)
+    return prices
+
+def to_records(prices: pd.DataFrame) -> list[dict]:
+    """Convert a price frame to database records (NaN becomes NULL)."""
+    prices = prices.assign(date=prices["date"].dt.date)
+    return prices.astype(object).where(prices.notna(), None).to_dict(orient="records")
+
+def archive_prices(prices: pd.DataFrame, symbol: str, archive_format: str):
+    """Optional side output, in the same layout `api_v2` writes."""
+    if archive_format == "store":
+        PriceStore().write(symbol, prices)
+        return
+    df = prices.drop(columns="symbol").set_index("date")
+    filename = PRICES_FILENAME_TEMPLATE.format(symbol=symbol)
+    if archive_format == "csv":
+        save_tools.save_to_csv(df, filename, ignore_overwrite=True, index=True)
+    else:
+        parquet_dir = os.path.join(save_tools.OUTPUT_DIR, PARQUET_SUBDIR)
+        os.makedirs(parquet_dir, exist_ok=True)
+        df.to_parquet(os.path.join(parquet_dir, filename.replace(".csv", ".parquet")))
+
+def _put(frames: queue.Queue, item, stop: threading.Event) -> bool:
+    """Block until there is room in the queue, unless the loader stopped."""
+    while not stop.is_set():
+        try:
+            frames.put(item, timeout=1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+def produce(symbols: list, frames: queue.Queue, stop: threading.Event, session: requests.Session = None):
+    """Fetch and parse each symbol and hand the frame to the loader; blocks while the queue is full."""
+    try:
+        for symbol in symbols:
+            try:
+                time_series = fetch_stock_data(symbol, session=session)
+                prices = to_price_frame(process_data(time_series), symbol) if time_series else None
+            except Exception as e:
+                print(f"❌ Error fetching {symbol}: {e}")
+                continue
+            if prices is not None and not _put(frames, (symbol, prices), stop):
+                return
+    finally:
+        _put(frames, _DONE, stop)
+
+def stream_symbols(symbols: list, archive_format: str = None, queue_size: int = QUEUE_SIZE, session: requests.Session = None) -> int:
+    """
+    Fetch the symbols in a background thread and load each parsed frame straight into the database,
+    so the next symbol is fetched while the previous one is loaded. No CSV round trip.
+
+    :param symbols: Stock symbols.
+    :param archive_format: Also write each frame as "csv", "parquet" or to the binary price store (None: database only).
+    :param queue_size: Frames held in memory between the fetcher and the loader.
+    :param session: HTTP session shared by the API calls (default: a new connection per call).
+    :return: Number of rows loaded.
+    """
+    create_prices_table()
+    frames = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+    producer = threading.Thread(target=produce, args=(symbols, frames, stop, session), daemon=True)
+    producer.start()
+
+    loaded = 0
+    try:
+        while True:
+            item = frames.get()
+            if item is _DONE:
+                break
+            symbol, prices = item
+            prices = validation.validate_and_quarantine(prices, "stock")
+            inserted = insert_data(TABLE_NAME, to_records(prices), conflict_columns=["symbol", "date"])
+            if archive_format:
+                archive_prices(prices, symbol, archive_format)
+            loaded += inserted
+            if inserted:
+                print(f"✅ {symbol}: {inserted} periods loaded")
+            else:
+                print(f"❌ {symbol}: no periods loaded")
+    finally:
+        stop.set()      # unblocks the fetcher if the loader failed
+        producer.join(timeout=5)
+    return loaded
+
+def main():
+    parser = argparse.ArgumentParser(description=f"Stream monthly adjusted prices from the API straight into the '{TABLE_NAME}' table.")
+    parser.add_argument("symbols", nargs="*", default=DEFAULT_SYMBOLS, help=f"Symbols to load (default: {' '.join(DEFAULT_SYMBOLS)})")
+    parser.add_argument("--archive", choices=ARCHIVE_FORMATS, default=None, help="Also keep a CSV, Parquet or binary price store copy of each series")
+    parser.add_argument("--queue-size", type=int, default=QUEUE_SIZE, help=f"Frames buffered between fetch and load (default: {QUEUE_SIZE})")
+    args = parser.parse_args()
+
+    started_at = time.perf_counter()
+    loaded = stream_symbols(args.symbols, args.archive, args.queue_size)
+    print(f"⏱️ {loaded} rows for {len(args.symbols)} symbols in {time.perf_counter() - started_at:.1f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+import argparse
+import hashlib
+import heapq
+import json
+import os
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from api_v2 import fetch_stock_data, process_data, ApiThrottled
+from utils import save_tools
+
+STATE_FILENAME = "symbol_universe_state.json"
+DAILY_API_BUDGET = 25           # Alpha Vantage free tier: 25 requests per day
+MIN_REFRESH_INTERVAL = 86400    # never fetch the same series twice within this many seconds
+DEFAULT_ENDPOINT = "monthly_adjusted"
+USAGE_KEY = "api_calls"         # state entry with the calls spent on the current UTC day
+
+# PSI-20 constituents (Euronext Lisbon)
+PSI20_SYMBOLS = [
+    "ALTR.LS", "BCP.LS", "COR.LS", "CTT.LS", "EDP.LS", "EDPR.LS", "EGL.LS", "GALP.LS",
+    "IBS.LS", "JMT.LS", "NOS.LS", "NVG.LS", "PHR.LS", "RENE.LS", "SEM.LS", "SON.LS",
+]
+
+def load_symbols(path: str = None) -> list:
+    """
+    Load the symbol universe from a file (one symbol per line, or a CSV with a `symbol` column).
+    Defaults to the PSI-20 constituents.
+    """
+    if path is None:
+        return list(PSI20_SYMBOLS)
+    if path.endswith(".csv"):
+        return pd.read_csv(path)["symbol"].dropna().str.strip().tolist()
+    with open(path, encoding="utf-8") as file:
+        return [line.strip() for line in file if line.strip() and not line.startswith("#")]
+
+def load_state() -> dict:
+    path = os.path.join(save_tools.OUTPUT_DIR, STATE_FILENAME)
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)
+
+def save_state(state: dict):
+    """Write the state to a temporary file and rename it over the previous one."""
+    os.makedirs(save_tools.OUTPUT_DIR, exist_ok=True)
+    path = os.path.join(save_tools.OUTPUT_DIR, STATE_FILENAME)
+    file_descriptor, temp_path = tempfile.mkstemp(dir=save_tools.OUTPUT_DIR, suffix=".tmp")
+    with os.fdopen(file_descriptor, "w", encoding="utf-8") as file:
+        json.dump(state, file, indent=2)
+    save_tools.copy_file_mode(temp_path, path)
+    os.replace(temp_path, path)
+
+def state_key(symbol: str, endpoint: str) -> str:
+    return f"{symbol}|{endpoint}"
+
+def calls_spent_today(state: dict, now: float = None) -> int:
+    """API calls already spent on the current UTC day (the Alpha Vantage quota resets daily)."""
+    usage = state.get(USAGE_KEY) or {}
+    return usage.get("calls", 0) if usage.get("day") == time.strftime("%Y-%m-%d", time.gmtime(now or time.time())) else 0
+
+def record_call(state: dict, now: float = None):
+    """Count one API call against today's quota, whatever its outcome."""
+    now = now or time.time()
+    state[USAGE_KEY] = {"day": time.strftime("%Y-%m-%d", time.gmtime(now)), "calls": calls_spent_today(state, now) + 1}
+
+def priority(entry: dict, now: float) -> float:
+    """
+    Priority of a series: the staler, the more often it changed and the more volatile, the higher.
+    Series never fetched come first; series fetched within MIN_REFRESH_INTERVAL are not due (0).
+
+    :param entry: State of the series (None if never fetched).
+    :param now: Current unix time.
+    """
+    if not entry or not entry.get("last_fetched"):
+        return float("inf")
+
+    staleness = now - entry["last_fetched"]
+    if staleness < MIN_REFRESH_INTERVAL:
+        return 0.0
+
+    # Laplace-smoothed share of fetches that returned new data
+    change_rate = (entry.get("changes", 0) + 1) / (entry.get("fetches", 0) + 2)
+    volatility = entry.get("volatility") or 0.0
+    return (staleness / 86400) * change_rate * (1 + volatility)
+
+def plan_calls(symbols: list, state: dict, budget: int = DAILY_API_BUDGET, endpoint: str = DEFAULT_ENDPOINT, now: float = None) -> list:
+    """
+    Pick the series to fetch today, highest priority first, within the API budget.
+
+    :return: List of (symbol, endpoint, priority).
+    """
+    now = now or time.time()
+    queue = []
+    for order, symbol in enumerate(symbols):
+        score = priority(state.get(state_key(symbol, endpoint)), now)
+        if score > 0:
+            heapq.heappush(queue, (-score, order, symbol))
+
+    plan = []
+    while queue and len(plan) < budget:
+        score, _, symbol = heapq.heappop(queue)
+        plan.append((symbol, endpoint, -score))
+    return plan
+
+def hash_payload(time_series: dict) -> str:
+    return hashlib.sha256(json.dumps(time_series, sort_keys=True).encode("utf-8")).hexdigest()
+
+def record_fetch(state: dict, symbol: str, endpoint: str, time_series: dict, df: pd.DataFrame = None, now: float = None):
+    """
+    Update the state of a series after a fetch: last fetch time, whether the content changed and its volatility.
+
+    :param time_series: Raw API payload (hashed to detect changes).
+    :param df: Processed series (used for the volatility of the adjusted close).
+    """
+    now = now or time.time()
+    entry = state.setdefault(state_key(symbol, endpoint), {"fetches": 0, "changes": 0})
+    content_hash = hash_payload(time_series)
+
+    entry["fetches"] += 1
+    if content_hash != entry.get("content_hash"):
+        entry["changes"] += 1
+        entry["last_changed"] = now
+        entry["content_hash"] = content_hash
+    entry["last_fetched"] = now
+
+    if df is not None and len(df) > 2:
+        log_returns = np.diff(np.log(df["adjusted_close"].astype(float).to_numpy()[-13:]))
+        entry["volatility"] = float(np.nanstd(log_returns) * np.sqrt(12))
+
+def run_daily(symbols: list, budget: int = DAILY_API_BUDGET):
+    """
+    Fetch the planned series within what is left of today's budget. Every call counts, failed
+    and throttled ones too, and the run stops at the first throttling response.
+    """
+    state = load_state()
+    remaining = max(budget - calls_spent_today(state), 0)
+    plan = plan_calls(symbols, state, remaining)
+    print(f"🗓️ {len(plan)} of {len(symbols)} series planned ({remaining} of {budget} calls left today)")
+
+    for symbol, endpoint, score in plan:
+        print(f"🔍 {symbol} (priority {score:.2f})")
+        # counted before the call, so a crash during it cannot give the call back
+        record_call(state)
+        save_state(state)
+        try:
+            time_series = fetch_stock_data(symbol, raise_on_throttle=True)
+        except ApiThrottled as e:
+            print(f"🛑 API limit reached, stopping for today: {e}")
+            break
+        if not time_series:
+            continue
+
+        df = process_data(time_series)
+        if hash_payload(time_series) != state.get(state_key(symbol, endpoint), {}).get("content_hash"):
+            # the new hash is only recorded once the CSV holds the data it stands for
+            if not save_tools.save_to_csv(df, f"{symbol}_monthly_adjusted_data.csv", ignore_overwrite=True, index=True):
+                print(f"⚠️ {symbol} not saved, it stays due for the next run.")
+                continue
+        else:
+            print(f"✅ {symbol} unchanged since the last fetch.")
+        record_fetch(state, symbol, endpoint, time_series, df)
+        save_state(state)
+
+def main():
+    parser = argparse.ArgumentParser(description="Fetch the stalest and most volatile series of a symbol universe within the daily API budget.")
+    parser.add_argument("--symbols-file", default=None, help="Symbol list (default: PSI-20 constituents)")
+    parser.add_argument("--budget", type=int, default=DAILY_API_BUDGET, help=f"API calls available (default: {DAILY_API_BUDGET})")
+    parser.add_argument("--dry-run", action="store_true", help="Only print today's plan")
+    args = parser.parse_args()
+
+    symbols = load_symbols(args.symbols_file)
+    if args.dry_run:
+        state = load_state()
+        for symbol, endpoint, score in plan_calls(symbols, state, max(args.budget - calls_spent_today(state), 0)):
+            print(f"{symbol:10} {endpoint:18} {score:.2f}")
+        return
+
+    run_daily(symbols, args.budget)
+
+if __name__ == "__main__":
+    main()
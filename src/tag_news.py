@@ -0,0 +1,165 @@
+import argparse
+import math
+import os
+import re
+import time
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from utils import save_tools
+import company_registry
+
+TAG_COLUMNS = ["sentiment", "companies", "tickers"]
+CHUNK_SIZE = 500                    # articles per task sent to a worker process
+SENTIMENT_NORMALIZATION = 15        # VADER-style squashing of the raw score into [-1, 1]
+
+# Accent-free, lowercase word stems with their polarity (Portuguese and English financial news)
+SENTIMENT_LEXICON = {
+    # positive
+    "lucro": 2, "lucros": 2, "subida": 1.5, "sobe": 1.5, "sobem": 1.5, "crescimento": 2, "cresce": 1.5,
+    "aumento": 1, "aumenta": 1, "valorizacao": 1.5, "valoriza": 1.5, "recorde": 1.5, "ganho": 1.5,
+    "ganhos": 1.5, "dividendo": 1, "dividendos": 1, "supera": 1.5, "forte": 1, "positivo": 1.5,
+    "expansao": 1.5, "otimista": 2, "melhora": 1.5, "melhoria": 1.5, "compra": 0.5, "investimento": 1,
+    "profit": 2, "profits": 2, "growth": 2, "gain": 1.5, "gains": 1.5, "rise": 1.5, "rises": 1.5,
+    "surge": 2, "record": 1.5, "beat": 1.5, "beats": 1.5, "strong": 1, "upgrade": 2, "positive": 1.5,
+    "expansion": 1.5, "outperform": 2, "dividend": 1,
+    # negative
+    "prejuizo": -2, "prejuizos": -2, "queda": -1.5, "cai": -1.5, "caem": -1.5, "desce": -1.5,
+    "perda": -1.5, "perdas": -1.5, "desvalorizacao": -1.5, "desvaloriza": -1.5, "crise": -2,
+    "fraco": -1, "negativo": -1.5, "multa": -2, "coima": -2, "greve": -1.5, "despedimento": -2,
+    "despedimentos": -2, "corte": -1, "cortes": -1, "risco": -1, "recuo": -1, "pessimista": -2,
+    "investigacao": -1, "loss": -1.5, "losses": -1.5, "fall": -1.5, "falls": -1.5, "drop": -1.5,
+    "drops": -1.5, "decline": -1.5, "weak": -1, "downgrade": -2, "negative": -1.5,
+    "strike": -1.5, "layoffs": -2, "lawsuit": -2, "risk": -1, "miss": -1.5, "misses": -1.5,
+}
+NEGATIONS = {"nao", "nem", "sem", "nunca", "not", "no", "never", "without"}
+
+def build_entities(companies: list) -> dict:
+    """Main ticker and aliases of each company of a registry (see `company_registry.load_registry`)."""
+    return {company["name"]: {"ticker": company["tickers"][0], "aliases": company["aliases"]} for company in companies}
+
+# Companies recognised in the news, with the aliases used by the press (replaced by use_entities)
+COMPANY_ENTITIES = build_entities(company_registry.COMPANIES)
+
+WORD_PATTERN = re.compile(r"[a-z0-9]+(?:-[a-z0-9]+)*")
+
+def normalize_text(text: str) -> str:
+    """Lowercase and strip accents, so 'Jerónimo' and 'jeronimo' match."""
+    text = unicodedata.normalize("NFKD", str(text).lower())
+    return "".join(char for char in text if not unicodedata.combining(char))
+
+def _compile_alias_pattern() -> tuple:
+    """
+    One pattern over every alias, longest first: at each position the longest alias wins and
+    the matches do not overlap, so "edp renovaveis" is EDP Renováveis only, not EDP as well.
+
+    :return: The pattern and the company of each alias.
+    """
+    # aliases of a JSON registry may keep their accents, the texts they are matched against do not
+    alias_companies = {normalize_text(alias): company for company, entity in COMPANY_ENTITIES.items() for alias in entity["aliases"]}
+    aliases = "|".join(re.escape(alias) for alias in sorted(alias_companies, key=len, reverse=True))
+    return re.compile(rf"\b(?:{aliases})\b"), alias_companies
+
+ALIAS_PATTERN, ALIAS_COMPANIES = _compile_alias_pattern()
+
+def use_entities(entities: dict):
+    """Recognise these companies from now on (also the initializer of the worker processes)."""
+    global COMPANY_ENTITIES, ALIAS_PATTERN, ALIAS_COMPANIES
+    COMPANY_ENTITIES = entities
+    ALIAS_PATTERN, ALIAS_COMPANIES = _compile_alias_pattern()
+
+def score_sentiment(text: str) -> float:
+    """
+    Lexicon score of a text in [-1, 1]. A negation flips the polarity of the next word.
+    """
+    score = 0.0
+    negate = False
+    for word in WORD_PATTERN.findall(normalize_text(text)):
+        if word in NEGATIONS:
+            negate = True
+            continue
+        polarity = SENTIMENT_LEXICON.get(word, 0)
+        score += -polarity if negate else polarity
+        negate = False
+    return score / math.sqrt(score * score + SENTIMENT_NORMALIZATION)
+
+def find_entities(text: str) -> tuple:
+    """
+    Companies and tickers mentioned in a text.
+
+    :return: (companies, tickers), both joined with "; ".
+    """
+    normalized = normalize_text(text)
+    mentioned = {ALIAS_COMPANIES[match.group(0)] for match in ALIAS_PATTERN.finditer(normalized)}
+    companies = []
+    tickers = []
+    for company, entity in COMPANY_ENTITIES.items():
+        if company in mentioned or entity["ticker"].lower() in normalized:
+            companies.append(company)
+            tickers.append(entity["ticker"])
+    return "; ".join(companies), "; ".join(tickers)
+
+def tag_chunk(texts: list) -> list:
+    """Tag a chunk of article texts (runs in a worker process)."""
+    return [(score_sentiment(text), *find_entities(text)) for text in texts]
+
+def tag_untagged(df: pd.DataFrame, workers: int = None) -> int:
+    """
+    Tag the articles that have no sentiment yet, in chunks across a process pool.
+
+    :param df: News with `Title` and `Summary` columns (tag columns are added if missing).
+    :param workers: Worker processes (defaults to the number of cores).
+    :return: Number of articles tagged.
+    """
+    for column in TAG_COLUMNS:
+        if column not in df.columns:
+            df[column] = np.nan
+
+    untagged = df.index[df["sentiment"].isna()]
+    if len(untagged) == 0:
+        return 0
+
+    texts = (df.loc[untagged, "Title"].fillna("") + ". " + df.loc[untagged, "Summary"].fillna("")).tolist()
+    chunks = [texts[start:start + CHUNK_SIZE] for start in range(0, len(texts), CHUNK_SIZE)]
+
+    if len(chunks) == 1:
+        results = tag_chunk(chunks[0])
+    else:
+        # workers get the entities of this process, whatever registry it was given
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count(), initializer=use_entities, initargs=(COMPANY_ENTITIES,)) as executor:
+            results = [row for chunk_result in executor.map(tag_chunk, chunks) for row in chunk_result]
+
+    tags = pd.DataFrame(results, index=untagged, columns=TAG_COLUMNS)
+    df["companies"] = df["companies"].astype(object)
+    df["tickers"] = df["tickers"].astype(object)
+    df.loc[untagged, TAG_COLUMNS] = tags
+    return len(untagged)
+
+def main():
+    parser = argparse.ArgumentParser(description="Tag news with a sentiment score and the companies they mention.")
+    company_registry.add_company_arguments(parser)
+    parser.add_argument("--news-file", default=None, help="News CSV in the data folder (default: the news files of the selected companies)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: number of cores)")
+    args = parser.parse_args()
+
+    registry, companies = company_registry.select_companies(args)
+    # an article found for one company may mention any company of the registry
+    use_entities(build_entities(registry))
+    news_files = [args.news_file] if args.news_file else [company_registry.news_filename(company) for company in companies]
+
+    for news_file in news_files:
+        # dates stay as text: the file is written back as is
+        df = save_tools.load_existing_dataframe(news_file, columns=["Title", "Date", "Link", "Summary"],
+                                                dataset="news", parse_dates=False)
+        started_at = time.perf_counter()
+        tagged = tag_untagged(df, workers=args.workers)
+        if not tagged:
+            print(f"✅ All news in {news_file} are already tagged.")
+            continue
+
+        print(f"🏷️ {tagged} news in {news_file} tagged in {time.perf_counter() - started_at:.1f}s")
+        save_tools.save_to_csv(df, news_file, ignore_overwrite=True, append_data=False)
+
+if __name__ == "__main__":
+    main()
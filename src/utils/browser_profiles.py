@@ -0,0 +1,101 @@
+import os
+from selenium.webdriver.chrome.options import Options
+
+DISK_CACHE_DIR = os.path.join(".", "utils", "webdriver", "cache")   # shared between runs
+
+# Resources that are not needed to read the search results
+BLOCKED_URL_PATTERNS = [
+    # images and media
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico", "*.mp4", "*.webm",
+    # fonts and stylesheets
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot", "*.css",
+    # ads and trackers
+    "*doubleclick.net*", "*googlesyndication.com*", "*googletagmanager.com*", "*google-analytics.com*",
+    "*googleadservices.com*", "*facebook.net*", "*scorecardresearch.com*", "*taboola.com*", "*outbrain.com*",
+]
+
+BROWSER_PROFILES = {
+    # Same behaviour as before profiles existed: visible browser, full page load
+    "default": {
+        "headless": False,
+        "page_load_strategy": "normal",
+        "block_resources": False,
+        "disk_cache": False,
+        "wait_for_results": False,  # fixed sleep of webscraping_selenium.PAGE_LOAD_TIMEOUT seconds
+    },
+    # Headless, returns as soon as the DOM is ready and skips non-essential downloads
+    "lightweight": {
+        "headless": True,
+        "page_load_strategy": "eager",
+        "block_resources": True,
+        "disk_cache": True,
+        "wait_for_results": True,   # return as soon as the results container is rendered
+    },
+}
+
+def get_profile(profile_name: str) -> dict:
+    """
+    Return a browser profile by name.
+
+    :param profile_name: One of BROWSER_PROFILES keys.
+    """
+    if profile_name not in BROWSER_PROFILES:
+        raise ValueError(f"Unknown browser profile '{profile_name}'. Available: {', '.join(BROWSER_PROFILES)}")
+    return BROWSER_PROFILES[profile_name]
+
+def build_chrome_options(profile_name: str = "default") -> Options:
+    """
+    Build the Chrome options for a profile. Headless mode is not set here: pass the profile's
+    "headless" flag to `uc.Chrome(headless=...)`, which adds the flag itself.
+
+    :param profile_name: One of BROWSER_PROFILES keys.
+    """
+    profile = get_profile(profile_name)
+
+    options = Options()
+    options.add_argument("--disable-gpu")
+    options.page_load_strategy = profile["page_load_strategy"]
+
+    if profile["headless"]:
+        options.add_argument("--window-size=1920,1080")
+
+    if profile["disk_cache"]:
+        os.makedirs(DISK_CACHE_DIR, exist_ok=True)
+        options.add_argument(f"--disk-cache-dir={os.path.abspath(DISK_CACHE_DIR)}")
+
+    if profile["block_resources"]:
+        # Never even request images (the URL patterns below catch the rest)
+        options.add_argument("--blink-settings=imagesEnabled=false")
+
+    return options
+
+def apply_profile(driver, profile_name: str = "default"):
+    """
+    Apply the parts of a profile that need a running driver (request blocking via CDP).
+
+    :param driver: Chrome WebDriver.
+    :param profile_name: One of BROWSER_PROFILES keys.
+    """
+    profile = get_profile(profile_name)
+    if profile["block_resources"]:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+
+def measure_page_load(driver) -> dict:
+    """
+    Read the bytes transferred and requests made by the current page from the Resource Timing API.
+
+    :param driver: WebDriver positioned on the page to measure.
+    """
+    stats = driver.execute_script("""
+        const entries = performance.getEntriesByType('navigation').concat(performance.getEntriesByType('resource'));
+        return {
+            bytes: entries.reduce((total, entry) => total + (entry.transferSize || 0), 0),
+            requests: entries.length
+        };
+    """)
+    return {"bytes": int(stats["bytes"]), "requests": int(stats["requests"])}
+
+if __name__ == "__main__":
+    # do nothing
+    None
@@ -0,0 +1,86 @@
+import os
+import json
+from pathvalidate import sanitize_filename
+from utils.save_tools import OUTPUT_DIR
+
+CHECKPOINT_SUFFIX = "_crawl_checkpoint.jsonl"
+
+def get_checkpoint_path(name: str) -> str:
+    """
+    Path of the staging file for a crawl.
+
+    :param name: Crawl name (e.g. the news CSV filename).
+    """
+    base_name = os.path.splitext(sanitize_filename(name))[0]
+    return os.path.join(OUTPUT_DIR, f"{base_name}{CHECKPOINT_SUFFIX}")
+
+def _drop_partial_line(path: str):
+    """Cut a trailing partial line (crash while writing) so the next entry starts on its own line."""
+    if not os.path.exists(path):
+        return
+    with open(path, "r+b") as file:
+        size = file.seek(0, os.SEEK_END)
+        if size == 0:
+            return
+        file.seek(size - 1)
+        if file.read(1) == b"\n":
+            return
+        file.seek(0)
+        content = file.read()
+        file.truncate(content.rfind(b"\n") + 1)
+        file.flush()
+        os.fsync(file.fileno())
+
+def append_page(path: str, cursor: dict, articles: list[dict]):
+    """
+    Durably append a completed page to the staging file.
+
+    Each line holds the page results together with the crawl cursor, so the
+    last complete line is always a consistent resume point.
+
+    :param path: Staging file path.
+    :param cursor: Crawl state after this page (keyword, last_page, pages_scraped, ...).
+    :param articles: Articles scraped on this page.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    line = json.dumps({"cursor": cursor, "articles": articles}, ensure_ascii=False)
+    _drop_partial_line(path)
+    with open(path, "a", encoding="utf-8") as file:
+        file.write(line + "\n")
+        file.flush()
+        os.fsync(file.fileno())
+
+def load_checkpoint(path: str) -> tuple:
+    """
+    Read the staging file back.
+
+    A trailing partial line (crash while writing) is ignored.
+
+    :param path: Staging file path.
+    :return: The last cursor (None if nothing was staged) and all staged articles.
+    """
+    cursor = None
+    articles = []
+    if not os.path.exists(path):
+        return cursor, articles
+
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                print("⚠️ Ignoring an incomplete checkpoint entry.")
+                continue
+            cursor = entry["cursor"]
+            articles.extend(entry["articles"])
+
+    return cursor, articles
+
+def clear_checkpoint(path: str):
+    """Remove the staging file once its results were merged into the final dataset."""
+    if os.path.exists(path):
+        os.remove(path)
+
+if __name__ == "__main__":
+    # do nothing
+    None
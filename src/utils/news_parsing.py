@@ -0,0 +1,59 @@
+from urllib.parse import urljoin
+from bs4 import BeautifulSoup
+
+# Selectors of the news search page, shared by the Selenium scraper and the offline re-parse
+# (kept free of import side effects: no environment checks, no browser imports)
+PAGE_ELEMENTS_SELECTORS = {
+    "container": '.search-results .article-category',
+    "article": {
+        "item-self": ".article",
+        # all elements contain an anchor tag with the link to the article's page
+        "title": "h3",                  # The title is inside an h3 tag
+        "date": ".item-info a",         # The date is inside an anchor tag
+        "summary": "div>div>a",         # The summary is inside an anchor tag two levels down the article root container
+        # "news_page_url": "div>div>a"
+    },
+    "pagination": ".pagination .page-item:not(.active) a"
+}
+NEWS_ARCHIVE_SOURCE = "news"    # page archive the Selenium scraper writes
+
+def parse_news_html(html, url):
+    """
+    Extract the articles from a saved search page with the same selectors as `webscraping_selenium.scrape_news`
+    (used to re-parse the page archive without a browser).
+
+    :param html: Page source.
+    :param url: Page URL, to resolve relative links.
+    """
+    selectors = PAGE_ELEMENTS_SELECTORS["article"]
+    soup = BeautifulSoup(html, "html.parser")
+    news_data = []
+
+    for article in soup.select(f"{PAGE_ELEMENTS_SELECTORS['container']} {selectors['item-self']}"):
+        title_element = article.select_one(selectors["title"])
+        date_element = article.select_one(selectors["date"])
+        main_link = title_element.find("a") if title_element else None
+        if not title_element or not date_element or not main_link:
+            continue
+
+        # Extract summary (Ensure it's not an image link)
+        summary_element = next((link for link in article.select(selectors["summary"]) if link.get_text(strip=True)), None)
+        if summary_element:
+            summary = summary_element.get_text(" ", strip=True)
+            link = urljoin(url, summary_element.get("href", ""))
+        else:
+            summary = "N/A"
+            link = urljoin(url, main_link.get("href", ""))
+
+        news_data.append({
+            "Title": title_element.get_text(" ", strip=True),
+            "Date": date_element.get_text(" ", strip=True),
+            "Link": link,
+            "Summary": summary,
+        })
+
+    return news_data
+
+if __name__ == "__main__":
+    # do nothing
+    None
@@ -0,0 +1,159 @@
+import glob
+import json
+import os
+import re
+import struct
+import time
+import zstandard
+from utils import save_tools
+
+ARCHIVE_SUBDIR = "page_archive"
+RECORDS_SUFFIX = ".pages"
+DICTIONARY_PATTERN = re.compile(r"\.dict-(\d+)$")
+DICTIONARY_SIZE = 112_640           # zstd's default dictionary size
+TRAIN_AFTER = 100                   # pages stored before a dictionary is trained automatically
+COMPRESSION_LEVEL = 19
+RECORD_HEADER = struct.Struct(">IH")    # frame length, dictionary version (0: no dictionary)
+
+def make_decompressors(dictionaries: dict) -> dict:
+    """One decompressor per dictionary version (0: pages stored before the first dictionary)."""
+    decompressors = {version: zstandard.ZstdDecompressor(dict_data=dictionary) for version, dictionary in dictionaries.items()}
+    decompressors[0] = zstandard.ZstdDecompressor()
+    return decompressors
+
+def decode_record(version: int, frame: bytes, decompressors: dict) -> dict:
+    """Decompress one stored page ({"url", "fetched_at", "html"})."""
+    return json.loads(decompressors[version].decompress(frame))
+
+class PageArchive:
+    """
+    Append-only store of raw fetched pages, one per source (e.g. "x-rates", "news").
+
+    Each page is its own zstd frame, so the file can be appended to by several processes
+    (under `save_tools.file_lock`) and read back in any order. Pages of a source share most
+    of their markup, so once TRAIN_AFTER pages are stored a dictionary is trained on them and
+    used for the next pages, which shrinks each page several times over plain zstd.
+
+    Usage:
+        archive = PageArchive("x-rates")
+        archive.append(response.url, response.text)
+        for page in archive:
+            ...
+    """
+
+    def __init__(self, source: str, directory: str = None):
+        self.source = source
+        self.directory = directory or os.path.join(save_tools.OUTPUT_DIR, ARCHIVE_SUBDIR)
+        self.path = os.path.join(self.directory, f"{source}{RECORDS_SUFFIX}")
+        self._compressors = {}
+        self._dictionaries = None
+        self._records = None    # pages in the file, counted once and then kept up to date by append
+
+    def dictionaries(self) -> dict:
+        """Trained dictionaries by version (read once per instance)."""
+        if self._dictionaries is not None:
+            return self._dictionaries
+        dictionaries = {}
+        for path in glob.glob(os.path.join(self.directory, f"{glob.escape(self.source)}.dict-*")):
+            match = DICTIONARY_PATTERN.search(path)
+            if match:
+                with open(path, "rb") as file:
+                    dictionaries[int(match.group(1))] = zstandard.ZstdCompressionDict(file.read())
+        self._dictionaries = dictionaries
+        return dictionaries
+
+    def _compressor(self, version: int, dictionary) -> zstandard.ZstdCompressor:
+        if version not in self._compressors:
+            self._compressors[version] = zstandard.ZstdCompressor(level=COMPRESSION_LEVEL, dict_data=dictionary)
+        return self._compressors[version]
+
+    def append(self, url: str, html: str, fetched_at: int = None):
+        """
+        Store a fetched page.
+
+        :param url: Final URL of the page, including the query string.
+        :param html: Raw page source.
+        :param fetched_at: Unix time of the fetch (default: now).
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        record = json.dumps({"url": url, "fetched_at": int(fetched_at or time.time()), "html": html}, ensure_ascii=False)
+
+        dictionaries = self.dictionaries()
+        version = max(dictionaries, default=0)
+        frame = self._compressor(version, dictionaries.get(version)).compress(record.encode("utf-8"))
+
+        with save_tools.file_lock(self.path):
+            with open(self.path, "ab") as file:
+                file.write(RECORD_HEADER.pack(len(frame), version) + frame)
+                file.flush()
+                os.fsync(file.fileno())
+            self._records = self._count_records() if self._records is None else self._records + 1
+
+            # another process may have trained one since this instance read the dictionaries
+            if not dictionaries and self._records >= TRAIN_AFTER and not self._reload_dictionaries():
+                try:
+                    self._train(DICTIONARY_SIZE)
+                except zstandard.ZstdError as e:
+                    print(f"⚠️ Could not train a dictionary for '{self.source}': {e}")
+
+    def iter_frames(self):
+        """Yield the stored (dictionary version, compressed frame) pairs; a truncated last record is ignored."""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb") as file:
+            while True:
+                header = file.read(RECORD_HEADER.size)
+                if len(header) < RECORD_HEADER.size:
+                    return
+                length, version = RECORD_HEADER.unpack(header)
+                frame = file.read(length)
+                if len(frame) < length:
+                    return
+                yield version, frame
+
+    def __iter__(self):
+        decompressors = make_decompressors(self.dictionaries())
+        for version, frame in self.iter_frames():
+            yield decode_record(version, frame, decompressors)
+
+    def _count_records(self) -> int:
+        return sum(1 for _ in self.iter_frames())
+
+    def _reload_dictionaries(self) -> dict:
+        self._dictionaries = None
+        return self.dictionaries()
+
+    def train_dictionary(self, size: int = DICTIONARY_SIZE) -> int:
+        """
+        Train a new dictionary on the stored pages; the next appends use it.
+
+        :return: The new dictionary version.
+        """
+        with save_tools.file_lock(self.path):
+            return self._train(size)
+
+    def _train(self, size: int) -> int:
+        """Train and publish the next dictionary version (the caller holds the archive's file lock)."""
+        samples = [json.dumps(page, ensure_ascii=False).encode("utf-8") for page in self]
+        dictionary = zstandard.train_dictionary(size, samples)
+        version = max(self._reload_dictionaries(), default=0) + 1
+        # "x": never overwrite a version pages may already be compressed with
+        with open(os.path.join(self.directory, f"{self.source}.dict-{version}"), "xb") as file:
+            file.write(dictionary.as_bytes())
+        self._dictionaries[version] = dictionary
+        print(f"📚 Dictionary {version} trained on {len(samples)} '{self.source}' pages.")
+        return version
+
+    def stats(self) -> dict:
+        """Pages stored, compressed size and original size in bytes."""
+        pages = compressed = original = 0
+        decompressors = make_decompressors(self.dictionaries())
+        for version, frame in self.iter_frames():
+            pages += 1
+            compressed += RECORD_HEADER.size + len(frame)
+            original += len(decompressors[version].decompress(frame))
+        return {"pages": pages, "compressed_bytes": compressed, "original_bytes": original}
+
+if __name__ == "__main__":
+    # do nothing
+    None
@@ -0,0 +1,175 @@
+import json
+import os
+import tempfile
+import uuid
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from pathvalidate import sanitize_filename
+from utils import save_tools
+
+STORE_SUBDIR = "price_store"
+META_FILENAME = "meta.json"
+DATE_COLUMN = "date"
+OPEN_ATTEMPTS = 3           # meta reads before giving up when concurrent writes keep removing the mapped files
+MAX_MAPPED_SYMBOLS = 64     # symbols kept mapped per store (each column map holds a file descriptor)
+# Fixed-width column types (dates are stored as days since 1970-01-01)
+COLUMN_DTYPES = {
+    DATE_COLUMN: "int64",
+    "open": "float64",
+    "high": "float64",
+    "low": "float64",
+    "close": "float64",
+    "adjusted_close": "float64",
+    "volume": "int64",
+    "dividend_amount": "float64",
+}
+
+def to_days(dates) -> np.ndarray:
+    """Dates as int64 days since the epoch (the store's date index)."""
+    return pd.to_datetime(pd.Series(dates)).to_numpy(dtype="datetime64[D]").astype("int64")
+
+def _day(value) -> int:
+    """One date (str, date, datetime or Timestamp) as days since the epoch, without going through pandas."""
+    return int(np.datetime64(value, "D").astype("int64"))
+
+def _write_atomic(path: str, data: bytes):
+    file_descriptor, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(file_descriptor, "wb") as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+        save_tools.copy_file_mode(temp_path, path)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+def _column_path(symbol_dir: str, column: str, generation: str = None) -> str:
+    """Column file of a write (stores written before generations were added have no generation)."""
+    return os.path.join(symbol_dir, f"{column}.{generation}.bin" if generation else f"{column}.bin")
+
+def _remove_other_generations(symbol_dir: str, generation: str):
+    """Delete the column files of previous writes; readers that mapped them keep their pages."""
+    for name in os.listdir(symbol_dir):
+        if name.endswith(".bin") and not name.endswith(f".{generation}.bin"):
+            try:
+                os.remove(os.path.join(symbol_dir, name))
+            except OSError:
+                pass    # still mapped on Windows: removed by the next write
+
+class PriceStore:
+    """
+    Columnar binary store of monthly adjusted prices: one fixed-width file per column and symbol,
+    sorted by date, read through `numpy.memmap`.
+
+    A range read is a binary search on the date column plus a slice of each column: no parsing
+    and no copy, and the pages are shared through the OS page cache by every process reading them.
+
+    Usage:
+        store = PriceStore()
+        store.write("JMT.LS", api_v2.process_data(time_series))
+        prices = store.read("JMT.LS", "2020-01-01", "2024-12-31", columns=["adjusted_close"])
+    """
+
+    def __init__(self, directory: str = None):
+        self.directory = directory or os.path.join(save_tools.OUTPUT_DIR, STORE_SUBDIR)
+        self._maps = OrderedDict()     # symbol -> (meta file version, meta, {column: memmap}), least recently read first
+
+    def _symbol_dir(self, symbol: str) -> str:
+        return os.path.join(self.directory, sanitize_filename(symbol))
+
+    def write(self, symbol: str, df: pd.DataFrame):
+        """
+        Replace a symbol's series.
+
+        :param df: Prices as returned by `api_v2.process_data` (date index) or with a `date` column.
+        """
+        df = df.reset_index() if DATE_COLUMN not in df.columns else df
+        df = df.assign(**{DATE_COLUMN: to_days(df[DATE_COLUMN])}).sort_values(DATE_COLUMN)
+        df = df.drop_duplicates(subset=DATE_COLUMN, keep="last")
+
+        symbol_dir = self._symbol_dir(symbol)
+        os.makedirs(symbol_dir, exist_ok=True)
+        meta_path = os.path.join(symbol_dir, META_FILENAME)
+        # Each write gets its own column files: replacing the meta file is the only step readers
+        # can see, so they never pair the row count of one write with the columns of another
+        generation = uuid.uuid4().hex
+        with save_tools.file_lock(meta_path):
+            for column, dtype in COLUMN_DTYPES.items():
+                values = pd.to_numeric(df[column], errors="coerce") if column in df.columns else pd.Series(np.nan, index=df.index)
+                if dtype == "int64":
+                    values = values.fillna(0)
+                _write_atomic(_column_path(symbol_dir, column, generation), values.to_numpy(dtype=dtype).tobytes())
+
+            meta = {"symbol": symbol, "rows": len(df), "dtypes": COLUMN_DTYPES, "generation": generation,
+                    "first_date": int(df[DATE_COLUMN].iloc[0]) if len(df) else None,
+                    "last_date": int(df[DATE_COLUMN].iloc[-1]) if len(df) else None}
+            _write_atomic(meta_path, json.dumps(meta).encode("utf-8"))
+            _remove_other_generations(symbol_dir, generation)
+
+    def symbols(self) -> list:
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(name for name in os.listdir(self.directory) if os.path.exists(os.path.join(self.directory, name, META_FILENAME)))
+
+    def _open(self, symbol: str) -> tuple:
+        """Memory-map a symbol's columns once, and again only after the series was rewritten."""
+        symbol_dir = self._symbol_dir(symbol)
+        meta_path = os.path.join(symbol_dir, META_FILENAME)
+        for attempt in range(OPEN_ATTEMPTS):
+            if not os.path.exists(meta_path):
+                raise KeyError(f"No prices stored for {symbol}")
+            stat = os.stat(meta_path)
+            version = (stat.st_ino, stat.st_mtime_ns)     # the meta file is replaced, never edited in place
+
+            cached = self._maps.get(symbol)
+            if cached and cached[0] == version:
+                self._maps.move_to_end(symbol)
+                return cached[1], cached[2]
+
+            with open(meta_path, encoding="utf-8") as file:
+                meta = json.load(file)
+            try:
+                # np.memmap cannot map an empty file
+                columns = {column: np.memmap(_column_path(symbol_dir, column, meta.get("generation")), dtype=dtype, mode="r",
+                                             shape=(meta["rows"],)) if meta["rows"] else np.empty(0, dtype=dtype)
+                           for column, dtype in meta["dtypes"].items()}
+                break
+            except FileNotFoundError:
+                # a newer write removed this generation after its meta file was read: read the new one
+                if attempt == OPEN_ATTEMPTS - 1:
+                    raise
+        self._maps[symbol] = (version, meta, columns)
+        self._maps.move_to_end(symbol)
+        # dropping the maps of the least recently read symbols unmaps them (and closes their
+        # descriptors) once the views handed out by `read` are gone, so a universe does not hit EMFILE
+        while len(self._maps) > MAX_MAPPED_SYMBOLS:
+            self._maps.popitem(last=False)
+        return meta, columns
+
+    def read(self, symbol: str, start=None, end=None, columns: list = None) -> dict:
+        """
+        Read a date range of a symbol as read-only array views (no copy).
+
+        :param start: First date included (None: from the beginning).
+        :param end: Last date included (None: up to the end).
+        :param columns: Columns to return (default: all); dates are days since the epoch (see `to_days`).
+        """
+        meta, mapped = self._open(symbol)
+        dates = mapped[DATE_COLUMN]
+        first = np.searchsorted(dates, _day(start), side="left") if start is not None else 0
+        last = np.searchsorted(dates, _day(end), side="right") if end is not None else meta["rows"]
+        return {column: mapped[column][first:last] for column in (columns or mapped)}
+
+    def read_frame(self, symbol: str, start=None, end=None, columns: list = None) -> pd.DataFrame:
+        """Same as `read`, copied into a DataFrame indexed by date (for code that expects pandas)."""
+        arrays = self.read(symbol, start, end, [DATE_COLUMN] + [column for column in (columns or COLUMN_DTYPES) if column != DATE_COLUMN])
+        index = pd.DatetimeIndex(np.asarray(arrays.pop(DATE_COLUMN)).astype("datetime64[D]"), name=DATE_COLUMN)
+        return pd.DataFrame({column: np.asarray(values) for column, values in arrays.items()}, index=index)
+
+if __name__ == "__main__":
+    # do nothing
+    None
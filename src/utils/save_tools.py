@@ -1,15 +1,133 @@
+import hashlib
 import os
+import tempfile
+from contextlib import contextmanager
 import pandas as pd
 from pathvalidate import sanitize_filename
+from utils import schemas
+
+try:
+    import fcntl     # POSIX
+except ImportError:
+    fcntl = None
+    import msvcrt    # Windows
 
 OUTPUT_DIR = "./data"
+LOCK_SUFFIX = ".lock"
+# Lock files are kept out of the data folder (they are never deleted: removing a lock file
+# another process is waiting on would let two processes hold "the" lock at once)
+LOCK_DIR = os.path.join(tempfile.gettempdir(), "company_info_locks")
+DEFAULT_UMASK = 0o022   # assumed where the umask cannot be read (no /proc, e.g. macOS and Windows)
+
+@contextmanager
+def file_lock(path: str):
+    """
+    Hold an exclusive, multi-process lock on a file while the block runs.
+
+    The lock is taken on a separate file in LOCK_DIR (named after the absolute path), so the
+    data file itself can be replaced.
+    """
+    os.makedirs(LOCK_DIR, exist_ok=True)
+    lock_name = hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest()
+    with open(os.path.join(LOCK_DIR, f"{lock_name}{LOCK_SUFFIX}"), "a+") as lock_file:
+        if fcntl:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        else:
+            while True:
+                try:
+                    lock_file.seek(0)
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue    # LK_LOCK gives up after ~10s, keep waiting
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+def copy_file_mode(temp_path: str, target_path: str):
+    """
+    Give a temporary file (created 0600 by `tempfile.mkstemp`) the mode of the file it replaces,
+    or the default mode for the user's umask for a new file, before it is renamed over the target.
+    """
+    if os.path.exists(target_path):
+        mode = os.stat(target_path).st_mode & 0o777
+    else:
+        mode = 0o666 & ~_current_umask()
+    os.chmod(temp_path, mode)
+
+def _current_umask() -> int:
+    """
+    The process umask, read without changing it: `os.umask` can only be read by setting it, and
+    a temporary umask of 0 would leave files created meanwhile by other threads world-writable.
+    """
+    try:
+        with open("/proc/self/status", encoding="ascii") as file:
+            for line in file:
+                if line.startswith("Umask:"):
+                    return int(line.split()[1], 8)
+    except (OSError, ValueError):
+        pass
+    return DEFAULT_UMASK
+
+def _write_replacement(df: pd.DataFrame, output_path: str, index: bool):
+    """Write to a temporary file next to the target and rename it over the target (the caller holds the lock)."""
+    file_descriptor, temp_path = tempfile.mkstemp(dir=os.path.dirname(output_path), suffix=".tmp")
+    try:
+        with os.fdopen(file_descriptor, "w", newline="", encoding="utf-8") as file:
+            df.to_csv(file, index=index)
+            file.flush()
+            os.fsync(file.fileno())
+        copy_file_mode(temp_path, output_path)
+        os.replace(temp_path, output_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+def _append_csv(df: pd.DataFrame, output_path: str, index: bool):
+    """
+    Append rows under the file lock; the header is written only if the file is still empty.
+    Otherwise the rows are aligned to the columns of the existing header. Rows bringing columns
+    the file does not have yet are not cut down: the file is rewritten with the new columns instead.
+    """
+    with file_lock(output_path):
+        header = not os.path.exists(output_path) or os.path.getsize(output_path) == 0
+        if not header:
+            existing_columns = list(pd.read_csv(output_path, nrows=0).columns)
+            existing_columns = existing_columns[1:] if index else existing_columns
+            new_columns = [column for column in df.columns if column not in existing_columns]
+            if new_columns:
+                existing = pd.read_csv(output_path, index_col=0 if index else None)
+                _write_replacement(pd.concat([existing, df]), output_path, index)
+                return
+            if list(df.columns) != existing_columns:
+                df = df.reindex(columns=existing_columns)
+        with open(output_path, "a", newline="", encoding="utf-8") as file:
+            df.to_csv(file, header=header, index=index)
+            file.flush()
+            os.fsync(file.fileno())
+
+def _replace_csv(df: pd.DataFrame, output_path: str, index: bool):
+    """Write to a temporary file next to the target and rename it over the target, so readers never see a partial file."""
+    with file_lock(output_path):
+        _write_replacement(df, output_path, index)
+
+def save_to_csv(df: pd.DataFrame, filename: str = None, ignore_overwrite=False, append_data: bool = False, index: bool = False) -> bool:
+    """
+    Write (or append) a frame to a CSV in the data folder. Errors are printed, not raised.
 
-def save_to_csv(df: pd.DataFrame, filename: str = None, ignore_overwrite=False, append_data: bool = False, index: bool = False):
+    :return: True when the data was written, False otherwise (error, or overwrite declined).
+    """
     print("\n📝 Saving data to CSV...")
     try:
         if filename is None:
             print("❌ Error: No filename provided.")
-            return
+            return False
         
         # Sanitize the filename to prevent errors
         sanitized_filename = sanitize_filename(filename)
@@ -17,9 +135,7 @@ def save_to_csv(df: pd.DataFrame, filename: str = None, ignore_overwrite=False,
         os.makedirs(OUTPUT_DIR, exist_ok=True)  # Ensure directory exists
         output_path = os.path.join(OUTPUT_DIR, sanitized_filename)
 
-        # Determine if the header should be included
         file_exists = os.path.exists(output_path)
-        header = not (append_data and file_exists)
 
         # Prevent accidental overwriting
         if file_exists and not append_data:
@@ -27,20 +143,66 @@ def save_to_csv(df: pd.DataFrame, filename: str = None, ignore_overwrite=False,
                 overwrite = input(f"File {output_path} already exists. Overwrite? (y/n): ").strip().lower()
                 if overwrite != 'y':
                     print("File not saved.")
-                    return
+                    return False
 
-        file_write_mode = "a" if append_data else "w"
-        df.to_csv(output_path, mode=file_write_mode, header=header, index=index)
+        if append_data:
+            _append_csv(df, output_path, index)
+        else:
+            _replace_csv(df, output_path, index)
         print("\n✅ Data saved to:", output_path)
+        return True
     except Exception as e:
         print("❌ Error saving data to CSV:", e)
+        return False
+
+class CsvAppendBuffer:
+    """
+    Collects many small appends to the same CSV and writes them in a single locked append.
+
+    Usage:
+        with CsvAppendBuffer("currency_exchange_rate_EUR_USD.csv") as buffer:
+            buffer.append(df)
+    """
 
-def load_existing_dataframe(filename, columns) -> pd.DataFrame:
-    """Loads existing news from CSV if the file exists."""
+    def __init__(self, filename: str, max_rows: int = 1000, index: bool = False):
+        self.filename = filename
+        self.max_rows = max_rows
+        self.index = index
+        self._frames = []
+        self._rows = 0
+
+    def append(self, df: pd.DataFrame):
+        self._frames.append(df)
+        self._rows += len(df)
+        if self._rows >= self.max_rows:
+            self.flush()
+
+    def flush(self):
+        if not self._frames:
+            return
+        df = pd.concat(self._frames, ignore_index=True)
+        self._frames = []
+        self._rows = 0
+        save_to_csv(df, self.filename, append_data=True, index=self.index)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.flush()
+
+def load_existing_dataframe(filename, columns, dataset: str = None, usecols: list = None, parse_dates: bool = True) -> pd.DataFrame:
+    """
+    Loads existing data from CSV if the file exists.
+
+    With `dataset` ("news", "fx" or "stock") the columns get their registered types
+    (Arrow strings, categories, timestamps); `usecols` only reads the given columns.
+    """
+    empty_columns = usecols or columns
     try:
         if filename is None:
             print("❌ Error: No filename provided.")
-            return pd.DataFrame(columns=columns)
+            return pd.DataFrame(columns=empty_columns)
         
         # Sanitize the filename to prevent errors
         sanitized_filename = sanitize_filename(filename)
@@ -48,12 +210,20 @@ def load_existing_dataframe(filename, columns) -> pd.DataFrame:
         output_path = os.path.join(OUTPUT_DIR, sanitized_filename)
 
         if os.path.exists(output_path):
-            return pd.read_csv(output_path)
+            if dataset:
+                return schemas.read_dataset(output_path, dataset, usecols=usecols, parse_dates=parse_dates)
+            return pd.read_csv(output_path, usecols=usecols)
         
-        return pd.DataFrame(columns=columns)
+        return pd.DataFrame(columns=empty_columns)
     except Exception as e:
         print("❌ Error reading data from CSV:", e)
-        return pd.DataFrame(columns=columns)
+        return pd.DataFrame(columns=empty_columns)
+
+def iter_existing_dataframe(filename, dataset: str, chunksize: int = 100_000, usecols: list = None, parse_dates: bool = True):
+    """Yields typed chunks of an existing CSV (nothing if the file does not exist)."""
+    output_path = os.path.join(OUTPUT_DIR, sanitize_filename(filename))
+    if os.path.exists(output_path):
+        yield from schemas.iter_dataset(output_path, dataset, chunksize, usecols=usecols, parse_dates=parse_dates)
 
 if __name__ == "__main__":
     # do nothing
@@ -0,0 +1,89 @@
+import pandas as pd
+
+STRING = "string[pyarrow]"      # Arrow-backed strings: far smaller than Python str objects
+
+# Column types of each dataset saved in the data folder. Columns missing from a file are skipped.
+DATASET_SCHEMAS = {
+    "news": {
+        "dtypes": {
+            "Title": STRING,
+            "Date": STRING,
+            "Link": STRING,
+            "Summary": STRING,
+            "sentiment": "float32",
+            "companies": "category",
+            "tickers": "category",
+        },
+        "dates": {"Date": "%d-%m-%Y %H:%M"},
+    },
+    "fx": {
+        "dtypes": {
+            "timestamp": "Int64",
+            "insert_date": STRING,
+            "from": "category",
+            "to": "category",
+            "rate": "float64",
+            "amount": "Int32",
+        },
+        "dates": {"insert_date": "%Y-%m-%d %H:%M:%S"},
+    },
+    "stock": {
+        "dtypes": {
+            "date": STRING,
+            "open": "float64",
+            "high": "float64",
+            "low": "float64",
+            "close": "float64",
+            "adjusted_close": "float64",
+            "volume": "Int64",
+            "dividend_amount": "float64",
+        },
+        "dates": {"date": "%Y-%m-%d"},
+    },
+}
+
+def get_schema(dataset: str) -> dict:
+    if dataset not in DATASET_SCHEMAS:
+        raise ValueError(f"Unknown dataset '{dataset}'. Available: {', '.join(DATASET_SCHEMAS)}")
+    return DATASET_SCHEMAS[dataset]
+
+def _read_options(dataset: str, usecols: list = None, parse_dates: bool = True) -> tuple:
+    schema = get_schema(dataset)
+    wanted = set(usecols) if usecols else None
+    options = {
+        # a callable tolerates columns that an older file does not have yet
+        "usecols": (lambda column: column in wanted) if wanted else None,
+        "dtype": schema["dtypes"],
+    }
+    dates = {column: date_format for column, date_format in schema["dates"].items()
+             if parse_dates and (wanted is None or column in wanted)}
+    return options, dates
+
+def _parse_dates(df: pd.DataFrame, dates: dict) -> pd.DataFrame:
+    for column, date_format in dates.items():
+        if column in df.columns:
+            df[column] = pd.to_datetime(df[column], format=date_format, errors="coerce")
+    return df
+
+def read_dataset(path: str, dataset: str, usecols: list = None, parse_dates: bool = True) -> pd.DataFrame:
+    """
+    Read a dataset CSV with its registered types.
+
+    :param path: CSV path.
+    :param dataset: One of DATASET_SCHEMAS keys ("news", "fx", "stock").
+    :param usecols: Only read these columns.
+    :param parse_dates: Convert the date columns to timestamps (keep False when the file is written back as is).
+    """
+    options, dates = _read_options(dataset, usecols, parse_dates)
+    return _parse_dates(pd.read_csv(path, **options), dates)
+
+def iter_dataset(path: str, dataset: str, chunksize: int, usecols: list = None, parse_dates: bool = True):
+    """Same as `read_dataset`, yielding chunks of `chunksize` rows to bound memory."""
+    options, dates = _read_options(dataset, usecols, parse_dates)
+    with pd.read_csv(path, chunksize=chunksize, **options) as reader:
+        for chunk in reader:
+            yield _parse_dates(chunk, dates)
+
+if __name__ == "__main__":
+    # do nothing
+    None
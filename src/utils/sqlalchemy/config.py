@@ -1,32 +1,83 @@
 from dotenv import load_dotenv
 import os
-from sqlalchemy import create_engine, MetaData, Table, UniqueConstraint
+import time
+import pandas as pd
+from sqlalchemy import create_engine, inspect, text, MetaData, Table, UniqueConstraint, BigInteger, Integer
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.dialects import postgresql, sqlite
 
 if os.path.exists(".env"):
     load_dotenv()
 else:
     print("⚠️ Warning: .env file not found. Ensure your env keys are set in system environment variables.")
 
-required_env_vars = [
+POSTGRES_ENV_VARS = [
     'DB_HOST',
     'DB_PORT',
     'DB_USER',
     'DB_PASSWORD',
     'DB_NAME',
 ]
-for var in required_env_vars:
-    if not os.getenv(var):
-        raise Exception(f"Environment variable {var} is not set")
+SQLITE_DEFAULT_PATH = "./data/company_info.db"
+# Per-table write markers read by result caches (SQLite keeps them next to the database file)
+TABLE_VERSIONS_DIR = "./data/table_versions"
 
-DB_HOST = os.getenv("DB_HOST")
-DB_PORT = os.getenv("DB_PORT")
-DB_USER = os.getenv("DB_USER")
-DB_PASSWORD = os.getenv("DB_PASSWORD")
-DB_NAME = os.getenv("DB_NAME")
+# Dialect-specific INSERT constructs; both support ON CONFLICT ... DO UPDATE
+UPSERT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+# Maximum bind parameters in a single statement
+MAX_BIND_PARAMETERS = {
+    "postgresql": 65535,
+    "sqlite": 32766,
+}
 
-DATABASE_URI = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+# Primary key type that auto-increments on every backend (SQLite only does it for INTEGER PRIMARY KEY)
+ID_TYPE = BigInteger().with_variant(Integer, "sqlite")
+
+def get_backend() -> str:
+    """
+    Storage backend to use: DB_BACKEND if set, otherwise PostgreSQL when its
+    variables are configured and the embedded SQLite database when they are not.
+    """
+    backend = os.getenv("DB_BACKEND")
+    if backend:
+        backend = backend.lower()
+        if backend not in UPSERT_INSERTS:
+            raise Exception(f"Unsupported DB_BACKEND '{backend}'. Use one of: {', '.join(UPSERT_INSERTS)}")
+        return backend
+
+    if all(os.getenv(var) for var in POSTGRES_ENV_VARS):
+        return "postgresql"
+
+    print("⚠️ Warning: PostgreSQL variables are not set, using the embedded SQLite database.")
+    return "sqlite"
+
+def build_database_uri(backend: str) -> str:
+    """
+    Build the connection URI for a backend.
+
+    :param backend: "postgresql" or "sqlite".
+    """
+    if backend == "sqlite":
+        db_path = os.getenv("DB_PATH", SQLITE_DEFAULT_PATH)
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        return f"sqlite:///{db_path}"
+
+    for var in POSTGRES_ENV_VARS:
+        if not os.getenv(var):
+            raise Exception(f"Environment variable {var} is not set")
+
+    DB_HOST = os.getenv("DB_HOST")
+    DB_PORT = os.getenv("DB_PORT")
+    DB_USER = os.getenv("DB_USER")
+    DB_PASSWORD = os.getenv("DB_PASSWORD")
+    DB_NAME = os.getenv("DB_NAME")
+    return f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+
+DB_BACKEND = get_backend()
+DATABASE_URI = build_database_uri(DB_BACKEND)
 
 engine = create_engine(DATABASE_URI)
 metadata = MetaData()
@@ -61,13 +112,68 @@ def create_table_if_not_exists(table_name: str, columns: list, unique_constraint
     except SQLAlchemyError as e:
         print(f"❌ Error creating table '{table_name}': {e}")
 
-def insert_data(table_name: str, data: list[dict], conflict_columns: list = []):
+def add_columns_if_not_exist(table_name: str, columns: list):
+    """
+    Add new nullable columns to an existing table.
+
+    :param table_name: Name of the table to alter.
+    :param columns: List of SQLAlchemy Column objects (only the missing ones are added).
+    """
+    try:
+        if not does_table_exist(table_name):
+            return
+
+        existing_columns = {column["name"] for column in inspect(engine).get_columns(table_name)}
+        with engine.begin() as conn:
+            for column in columns:
+                if column.name in existing_columns:
+                    continue
+                column_type = column.type.compile(dialect=engine.dialect)
+                conn.execute(text(f'ALTER TABLE {table_name} ADD COLUMN "{column.name}" {column_type}'))
+                print(f"✅ Column '{column.name}' added to table '{table_name}'.")
+        if table_name in metadata.tables:
+            metadata.remove(metadata.tables[table_name])    # reflect the new columns on next use
+    except SQLAlchemyError as e:
+        print(f"❌ Error adding columns to table '{table_name}': {e}")
+
+def _table_versions_dir() -> str:
+    if engine.dialect.name == "sqlite" and engine.url.database not in (None, "", ":memory:"):
+        return f"{engine.url.database}-versions"
+    return TABLE_VERSIONS_DIR
+
+def mark_table_changed(table_name: str):
+    """
+    Record that a table was written, so caches of its query results (see read_api.py) are invalidated.
+    The marker file is replaced on every write, which readers in other processes see with a stat.
+    """
+    versions_dir = _table_versions_dir()
+    os.makedirs(versions_dir, exist_ok=True)
+    path = os.path.join(versions_dir, table_name)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "w") as file:
+        file.write(str(time.time_ns()))
+    os.replace(temp_path, path)
+
+def table_version(table_name: str):
+    """
+    Current version of a table: changes on every `mark_table_changed`.
+
+    :return: An opaque comparable value, or None if the table was never marked.
+    """
+    try:
+        stat = os.stat(os.path.join(_table_versions_dir(), table_name))
+    except FileNotFoundError:
+        return None
+    return (stat.st_ino, stat.st_mtime_ns)
+
+def insert_data(table_name: str, data: list[dict], conflict_columns: list = []) -> int:
     """
     Insert data into a table.
     
     :param table_name: Name of the table to insert data into.
     :param data: Dictionary containing column names and values to insert.
     :param conflict_columns: List of column names to check for conflicts (unique constraints).
+    :return: Number of rows inserted or updated (0 if the insert failed).
     """
     try:
         with engine.begin() as conn:  # Ensures transaction safety
@@ -76,22 +182,64 @@ def insert_data(table_name: str, data: list[dict], conflict_columns: list = []):
             # Ensure only valid column names are inserted
             valid_columns = {col.name for col in table.columns}
             filtered_data = [{k: v for k, v in record.items() if k in valid_columns and k != "id"} for record in data]
+            # records left without any column would divide the batch size by zero
+            filtered_data = [record for record in filtered_data if record]
             if not filtered_data:
                 print(f"⚠️ No valid columns found in data for table '{table_name}'.")
-                return
+                return 0
             
-            # insert statement with conflict resolution
-            stmt = insert(table).values(filtered_data) # bulk insert
+            insert = UPSERT_INSERTS[engine.dialect.name]
+            columns_per_row = max(len(record) for record in filtered_data)
+            batch_size = max(1, MAX_BIND_PARAMETERS[engine.dialect.name] // columns_per_row)
+
+            for start in range(0, len(filtered_data), batch_size):
+                # insert statement with conflict resolution
+                stmt = insert(table).values(filtered_data[start:start + batch_size]) # bulk insert
 
-            if conflict_columns:
-                update_dict = {col: stmt.excluded[col] for col in valid_columns if col not in conflict_columns and col != "id"}
-                stmt = stmt.on_conflict_do_update(index_elements=conflict_columns, set_=update_dict)
+                if conflict_columns:
+                    update_dict = {col: stmt.excluded[col] for col in valid_columns if col not in conflict_columns and col != "id"}
+                    stmt = stmt.on_conflict_do_update(index_elements=conflict_columns, set_=update_dict)
 
-            conn.execute(stmt)
+                conn.execute(stmt)
             # No need to commit the transaction, as the context manager does it automatically
             print("✅ Data inserted successfully!")
+        mark_table_changed(table_name)
+        return len(filtered_data)
     except SQLAlchemyError as e:
         print(f"❌ Error inserting data into table '{table_name}': {e}")
+        return 0
+
+def load_file_as_table(path: str, table_name: str = None) -> str:
+    """
+    Expose a project CSV or Parquet file as a table of the embedded database, so it can be
+    queried (and joined with the loaded tables) with plain SQL.
+
+    :param path: Path to a .csv or .parquet file.
+    :param table_name: Table name (defaults to the file name in snake_case).
+    :return: The table name.
+    """
+    if DB_BACKEND != "sqlite":
+        raise Exception("Files can only be loaded as tables in the embedded SQLite backend.")
+
+    if table_name is None:
+        stem = os.path.splitext(os.path.basename(path))[0]
+        table_name = "".join(char if char.isalnum() else "_" for char in stem.lower()).strip("_")
+
+    df = pd.read_parquet(path) if path.endswith(".parquet") else pd.read_csv(path)
+    df.to_sql(table_name, engine, if_exists="replace", index=False)
+    mark_table_changed(table_name)
+    print(f"✅ {len(df)} rows from {path} available as table '{table_name}'.")
+    return table_name
+
+def query_dataframe(query: str, params: dict = None) -> pd.DataFrame:
+    """
+    Run a read query and return the result as a DataFrame.
+
+    :param query: SQL query (use :name placeholders for parameters).
+    :param params: Query parameters.
+    """
+    with engine.connect() as conn:
+        return pd.read_sql(text(query), conn, params=params)
 
 if __name__ == "__main__":
     # do nothing
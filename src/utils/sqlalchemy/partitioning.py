@@ -0,0 +1,193 @@
+import re
+import pandas as pd
+from sqlalchemy import Table, UniqueConstraint, Index, text
+from sqlalchemy.exc import SQLAlchemyError
+from utils.sqlalchemy.config import engine, metadata, does_table_exist, mark_table_changed
+
+PARTITION_NAME_PATTERN = re.compile(r"_y(\d{4})m(\d{2})$")
+ARCHIVE_SUFFIX = "_archive"
+DETACHED_SUFFIX = "_detached"   # detached partitions are renamed, so the month can be created again
+
+def supports_partitioning() -> bool:
+    """Declarative partitioning is only available on PostgreSQL."""
+    return engine.dialect.name == "postgresql"
+
+def create_partitioned_table(table_name: str, columns: list, partition_column: str, unique_constraints: list = [], brin_columns: list = []):
+    """
+    Create a table partitioned by range of `partition_column` if it does not exist.
+
+    The primary key and unique constraints must include the partition column (PostgreSQL requirement).
+
+    :param table_name: Name of the table to create.
+    :param columns: List of SQLAlchemy Column objects.
+    :param partition_column: Date/time column the table is partitioned on (monthly partitions).
+    :param unique_constraints: List of column tuples for UniqueConstraint objects.
+    :param brin_columns: Columns that get a BRIN index (small, fast for append-ordered dates).
+    """
+    try:
+        if does_table_exist(table_name):
+            print(f"✅ Table '{table_name}' already exists.")
+            return
+
+        constraints = [UniqueConstraint(*constraint) for constraint in unique_constraints]
+        indexes = [Index(f"ix_{table_name}_{column}_brin", column, postgresql_using="brin") for column in brin_columns]
+
+        table = Table(table_name, metadata, *columns, *constraints, *indexes,
+                      postgresql_partition_by=f"RANGE ({partition_column})")
+        metadata.create_all(engine, tables=[table])
+        print(f"🎉 Partitioned table '{table_name}' has been created successfully!")
+    except SQLAlchemyError as e:
+        print(f"❌ Error creating table '{table_name}': {e}")
+
+def is_partitioned(table_name: str) -> bool:
+    if not supports_partitioning():
+        return False
+    with engine.connect() as conn:
+        query = text("SELECT 1 FROM pg_partitioned_table pt JOIN pg_class c ON c.oid = pt.partrelid WHERE c.relname = :table_name")
+        return conn.execute(query, {"table_name": table_name}).first() is not None
+
+def month_partition_name(table_name: str, month: pd.Timestamp) -> str:
+    return f"{table_name}_y{month.year:04d}m{month.month:02d}"
+
+def ensure_month_partitions(table_name: str, dates) -> list:
+    """
+    Create the monthly partitions needed to hold `dates` (called before each insert).
+
+    :param table_name: Partitioned table.
+    :param dates: Values of the partition column about to be inserted.
+    :return: Names of the partitions created.
+    """
+    months = pd.to_datetime(pd.Series(dates), errors="coerce").dropna().dt.to_period("M").unique()
+    existing = set(list_partitions(table_name))
+    created = []
+
+    with engine.begin() as conn:
+        for period in sorted(months):
+            start = period.to_timestamp()
+            partition_name = month_partition_name(table_name, start)
+            if partition_name in existing:
+                continue
+            end = (period + 1).to_timestamp()
+            conn.execute(text(
+                f"CREATE TABLE IF NOT EXISTS {partition_name} PARTITION OF {table_name} "
+                f"FOR VALUES FROM ('{start:%Y-%m-%d}') TO ('{end:%Y-%m-%d}')"
+            ))
+            created.append(partition_name)
+
+    if created:
+        print(f"🧱 Partitions created: {', '.join(created)}")
+    return created
+
+def list_partitions(table_name: str) -> list:
+    """Names of the partitions currently attached to a table, oldest first."""
+    with engine.connect() as conn:
+        query = text("""
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE parent.relname = :table_name
+        """)
+        return sorted(row[0] for row in conn.execute(query, {"table_name": table_name}))
+
+def _column_types(conn, table_name: str) -> dict:
+    """Column names and SQL types of a table, in column order."""
+    rows = conn.execute(text(
+        "SELECT a.attname, format_type(a.atttypid, a.atttypmod) FROM pg_attribute a "
+        "WHERE a.attrelid = CAST(:table_name AS regclass) AND a.attnum > 0 AND NOT a.attisdropped ORDER BY a.attnum"
+    ), {"table_name": table_name})
+    return dict(rows.all())
+
+def ensure_archive_table(table_name: str, unique_columns: list = []) -> str:
+    """
+    Create the archive table for detached partitions, with its text columns compressed with LZ4
+    (PostgreSQL 14+; older servers keep the default pglz compression). Columns added to the
+    table since the archive was created are added to the archive too.
+
+    :param unique_columns: Natural key of the rows: archiving the same rows twice keeps one copy.
+    """
+    archive_name = f"{table_name}{ARCHIVE_SUFFIX}"
+    with engine.begin() as conn:
+        conn.execute(text(f"CREATE TABLE IF NOT EXISTS {archive_name} (LIKE {table_name} INCLUDING DEFAULTS)"))
+        archive_columns = _column_types(conn, archive_name)
+        for column, column_type in _column_types(conn, table_name).items():
+            if column not in archive_columns:
+                conn.execute(text(f'ALTER TABLE {archive_name} ADD COLUMN "{column}" {column_type}'))
+
+        if unique_columns:
+            index_name = f"ix_{archive_name}_{'_'.join(unique_columns)}_key"
+            column_list = ", ".join(f'"{column}"' for column in unique_columns)
+            has_index = conn.execute(text("SELECT 1 FROM pg_indexes WHERE indexname = :index_name"), {"index_name": index_name}).first()
+            if not has_index:
+                # archives written before the key existed may hold the same rows several times
+                matches = " AND ".join(f'a."{column}" = b."{column}"' for column in unique_columns)
+                conn.execute(text(f"DELETE FROM {archive_name} a USING {archive_name} b WHERE a.ctid > b.ctid AND {matches}"))
+                conn.execute(text(f"CREATE UNIQUE INDEX {index_name} ON {archive_name} ({column_list})"))
+
+        text_columns = conn.execute(text(
+            "SELECT column_name FROM information_schema.columns "
+            "WHERE table_name = :archive_name AND data_type IN ('text', 'character varying')"
+        ), {"archive_name": archive_name}).scalars().all()
+
+    for column in text_columns:
+        try:
+            with engine.begin() as conn:
+                conn.execute(text(f'ALTER TABLE {archive_name} ALTER COLUMN "{column}" SET COMPRESSION lz4'))
+        except SQLAlchemyError:
+            print(f"⚠️ LZ4 compression not available for '{archive_name}.{column}', using the default.")
+            break
+    return archive_name
+
+def retention_cutoff(keep_months: int, today: pd.Timestamp = None) -> pd.Timestamp:
+    """
+    First day kept by a retention of `keep_months` months (the current month counts as one).
+
+    :param today: Reference date (default: today).
+    """
+    today = pd.Timestamp.today() if today is None else pd.Timestamp(today)
+    return (today.to_period("M") - keep_months + 1).to_timestamp()
+
+def apply_retention(table_name: str, keep_months: int, archive: bool = True, unique_columns: list = []) -> list:
+    """
+    Detach the partitions older than `keep_months` months. Loaders must not insert rows older than
+    `retention_cutoff(keep_months)` again, or their months would be recreated.
+
+    With `archive`, their rows are moved to `<table>_archive` and the partitions dropped;
+    otherwise they stay as standalone tables renamed `<partition>_detached` (ready to be dumped or dropped).
+
+    :param unique_columns: Natural key of the rows, enforced in the archive (rows already archived are skipped).
+    :return: Names of the partitions detached.
+    """
+    cutoff = retention_cutoff(keep_months)
+    archive_name = ensure_archive_table(table_name, unique_columns) if archive else None
+    detached = []
+
+    for partition_name in list_partitions(table_name):
+        match = PARTITION_NAME_PATTERN.search(partition_name)
+        if not match or pd.Timestamp(year=int(match.group(1)), month=int(match.group(2)), day=1) >= cutoff:
+            continue
+
+        try:
+            with engine.begin() as conn:
+                conn.execute(text(f"ALTER TABLE {table_name} DETACH PARTITION {partition_name}"))
+                if archive_name:
+                    column_list = ", ".join(f'"{column}"' for column in _column_types(conn, partition_name))
+                    conn.execute(text(
+                        f"INSERT INTO {archive_name} ({column_list}) SELECT {column_list} FROM {partition_name} ON CONFLICT DO NOTHING"
+                    ))
+                    conn.execute(text(f"DROP TABLE {partition_name}"))
+                else:
+                    conn.execute(text(f"ALTER TABLE {partition_name} RENAME TO {partition_name}{DETACHED_SUFFIX}"))
+            detached.append(partition_name)
+        except SQLAlchemyError as e:
+            print(f"❌ Error detaching partition '{partition_name}': {e}")
+
+    if detached:
+        mark_table_changed(table_name)
+        target = f"archived to '{archive_name}'" if archive_name else "detached"
+        print(f"🗄️ {len(detached)} partitions {target}: {', '.join(detached)}")
+    return detached
+
+if __name__ == "__main__":
+    # do nothing
+    None
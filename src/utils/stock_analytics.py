@@ -0,0 +1,107 @@
+import numpy as np
+import pandas as pd
+
+PERIODS_PER_YEAR = 12           # monthly adjusted series
+VOLATILITY_WINDOW = 12          # rolling window (in periods) for volatility
+DIVIDEND_WINDOW = 12            # trailing window (in periods) for dividend yield
+
+ANALYTICS_COLUMNS = [
+    "date",
+    "price_return",
+    "total_return",
+    "log_return",
+    "rolling_volatility",
+    "drawdown",
+    "trailing_dividend_yield",
+    "adjustment_factor",
+    "reconciliation_gap",
+]
+
+def prepare_price_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Normalize a monthly adjusted price frame (as produced by `api_v2.process_data`
+    or read back from its CSV) to a float frame indexed by date in ascending order.
+
+    :param df: DataFrame with the date as index or as a `date` column.
+    """
+    df = df.copy()
+    if "date" in df.columns:
+        df = df.set_index("date")
+    df.index = pd.to_datetime(df.index)
+    df.index.name = "date"
+
+    numeric_columns = ["open", "high", "low", "close", "adjusted_close", "volume", "dividend_amount"]
+    present = [col for col in numeric_columns if col in df.columns]
+    df[present] = df[present].apply(pd.to_numeric, errors="coerce")
+    return df[~df.index.duplicated(keep="last")].sort_index()
+
+def compute_analytics(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Compute the derived series for a monthly adjusted price frame in a single vectorized pass.
+
+    - price_return: close-to-close return
+    - total_return: return of the adjusted close (includes dividends and splits)
+    - log_return: log of the adjusted close ratio
+    - rolling_volatility: annualized standard deviation of log returns
+    - drawdown: distance of the adjusted close to its running peak
+    - trailing_dividend_yield: dividends paid in the trailing window over the current close
+    - adjustment_factor: adjusted close over close
+    - reconciliation_gap: total return minus the return rebuilt from close and dividends
+      (non-zero values flag splits or inconsistent adjustments)
+
+    :param df: Monthly adjusted price frame (see `prepare_price_frame`).
+    """
+    prices = prepare_price_frame(df)
+    close = prices["close"].to_numpy(dtype=float)
+    adjusted = prices["adjusted_close"].to_numpy(dtype=float)
+    dividends = prices["dividend_amount"].fillna(0).to_numpy(dtype=float)
+
+    previous_close = np.roll(close, 1)
+    previous_adjusted = np.roll(adjusted, 1)
+    previous_close[0] = np.nan
+    previous_adjusted[0] = np.nan
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        price_return = close / previous_close - 1
+        total_return = adjusted / previous_adjusted - 1
+        log_return = np.log(adjusted / previous_adjusted)
+        adjustment_factor = adjusted / close
+        reconstructed_return = (close + dividends) / previous_close - 1
+        drawdown = adjusted / np.fmax.accumulate(adjusted) - 1
+
+    analytics = pd.DataFrame({
+        "price_return": price_return,
+        "total_return": total_return,
+        "log_return": log_return,
+        "drawdown": drawdown,
+        "adjustment_factor": adjustment_factor,
+        "reconciliation_gap": total_return - reconstructed_return,
+    }, index=prices.index)
+
+    analytics["rolling_volatility"] = (
+        analytics["log_return"].rolling(VOLATILITY_WINDOW, min_periods=VOLATILITY_WINDOW).std()
+        * np.sqrt(PERIODS_PER_YEAR)
+    )
+    trailing_dividends = pd.Series(dividends, index=prices.index).rolling(DIVIDEND_WINDOW, min_periods=1).sum()
+    analytics["trailing_dividend_yield"] = trailing_dividends / prices["close"]
+
+    analytics = analytics.replace([np.inf, -np.inf], np.nan).reset_index()
+    return analytics[ANALYTICS_COLUMNS]
+
+def select_new_periods(analytics: pd.DataFrame, last_stored_date=None) -> pd.DataFrame:
+    """
+    Keep only the periods that still have to be written to the derived table.
+
+    The last stored period is recomputed as well, since the current month of a
+    monthly adjusted series keeps changing until the month closes.
+
+    :param analytics: Output of `compute_analytics`.
+    :param last_stored_date: Most recent date already in the derived table (None if empty).
+    """
+    if last_stored_date is None or pd.isna(last_stored_date):
+        return analytics
+    return analytics[analytics["date"] >= pd.Timestamp(last_stored_date)]
+
+if __name__ == "__main__":
+    # do nothing
+    None
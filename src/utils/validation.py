@@ -0,0 +1,166 @@
+import numpy as np
+import pandas as pd
+from utils import save_tools
+
+QUARANTINE_FILENAME_TEMPLATE = "quarantine_{dataset}.csv"
+
+# Currencies quoted by x-rates.com (ISO 4217)
+ALLOWED_CURRENCIES = {
+    "AED", "ARS", "AUD", "BGN", "BHD", "BND", "BRL", "BWP", "CAD", "CHF", "CLP", "CNY", "COP", "CZK",
+    "DKK", "EUR", "GBP", "HKD", "HUF", "IDR", "ILS", "INR", "IRR", "ISK", "JPY", "KRW", "KWD", "KZT",
+    "LKR", "LYD", "MUR", "MXN", "MYR", "NOK", "NPR", "NZD", "OMR", "PHP", "PKR", "PLN", "QAR", "RON",
+    "RUB", "SAR", "SEK", "SGD", "THB", "TRY", "TTD", "TWD", "USD", "VES", "ZAR",
+}
+EARLIEST_DATE = pd.Timestamp("1990-01-01")
+FUTURE_TOLERANCE = pd.Timedelta(days=1)
+PRICE_COLUMNS = ["open", "high", "low", "close", "adjusted_close"]
+
+# Each check takes the whole frame and returns a boolean array: True for the valid rows.
+
+def not_null(*columns):
+    def check(df):
+        return df[list(columns)].notna().to_numpy().all(axis=1)
+    return check
+
+def not_blank(column):
+    def check(df):
+        return (df[column].astype("string").str.strip().str.len() > 0).fillna(False).to_numpy(dtype=bool)
+    return check
+
+def in_range(column, low=None, high=None, allow_null=False):
+    """Values within [low, high] (callable bounds are evaluated at validation time, e.g. for "now")."""
+    def check(df):
+        values = df[column]
+        valid = values.notna().to_numpy()
+        lower = low() if callable(low) else low
+        upper = high() if callable(high) else high
+        if lower is not None:
+            valid &= (values >= lower).fillna(False).to_numpy(dtype=bool)
+        if upper is not None:
+            valid &= (values <= upper).fillna(False).to_numpy(dtype=bool)
+        return valid | values.isna().to_numpy() if allow_null else valid
+    return check
+
+def positive(*columns):
+    def check(df):
+        values = df[list(columns)].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+        return (np.isfinite(values) & (values > 0)).all(axis=1)
+    return check
+
+def not_greater(column, other):
+    """`column` <= `other` (e.g. low <= high)."""
+    def check(df):
+        return (df[column] <= df[other]).fillna(False).to_numpy(dtype=bool)
+    return check
+
+def is_in(column, allowed):
+    def check(df):
+        return df[column].isin(allowed).to_numpy()
+    return check
+
+def differs(column, other):
+    def check(df):
+        # compare category codes over shared categories instead of Python objects
+        left, right = df[column].astype("category"), df[other].astype("category")
+        categories = left.cat.categories.union(right.cat.categories)
+        return left.cat.set_categories(categories).cat.codes.to_numpy() != right.cat.set_categories(categories).cat.codes.to_numpy()
+    return check
+
+def strictly_increasing(column, by=None):
+    """
+    Each value is greater than the previous row's, per `by` group when the frame has that column:
+    flags duplicate and out-of-order dates (sort the frame first).
+    """
+    def check(df):
+        previous = df.groupby(by, observed=True)[column].shift() if by in df.columns else df[column].shift()
+        # missing values are left to not_null
+        return (df[column].isna() | previous.isna() | (df[column] > previous)).to_numpy(dtype=bool)
+    return check
+
+def unique(*columns):
+    """
+    Only the last row of each key is valid: a batch upsert cannot update the same row twice
+    (PostgreSQL: "ON CONFLICT DO UPDATE command cannot affect row a second time").
+    """
+    def check(df):
+        return ~df.duplicated(subset=list(columns), keep="last").to_numpy()
+    return check
+
+def _now():
+    return pd.Timestamp.now() + FUTURE_TOLERANCE
+
+def _now_unix():
+    return int(_now().timestamp())
+
+# Rules per dataset: name -> (columns the check needs, check). Checks whose columns are
+# missing from the frame are skipped. Column names are the ones passed to insert_data.
+VALIDATION_RULES = {
+    "news": {
+        "date_not_null": (["date"], not_null("date")),
+        "date_in_range": (["date"], in_range("date", EARLIEST_DATE, _now)),
+        "title_not_blank": (["title"], not_blank("title")),
+        "sentiment_in_range": (["sentiment"], in_range("sentiment", -1.0, 1.0, allow_null=True)),
+        "date_title_unique": (["date", "title"], unique("date", "title")),     # conflict key of the news table
+    },
+    "fx": {
+        "not_null": (["timestamp", "from", "to", "rate"], not_null("timestamp", "from", "to", "rate")),
+        "rate_positive": (["rate"], positive("rate")),
+        "timestamp_in_range": (["timestamp"], in_range("timestamp", int(EARLIEST_DATE.timestamp()), _now_unix)),
+        "from_currency_allowed": (["from"], is_in("from", ALLOWED_CURRENCIES)),
+        "to_currency_allowed": (["to"], is_in("to", ALLOWED_CURRENCIES)),
+        "currencies_differ": (["from", "to"], differs("from", "to")),
+    },
+    "stock": {
+        "date_not_null": (["date"], not_null("date")),
+        "date_in_range": (["date"], in_range("date", EARLIEST_DATE, _now)),
+        "prices_positive": (PRICE_COLUMNS, positive(*PRICE_COLUMNS)),
+        "low_not_above_high": (["low", "high"], not_greater("low", "high")),
+        "volume_not_negative": (["volume"], in_range("volume", 0, allow_null=True)),
+        "dividend_not_negative": (["dividend_amount"], in_range("dividend_amount", 0, allow_null=True)),
+        "dates_increasing": (["date"], strictly_increasing("date", by="symbol")),
+    },
+}
+
+def validate(df: pd.DataFrame, dataset: str) -> tuple:
+    """
+    Split a frame into valid and rejected rows with vectorized checks.
+
+    :param df: Frame about to be loaded.
+    :param dataset: One of VALIDATION_RULES keys ("news", "fx", "stock").
+    :return: (valid rows, rejected rows with a `rejection_reasons` column).
+    """
+    if dataset not in VALIDATION_RULES:
+        raise ValueError(f"Unknown dataset '{dataset}'. Available: {', '.join(VALIDATION_RULES)}")
+
+    results = {name: check(df) for name, (columns, check) in VALIDATION_RULES[dataset].items()
+               if all(column in df.columns for column in columns)}
+    valid = np.logical_and.reduce(list(results.values())) if results else np.ones(len(df), dtype=bool)
+
+    rejected = df[~valid].copy()
+    # reasons are only built for the (few) rejected rows
+    reasons = pd.Series("", index=rejected.index, dtype=object)
+    for name, result in results.items():
+        reasons[~result[~valid]] += name + ";"
+    rejected["rejection_reasons"] = reasons.str.rstrip(";")
+    return (df if valid.all() else df[valid]), rejected
+
+def quarantine(rejected: pd.DataFrame, dataset: str):
+    """Append rejected rows to `quarantine_{dataset}.csv` in the data folder for later inspection."""
+    if rejected.empty:
+        return
+    rejected = rejected.copy()
+    rejected.insert(0, "quarantined_at", pd.Timestamp.now().strftime("%Y-%m-%d %H:%M:%S"))
+    save_tools.save_to_csv(rejected, QUARANTINE_FILENAME_TEMPLATE.format(dataset=dataset), append_data=True)
+
+def validate_and_quarantine(df: pd.DataFrame, dataset: str) -> pd.DataFrame:
+    """Validate a frame, quarantine the offending rows and return the rows safe to insert."""
+    valid, rejected = validate(df, dataset)
+    if len(rejected):
+        print(f"⚠️ {len(rejected)} of {len(df)} {dataset} rows quarantined: "
+              f"{rejected['rejection_reasons'].str.split(';').explode().value_counts().to_dict()}")
+        quarantine(rejected, dataset)
+    return valid
+
+if __name__ == "__main__":
+    # do nothing
+    None
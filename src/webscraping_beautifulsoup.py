@@ -1,14 +1,36 @@
 from bs4 import BeautifulSoup
+import argparse
 import requests
 import pandas as pd
 import time
 from datetime import datetime
 from utils import save_tools
+from utils.page_archive import PageArchive
 
 CURRENCY_PAGE_URL = "https://x-rates.com/calculator/"
 CURRENCY_ELEMENT = {"tag": "span", "class": "ccOutputRslt"}
+ARCHIVE_SOURCE = "x-rates"
 
-def fetch_currency_rates(curr_from: str, curr_to: str):
+def parse_currency_rate(html: str, curr_to: str):
+    """Extract the rate from an x-rates calculator page, or None if it is not found."""
+    soup = BeautifulSoup(html, "html.parser")
+    rate_element = soup.find(CURRENCY_ELEMENT["tag"], class_=CURRENCY_ELEMENT["class"])
+    if not rate_element:
+        return None
+    rate = rate_element.text.strip().replace(f" {curr_to}", "").replace(",", "")
+    return float(rate)
+
+def build_rate_frame(curr_from: str, curr_to: str, rate: float, timestamp: int) -> pd.DataFrame:
+    return pd.DataFrame([{
+        "timestamp": timestamp,
+        "insert_date": datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S"),
+        "from": curr_from,
+        "to": curr_to,
+        "rate": rate,
+        "amount": 1
+    }])
+
+def fetch_currency_rates(curr_from: str, curr_to: str, archive: PageArchive = None, session: requests.Session = None):
     params = {
         "from": curr_from,
         "to": curr_to,
@@ -16,32 +38,23 @@ def fetch_currency_rates(curr_from: str, curr_to: str):
     }
 
     try:
-        response = requests.get(CURRENCY_PAGE_URL, params=params)
+        # a shared session reuses the connection across pairs
+        response = (session or requests).get(CURRENCY_PAGE_URL, params=params)
         response.raise_for_status()
-        
-        soup = BeautifulSoup(response.text, "html.parser")
+        fetched_at = int(time.time())
+
+        # Keep the raw page, so the rate can be parsed again if the page layout changes
+        if archive is not None:
+            archive.append(response.url, response.text, fetched_at)
 
-        rate_element = soup.find(CURRENCY_ELEMENT["tag"], class_=CURRENCY_ELEMENT["class"])
-        if not rate_element:
+        rate = parse_currency_rate(response.text, curr_to)
+        if rate is None:
             print("❌ Unable to find the exchange rate on the page.")
             return None
-        
-        rate = rate_element.text.strip().replace(f" {curr_to}", "").replace(",", "")
-        rate = float(rate)
 
         print(f"- 1 {curr_from} = {rate} {curr_to}")
 
-        conversionRate = [{
-            "timestamp": int(time.time()),
-            "insert_date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "from": curr_from,
-            "to": curr_to,
-            "rate": rate,
-            "amount": 1
-        }]
-
-        df = pd.DataFrame(conversionRate)
-        return df
+        return build_rate_frame(curr_from, curr_to, rate, fetched_at)
     except (requests.exceptions.RequestException) as e:
         print(f"❌ Error fetching data: {e}")
         return None
@@ -52,13 +65,17 @@ def fetch_currency_rates(curr_from: str, curr_to: str):
     return None
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fetch the current exchange rate of a currency pair from x-rates.")
+    parser.add_argument("--archive", action="store_true", help="Also keep the raw page in the compressed page archive")
+    args = parser.parse_args()
+
     currFrom = input("Enter the currency you want to convert from (e.g. EUR): ")
     currFrom = currFrom.upper() if currFrom else "EUR"
 
     currTo = input("Enter the currency you want to convert to (e.g. USD): ")
     currTo = currTo.upper() if currTo else "USD"
 
-    df = fetch_currency_rates(currFrom, currTo)
+    df = fetch_currency_rates(currFrom, currTo, archive=PageArchive(ARCHIVE_SOURCE) if args.archive else None)
 
     if df is not None:
         print("\n✅ Data fetched successfully.")
@@ -1,12 +1,19 @@
 from dotenv import load_dotenv
 import os
+import argparse
 import undetected_chromedriver as uc
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
 import pandas as pd
 import time
 from urllib.parse import urlencode
-from utils import save_tools
+from utils import save_tools, crawl_checkpoint, browser_profiles
+import company_registry
+from utils.page_archive import PageArchive
+from utils.news_parsing import PAGE_ELEMENTS_SELECTORS, NEWS_ARCHIVE_SOURCE
+import browser_daemon
 
 if os.path.exists(".env"):
     load_dotenv()
@@ -20,25 +27,16 @@ for var in required_env_vars:
 
 NEWS_PAGE_URL = os.getenv("NEWS_PAGE_URL")
 PARAMS_TEMPLATE = {
-    "kw": "\"jerónimo martins\"",       # or any other keyword
+    "kw": "\"jerónimo martins\"",       # default keyword, replaced by the one passed to build_search_url
     "sort": "release_date desc",
     "pg": 1
 }
-PAGE_ELEMENTS_SELECTORS = {
-    "container": '.search-results .article-category',
-    "article": {
-        "item-self": ".article",
-        # all elements contain an anchor tag with the link to the article's page
-        "title": "h3",                  # The title is inside an h3 tag
-        "date": ".item-info a",         # The date is inside an anchor tag
-        "summary": "div>div>a",         # The summary is inside an anchor tag two levels down the article root container
-        # "news_page_url": "div>div>a"
-    },
-    "pagination": ".pagination .page-item:not(.active) a"
-}
+PAGE_LOAD_TIMEOUT = 6   # seconds to wait for the search results to show up
+ARCHIVE_SOURCE = NEWS_ARCHIVE_SOURCE
 
 def build_search_url(keyword, page=1):
     params = PARAMS_TEMPLATE.copy()
+    params["kw"] = keyword
     params["pg"] = page
 
     # build the url using the params dictionary and properly endcoded values for each key
@@ -47,11 +45,23 @@ def build_search_url(keyword, page=1):
     print("🔍 Search URL:", encoded_url)
     return encoded_url
 
-def scrape_news(driver, url):
+def scrape_news(driver, url, archive: PageArchive = None, wait_for_results: bool = True):
     driver.get(url)
-    time.sleep(6)  # Allow time for the page to load
 
     container_selector = PAGE_ELEMENTS_SELECTORS["container"]
+    if not wait_for_results:
+        time.sleep(PAGE_LOAD_TIMEOUT)  # Allow time for the page to load
+    else:
+        try:
+            # Return as soon as the results are rendered instead of always sleeping the full timeout
+            WebDriverWait(driver, PAGE_LOAD_TIMEOUT).until(EC.presence_of_element_located((By.CSS_SELECTOR, container_selector)))
+        except TimeoutException:
+            print("⚠️ Search results did not load in time.")
+
+    # Keep the rendered page, so the articles can be parsed again if the selectors change
+    if archive is not None:
+        archive.append(url, driver.page_source)
+
     articles_selector = PAGE_ELEMENTS_SELECTORS["article"]["item-self"]
     all_articles_selector = f"{container_selector} {articles_selector}"
     articles = driver.find_elements(By.CSS_SELECTOR, all_articles_selector)
@@ -86,15 +96,13 @@ def scrape_news(driver, url):
 
     return news_data
 
-def load_existing_news(filename):
-    """Loads existing news from CSV if the file exists."""
-    return save_tools.load_existing_dataframe(filename=filename, columns=["Title", "Date", "Link", "Summary"])
-
-if __name__ == "__main__":
-    keyword = input("What news are you searching for (e.g. \"jerónimo martins\"): ").strip()
-    if not keyword:
-        keyword = PARAMS_TEMPLATE["kw"]
+def load_existing_news(filename, usecols=None):
+    """Loads existing news from CSV if the file exists (only `usecols` if given)."""
+    return save_tools.load_existing_dataframe(filename=filename, columns=["Title", "Date", "Link", "Summary"],
+                                              dataset="news", usecols=usecols, parse_dates=False)
 
+def ask_crawl_range() -> tuple:
+    """Ask for the first search page and the number of pages to scrape per keyword."""
     # User Input for Start Page
     try:
         start_page = int(input("Which page do you want to start scraping from (default: 1): ").strip())
@@ -109,64 +117,167 @@ if __name__ == "__main__":
             max_pages = 1
     except ValueError:
         max_pages = 1
+    return start_page, max_pages
 
-    try:
-        options = Options()
-        # options.add_argument("--headless")  # Run in headless mode
-        options.add_argument("--disable-gpu")
-        driver = uc.Chrome(options=options)
+def crawl_search(driver, keyword, checkpoint_path, cursor, start_page, max_pages, existing_titles,
+                 archive: PageArchive = None, wait_for_results: bool = True, page_stats: dict = None) -> list:
+    """
+    Scrape the search pages of a keyword, staging each page in the crawl checkpoint.
+
+    :param cursor: Checkpoint cursor to resume from (None: start at `start_page`).
+    :param existing_titles: Titles already saved, skipped.
+    :param page_stats: Totals updated with the bytes, seconds and pages measured.
+    :return: The new articles.
+    """
+    page_stats = page_stats if page_stats is not None else {"bytes": 0, "seconds": 0.0, "pages": 0}
+    all_news_data = []
+    current_page = cursor["last_page"] + 1 if cursor else start_page
+    pages_scraped = cursor["pages_scraped"] if cursor else 0
+
+    while pages_scraped < max_pages:
 
-        csv_filename = f"{keyword}_news.csv"
+        print(f"Current page: {current_page}")
+        print(f"Max pages: {max_pages}")
+        print(f"Scraped pages: {pages_scraped}");
 
-        existing_news_df = load_existing_news(csv_filename)
-        existing_titles = set(existing_news_df["Title"].tolist())
-        all_news_data = []
+        search_url = build_search_url(keyword, current_page)
+        print(f"🔍 Scraping page {current_page}...")
 
-        current_page = start_page
-        pages_scraped = 0
+        page_started_at = time.perf_counter()
+        news_data = scrape_news(driver, search_url, archive=archive, wait_for_results=wait_for_results)
+        page_seconds = time.perf_counter() - page_started_at
+        measured = browser_profiles.measure_page_load(driver)
+        page_stats["bytes"] += measured["bytes"]
+        page_stats["seconds"] += page_seconds
+        page_stats["pages"] += 1
+        print(f"📊 Page {current_page}: {measured['bytes'] / 1024:.0f} KiB in {measured['requests']} requests, {page_seconds:.2f}s")
 
-        while pages_scraped < max_pages:
+        if not news_data:
+            print("No articles found on this page. Stopping search.")
+            break
 
-            print(f"Current page: {current_page}")
-            print(f"Max pages: {max_pages}")
-            print(f"Scraped pages: {pages_scraped}");
+        # Filter out existing news
+        new_articles = [article for article in news_data if article["Title"] not in existing_titles]
+        all_news_data.extend(new_articles)
 
-            search_url = build_search_url(keyword, current_page)
-            print(f"🔍 Scraping page {current_page}...")
+        # Stage the page so a crash only costs the remaining pages
+        crawl_checkpoint.append_page(checkpoint_path, {
+            "keyword": keyword,
+            "start_page": start_page,
+            "max_pages": max_pages,
+            "last_page": current_page,
+            "pages_scraped": pages_scraped + 1,
+        }, new_articles)
 
-            news_data = scrape_news(driver, search_url)
-            if not news_data:
-                print("No articles found on this page. Stopping search.")
+        if pages_scraped % 10 == 0 and pages_scraped > 0:
+            cont = input(f"You have searched {pages_scraped} pages. Do you want to continue? (y/n): ").strip().lower()
+            if cont != 'y':
+                print("Stopping search as per user request.")
                 break
+        
+        current_page += 1
+        pages_scraped += 1
+        #END WHILE LOOP
 
-            # Filter out existing news
-            new_articles = [article for article in news_data if article["Title"] not in existing_titles]
-            all_news_data.extend(new_articles)
+    return all_news_data
 
-            if pages_scraped % 10 == 0 and pages_scraped > 0:
-                cont = input(f"You have searched {pages_scraped} pages. Do you want to continue? (y/n): ").strip().lower()
-                if cont != 'y':
-                    print("Stopping search as per user request.")
-                    break
-            
-            current_page += 1
-            pages_scraped += 1
-            #END WHILE LOOP
+def save_crawl(news_data: list, csv_filename: str, checkpoint_path: str) -> bool:
+    """
+    Append the crawled articles to the news file, then clear the crawl checkpoint.
+
+    The checkpoint is the only copy of the staged articles until they are saved, so it is kept
+    (for --resume) when the save fails.
 
-        if all_news_data:
-            new_news_df = pd.DataFrame(all_news_data)
-            updated_news_df = pd.concat([existing_news_df, new_news_df]).drop_duplicates(subset=["Title"], keep="first")
+    :return: True when the articles were saved and the checkpoint cleared.
+    """
+    if news_data:
+        new_news_df = pd.DataFrame(news_data).drop_duplicates(subset=["Title"], keep="first")
+        if not save_tools.save_to_csv(new_news_df, csv_filename, append_data=True):
+            print(f"⚠️ News not saved, the crawl is kept in {checkpoint_path}: rerun with --resume.")
+            return False
+        print(f"✅ {len(new_news_df)} new articles added. News saved to {csv_filename}")
+    else:
+        print("No news articles found.")
 
-            save_tools.save_to_csv(updated_news_df, csv_filename, ignore_overwrite=True, append_data=False)
-            print(f"✅ {len(new_news_df)} new articles added. News saved to {csv_filename}")
+    crawl_checkpoint.clear_checkpoint(checkpoint_path)
+    return True
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scrape the latest company news using Selenium.")
+    company_registry.add_company_arguments(parser)
+    parser.add_argument("--resume", action="store_true", help="Continue an interrupted crawl from its last completed page")
+    parser.add_argument("--profile", default="default", choices=list(browser_profiles.BROWSER_PROFILES),
+                        help="Browser profile (lightweight: headless, eager load, blocked assets, shared disk cache)")
+    parser.add_argument("--archive", action="store_true", help="Also keep every page in the compressed page archive")
+    parser.add_argument("--daemon", nargs="?", const=browser_daemon.DAEMON_URL, default=None, metavar="URL",
+                        help=f"Lease a warm browser from browser_daemon.py instead of starting one (default URL: {browser_daemon.DAEMON_URL})")
+    args = parser.parse_args()
+
+    _, companies = company_registry.select_companies(args)
+    crawl_range = None      # asked once, for the first keyword without a checkpoint
+
+    driver = None
+    lease = None
+    archive = PageArchive(ARCHIVE_SOURCE) if args.archive else None
+    try:
+        if args.daemon:
+            # The daemon's session is already started, patched and set up with its own profile
+            lease = browser_daemon.DriverLease(args.daemon)
+            driver = lease.driver
+            # the daemon's profile is the one in use, whatever --profile says
+            profile_name = lease.lease["profile"]
+            print(f"🔥 Leased a warm '{profile_name}' browser session from {args.daemon}")
+            profile = browser_profiles.get_profile(profile_name)
         else:
-            print("No news articles found.")
+            profile_name = args.profile
+            profile = browser_profiles.get_profile(args.profile)
+            options = browser_profiles.build_chrome_options(args.profile)
+            driver = uc.Chrome(options=options, headless=profile["headless"])
+            browser_profiles.apply_profile(driver, args.profile)
+        page_stats = {"bytes": 0, "seconds": 0.0, "pages": 0}
+
+        for company in companies:
+            # Same file as collect_companies.py, data_load_news.py and tag_news.py
+            csv_filename = company_registry.news_filename(company)
+            # Only the titles are needed to skip known articles; new ones are appended to the file
+            existing_titles = set(load_existing_news(csv_filename, usecols=["Title"])["Title"].tolist())
+
+            for keyword in company["keywords"]:
+                checkpoint_path = crawl_checkpoint.get_checkpoint_path(f"{csv_filename}_{keyword}")
+                cursor, staged_news_data = crawl_checkpoint.load_checkpoint(checkpoint_path) if args.resume else (None, [])
+
+                if cursor:
+                    start_page = cursor["start_page"]
+                    max_pages = cursor["max_pages"]
+                    print(f"⏯️ Resuming the {keyword} crawl after page {cursor['last_page']} ({len(staged_news_data)} staged articles).")
+                else:
+                    if args.resume:
+                        print(f"⚠️ No checkpoint found for {keyword}, starting a new crawl.")
+                    crawl_checkpoint.clear_checkpoint(checkpoint_path)
+                    crawl_range = crawl_range or ask_crawl_range()
+                    start_page, max_pages = crawl_range
+
+                # A crash between the append and clearing the checkpoint leaves staged articles that are already saved
+                all_news_data = [article for article in staged_news_data if article["Title"] not in existing_titles]
+                all_news_data += crawl_search(driver, keyword, checkpoint_path, cursor, start_page, max_pages, existing_titles,
+                                              archive=archive, wait_for_results=profile["wait_for_results"], page_stats=page_stats)
+
+                if save_crawl(all_news_data, csv_filename, checkpoint_path):
+                    # the company's next keyword may find the same articles
+                    existing_titles.update(article["Title"] for article in all_news_data)
+
+        if page_stats["pages"]:
+            print(f"📊 Profile '{profile_name}': {page_stats['bytes'] / 1024:.0f} KiB transferred, "
+                  f"{page_stats['seconds'] / page_stats['pages']:.2f}s per page on average")
 
     except Exception as err:
         print("❌ An error occurred:", err)
 
     finally:
-        if driver:
+        if lease:
+            lease.release()
+            print("✅ Browser session returned to the daemon.")
+        elif driver:
             try:
                 driver.quit()
                 print("✅ WebDriver closed properly.")
@@ -176,4 +287,4 @@ if __name__ == "__main__":
                     driver.close()
                     print("✅ WebDriver closed properly.")
                 except Exception as e2:
-                    print("❌ Error when closing WebDriver:", e2)
\ No newline at end of file
+                    print("❌ Error when closing WebDriver:", e2)
@@ -0,0 +1,101 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+import browser_daemon
+
+class FakeDriver:
+    """Stands in for a Chrome session of the pool"""
+    created = 0
+
+    def __init__(self, profile_name):
+        FakeDriver.created += 1
+        self.session_id = f"session-{FakeDriver.created}"
+        self.service = type("Service", (), {"service_url": "http://127.0.0.1:9515"})()
+        self.healthy = True
+        self.urls = []
+
+    def execute_script(self, script):
+        if not self.healthy:
+            raise ConnectionError("browser gone")
+        return 1
+
+    def get(self, url):
+        self.urls.append(url)
+
+    def quit(self):
+        pass
+
+@pytest.fixture
+def daemon():
+    pool = browser_daemon.BrowserPool("lightweight", size=1, driver_factory=FakeDriver)
+    pool.start()
+    server = browser_daemon.start_daemon(pool)
+    yield server
+    server.shutdown()
+
+def test_lease_heartbeat_release(daemon, monkeypatch):
+    """Test that a session can only be leased once at a time and is reset when released"""
+    monkeypatch.setattr(browser_daemon, "AttachedChrome", lambda executor_url, session_id: type("Driver", (), {"quit": lambda self: None})())
+    pool = daemon.pool
+
+    lease = browser_daemon.DriverLease(daemon.base_url, timeout=30, wait=0)
+    assert lease.lease["executor_url"] == "http://127.0.0.1:9515"
+    assert pool.status()["sessions"][0]["leased"]
+    with pytest.raises(TimeoutError):
+        browser_daemon.DriverLease(daemon.base_url, wait=0)
+
+    lease.release()
+    assert not pool.status()["sessions"][0]["leased"]
+    assert pool.sessions[0]["driver"].urls == ["about:blank"]
+    assert not pool.heartbeat(lease.lease["lease_id"])
+
+def test_expired_lease_is_reclaimed():
+    """Test that a lease without heartbeat is reclaimed and the session leased again"""
+    pool = browser_daemon.BrowserPool(size=1, driver_factory=FakeDriver)
+    pool.start()
+    lease = pool.lease(timeout=-1)
+
+    assert pool.lease() is None
+    assert pool.reap() == 1
+    assert pool.lease()["lease_id"] != lease["lease_id"]
+
+def test_unhealthy_session_is_replaced_before_lease():
+    """Test that a dead session is replaced by a new one before it is leased"""
+    pool = browser_daemon.BrowserPool(size=1, driver_factory=FakeDriver)
+    pool.start()
+    old_session = pool.sessions[0]["driver"].session_id
+    pool.sessions[0]["driver"].healthy = False
+
+    lease = pool.lease()
+    assert lease["session_id"] != old_session
+
+def test_attached_driver_reuses_the_existing_session():
+    """Test that attaching sends commands to the leased session instead of creating a new one"""
+    requests_seen = []
+
+    class ChromedriverHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            requests_seen.append(self.path)
+            payload = json.dumps({"value": None}).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ChromedriverHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        driver = browser_daemon.AttachedChrome(f"http://127.0.0.1:{server.server_address[1]}", "warm-session")
+        driver.get("https://example.com")
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.quit()
+    finally:
+        server.shutdown()
+
+    assert requests_seen == ["/session/warm-session/url", "/session/warm-session/goog/cdp/execute"]
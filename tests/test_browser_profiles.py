@@ -0,0 +1,42 @@
+import pytest
+from utils import browser_profiles
+
+def test_get_profile_unknown_name():
+    """Test that an unknown profile name lists the available ones"""
+    assert browser_profiles.get_profile("lightweight")["headless"] is True
+    with pytest.raises(ValueError, match="default, lightweight"):
+        browser_profiles.get_profile("turbo")
+
+def test_default_profile_keeps_baseline_options():
+    """Test that the default profile only sets the options the scraper used before profiles existed"""
+    options = browser_profiles.build_chrome_options("default")
+    assert options.arguments == ["--disable-gpu"]
+    assert options.page_load_strategy == "normal"
+    assert browser_profiles.get_profile("default")["wait_for_results"] is False
+
+def test_lightweight_profile_options(tmp_path, monkeypatch):
+    """Test the lightweight options; headless mode is left to uc.Chrome(headless=...)"""
+    monkeypatch.setattr(browser_profiles, "DISK_CACHE_DIR", str(tmp_path / "cache"))
+    options = browser_profiles.build_chrome_options("lightweight")
+
+    assert options.page_load_strategy == "eager"
+    assert not any(argument.startswith("--headless") for argument in options.arguments)
+    assert f"--disk-cache-dir={tmp_path / 'cache'}" in options.arguments
+    assert "--blink-settings=imagesEnabled=false" in options.arguments
+    assert (tmp_path / "cache").is_dir()
+
+def test_apply_profile_blocks_resources_over_cdp():
+    """Test that only profiles blocking resources send CDP commands"""
+    class FakeDriver:
+        def __init__(self):
+            self.commands = []
+
+        def execute_cdp_cmd(self, cmd, cmd_args):
+            self.commands.append((cmd, cmd_args))
+
+    driver = FakeDriver()
+    browser_profiles.apply_profile(driver, "default")
+    assert driver.commands == []
+
+    browser_profiles.apply_profile(driver, "lightweight")
+    assert driver.commands == [("Network.enable", {}), ("Network.setBlockedURLs", {"urls": browser_profiles.BLOCKED_URL_PATTERNS})]
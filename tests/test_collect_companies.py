@@ -0,0 +1,114 @@
+import argparse
+import json
+import pytest
+from sqlalchemy import create_engine, MetaData
+import api_v2
+import company_registry
+import collect_companies
+import webscraping_beautifulsoup
+from standin_servers import start_standin_server, synthetic_news
+from utils import save_tools
+from utils.sqlalchemy import config
+from webscraping_selenium import build_search_url
+from utils.news_parsing import parse_news_html
+
+COMPANIES = [
+    {"name": "Jerónimo Martins", "keywords": ['"jerónimo martins"'], "tickers": ["JMT.LS"], "currency": "EUR"},
+    {"name": "Galp Energia", "keywords": ['"galp"'], "tickers": ["GALP.LS", "JMT.LS"], "currency": "EUR"},
+    {"name": "Petrobras", "keywords": ['"petrobras"'], "tickers": ["PETR4.SA"], "currency": "BRL"},
+]
+
+@pytest.fixture
+def standin(tmp_path, monkeypatch):
+    """Stand-in APIs, a temporary embedded database and data folder"""
+    server = start_standin_server(news_pages=2)
+    monkeypatch.setattr(api_v2, "URL", f"{server.base_url}/query")
+    monkeypatch.setattr(webscraping_beautifulsoup, "CURRENCY_PAGE_URL", f"{server.base_url}/calculator/")
+    monkeypatch.setattr(config, "DB_BACKEND", "sqlite")
+    monkeypatch.setattr(config, "engine", create_engine(f"sqlite:///{tmp_path / 'test.db'}"))
+    monkeypatch.setattr(config, "metadata", MetaData())
+    monkeypatch.setattr(save_tools, "OUTPUT_DIR", str(tmp_path))
+    yield server
+    server.shutdown()
+
+def test_build_search_url_uses_keyword():
+    """Test that the search URL uses the keyword it is given"""
+    assert 'kw="galp"' in build_search_url('"galp"', 2)
+
+def test_fx_pairs_are_deduplicated():
+    """Test that each (reporting currency, target) pair is listed once"""
+    assert company_registry.fx_pairs(COMPANIES, ["USD", "EUR"]) == [("BRL", "EUR"), ("BRL", "USD"), ("EUR", "USD")]
+
+def test_load_registry_from_file(tmp_path):
+    """Test a JSON registry: default aliases, news file names and missing fields"""
+    path = tmp_path / "companies.json"
+    path.write_text(json.dumps(COMPANIES[:1]), encoding="utf-8")
+    registry = company_registry.load_registry(str(path))
+
+    assert company_registry.get_company("jerónimo martins", registry)["aliases"] == ["jerónimo martins"]
+    assert company_registry.news_filename(registry[0]) == "jerónimo martins_news.csv"
+
+    path.write_text(json.dumps([{"name": "No tickers", "keywords": ["x"], "currency": "EUR"}]), encoding="utf-8")
+    with pytest.raises(ValueError):
+        company_registry.load_registry(str(path))
+
+def test_collect_stocks_and_fx_share_one_session(standin, tmp_path):
+    """Test that prices and rates go through one session and shared tickers are fetched once"""
+    session = collect_companies.create_session()
+    calls = []
+    original_get = session.get
+    session.get = lambda *args, **kwargs: calls.append(args[0]) or original_get(*args, **kwargs)
+
+    collected = {
+        "stocks": collect_companies.collect_stocks(COMPANIES, session),
+        "fx": collect_companies.collect_fx(COMPANIES, ["USD"], session),
+    }
+
+    symbols = config.query_dataframe(f"SELECT DISTINCT symbol FROM {collect_companies.stream_stocks.TABLE_NAME}")["symbol"]
+    assert sorted(symbols) == ["GALP.LS", "JMT.LS", "PETR4.SA"]          # JMT.LS fetched once
+    assert collected["fx"] == 2
+    assert len(calls) == 5
+    assert (tmp_path / "currency_exchange_rate_BRL_USD.csv").exists()
+
+def test_collect_news_is_incremental(standin, monkeypatch):
+    """Test that each company's news go to its own file and known pages stop the crawl"""
+    pages_fetched = []
+
+    def fake_scrape_news(driver, url):
+        pages_fetched.append(url)
+        params = dict(part.split("=", 1) for part in url.split("?", 1)[1].split("&"))
+        return parse_news_html(synthetic_news({"kw": "company", "pg": params["pg"]}, news_pages=2)[2], url)
+
+    monkeypatch.setattr(collect_companies, "scrape_news", fake_scrape_news)
+
+    assert collect_companies.collect_news(COMPANIES[:1], driver=None, max_pages=5) == 20
+    assert len(pages_fetched) == 3         # the third page is empty
+
+    pages_fetched.clear()
+    assert collect_companies.collect_news(COMPANIES[:1], driver=None, max_pages=5) == 0
+    assert len(pages_fetched) == 1         # the first page brings nothing new
+    saved = save_tools.load_existing_dataframe("jerónimo martins_news.csv", columns=["Title"])
+    assert len(saved) == 20
+
+def test_select_companies_from_arguments(tmp_path):
+    """Test the company / --all / --registry options shared by the news scripts"""
+    parser = argparse.ArgumentParser()
+    company_registry.add_company_arguments(parser)
+    path = tmp_path / "companies.json"
+    path.write_text(json.dumps(COMPANIES), encoding="utf-8")
+
+    registry, companies = company_registry.select_companies(parser.parse_args([]))
+    assert [company["name"] for company in companies] == [company_registry.DEFAULT_COMPANY]
+    registry, companies = company_registry.select_companies(parser.parse_args(["galp energia", "--registry", str(path)]))
+    assert [company["tickers"] for company in companies] == [["GALP.LS", "JMT.LS"]]
+    registry, companies = company_registry.select_companies(parser.parse_args(["--all", "--registry", str(path)]))
+    assert companies == registry and len(companies) == 3
+
+def test_collect_all_raises_http_errors(monkeypatch):
+    """Test that an error in the stocks/FX thread is raised instead of reported as nothing collected"""
+    def failing_collect_stocks(companies, session):
+        raise RuntimeError("API down")
+
+    monkeypatch.setattr(collect_companies, "collect_stocks", failing_collect_stocks)
+    with pytest.raises(RuntimeError, match="API down"):
+        collect_companies.collect_all(COMPANIES, fx=False, news=False)
@@ -0,0 +1,41 @@
+from utils import crawl_checkpoint
+
+def test_checkpoint_roundtrip(tmp_path):
+    """Test that staged pages are merged and the last cursor is returned"""
+    path = str(tmp_path / "news_crawl_checkpoint.jsonl")
+    crawl_checkpoint.append_page(path, {"last_page": 1, "pages_scraped": 1}, [{"Title": "A"}])
+    crawl_checkpoint.append_page(path, {"last_page": 2, "pages_scraped": 2}, [{"Title": "B"}, {"Title": "C"}])
+
+    cursor, articles = crawl_checkpoint.load_checkpoint(path)
+    assert cursor["last_page"] == 2
+    assert [article["Title"] for article in articles] == ["A", "B", "C"]
+
+def test_checkpoint_ignores_partial_line(tmp_path):
+    """Test that a line cut by a crash does not break the resume"""
+    path = str(tmp_path / "news_crawl_checkpoint.jsonl")
+    crawl_checkpoint.append_page(path, {"last_page": 1, "pages_scraped": 1}, [{"Title": "A"}])
+    with open(path, "a", encoding="utf-8") as file:
+        file.write('{"cursor": {"last_page": 2')
+
+    cursor, articles = crawl_checkpoint.load_checkpoint(path)
+    assert cursor["last_page"] == 1
+    assert len(articles) == 1
+
+def test_clear_checkpoint(tmp_path):
+    """Test that a missing checkpoint loads as empty after clearing"""
+    path = str(tmp_path / "news_crawl_checkpoint.jsonl")
+    crawl_checkpoint.append_page(path, {"last_page": 1}, [])
+    crawl_checkpoint.clear_checkpoint(path)
+    assert crawl_checkpoint.load_checkpoint(path) == (None, [])
+
+def test_append_after_partial_line(tmp_path):
+    """Test that a page appended after a crash is not glued to the partial line"""
+    path = str(tmp_path / "news_crawl_checkpoint.jsonl")
+    crawl_checkpoint.append_page(path, {"last_page": 1}, [{"Title": "A"}])
+    with open(path, "a", encoding="utf-8") as file:
+        file.write('{"cursor": {"last_page": 2')
+    crawl_checkpoint.append_page(path, {"last_page": 2}, [{"Title": "B"}])
+
+    cursor, articles = crawl_checkpoint.load_checkpoint(path)
+    assert cursor["last_page"] == 2
+    assert [article["Title"] for article in articles] == ["A", "B"]
@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+import currency_converter
+from currency_converter import RateIndex, LiveRateCache, convert, convert_series
+
+@pytest.fixture
+def rate_index(monkeypatch):
+    """Rate index with EUR/USD and EUR/GBP observations"""
+    index = RateIndex()
+    index.add_rates("EUR", "USD", ["2024-01-01", "2024-02-01", "2024-03-01"], [1.10, 1.20, 1.30])
+    index.add_rates("EUR", "GBP", ["2024-01-01"], [0.80])
+    monkeypatch.setattr(currency_converter, "_rate_index", index)
+    return index
+
+def test_rate_at_uses_last_rate_before_timestamp(rate_index):
+    """Test the as-of lookup"""
+    assert rate_index.rate_at("EUR", "USD", "2024-02-15") == pytest.approx(1.20)
+    assert rate_index.rate_at("EUR", "USD", "2024-03-01") == pytest.approx(1.30)
+    assert np.isnan(rate_index.rate_at("EUR", "USD", "2023-12-31"))
+    assert rate_index.rate_at("EUR", "USD", "2023-12-31", backfill=True) == pytest.approx(1.10)
+
+def test_inverse_and_cross_rates(rate_index):
+    """Test rates derived from the inverse pair and through an intermediate currency"""
+    assert rate_index.rate_at("USD", "EUR", "2024-01-15") == pytest.approx(1 / 1.10)
+    assert rate_index.rate_at("GBP", "USD", "2024-02-15") == pytest.approx(1.20 / 0.80)
+    with pytest.raises(KeyError):
+        rate_index.rate_at("EUR", "JPY", "2024-02-15")
+
+def test_convert_series_uses_datetime_index(rate_index):
+    """Test that a whole price series is converted with one rate per date"""
+    prices = pd.Series([10.0, 20.0], index=pd.to_datetime(["2024-01-31", "2024-03-31"]))
+    converted = convert_series(prices, "EUR", "USD")
+    assert converted.tolist() == pytest.approx([11.0, 26.0])
+    assert convert(10, "EUR", "USD", at="2024-02-15") == pytest.approx(12.0)
+
+def test_live_rate_cache_expires_and_evicts(monkeypatch):
+    """Test the TTL and LRU behaviour of the live rate cache"""
+    now = [0.0]
+    monkeypatch.setattr(currency_converter.time, "monotonic", lambda: now[0])
+    cache = LiveRateCache(max_size=2, ttl=10)
+
+    cache.put("EUR", "USD", 1.1)
+    cache.put("EUR", "GBP", 0.8)
+    cache.get("EUR", "USD")
+    cache.put("EUR", "JPY", 160.0)
+    assert cache.get("EUR", "GBP") is None      # least recently used was evicted
+    assert cache.get("EUR", "USD") == 1.1
+
+    now[0] = 11.0
+    assert cache.get("EUR", "USD") is None      # expired
+
+def test_pair_without_valid_rates_is_not_indexed(tmp_path):
+    """Test that a pair with no rows is unknown (KeyError) instead of breaking the as-of lookups"""
+    index = RateIndex()
+    index.add_rates("EUR", "USD", np.array([], dtype="int64"), np.array([]))
+    with pytest.raises(KeyError):
+        index.rates_at("EUR", "USD", [1_700_000_000])
+    with pytest.raises(KeyError):
+        index.latest_rate("EUR", "USD")
+
+    pd.DataFrame({"timestamp": [1_700_000_000], "insert_date": ["2023-11-14 22:13:20"], "from": ["EUR"], "to": ["USD"],
+                  "rate": [-1.0], "amount": [1]}).to_csv(tmp_path / "currency_exchange_rate_EUR_USD.csv", index=False)
+    assert RateIndex().load_directory(str(tmp_path)).currencies() == set()
@@ -0,0 +1,62 @@
+import os
+import pandas as pd
+from export_star_schema import export_star_schema
+
+def write_sources(source_dir, march_close="12.0"):
+    pd.DataFrame({
+        "date": ["2024-01-31", "2024-02-29", "2024-03-31"],
+        "open": ["10", "11", "12"], "high": ["11", "12", "13"], "low": ["9", "10", "11"],
+        "close": ["10", "11", march_close], "adjusted_close": ["10", "11", march_close],
+        "volume": ["100", "200", "300"], "dividend_amount": ["0", "0", "0"],
+    }).to_csv(source_dir / "JMT.LS_monthly_adjusted_data.csv", index=False)
+    pd.DataFrame({
+        "timestamp": [1706745600], "insert_date": ["2024-02-01 00:00:00"],
+        "from": ["EUR"], "to": ["USD"], "rate": [1.08], "amount": [1],
+    }).to_csv(source_dir / "currency_exchange_rate_EUR_USD.csv", index=False)
+    pd.DataFrame({
+        "Title": ["Lucros sobem"], "Date": ["15-02-2024 10:00"], "Link": ["https://a.com/1"],
+        "Summary": ["..."], "sentiment": [0.5], "companies": ["Jerónimo Martins"], "tickers": ["JMT.LS"],
+    }).to_csv(source_dir / "jerónimo martins_news.csv", index=False)
+
+def test_export_writes_star_schema(tmp_path):
+    """Test the dimensions and the monthly fact partitions with integer keys"""
+    export_dir = tmp_path / "powerbi"
+    write_sources(tmp_path)
+    written = export_star_schema(str(tmp_path), str(export_dir))
+
+    assert written["fact_price"] == 3
+    fact_price = pd.read_parquet(export_dir / "fact_price" / "period=2024-03" / "part-0.parquet")
+    dim_symbol = pd.read_parquet(export_dir / "dim_symbol.parquet")
+    assert fact_price["date_key"].tolist() == [20240331]
+    assert fact_price["symbol_key"].tolist() == dim_symbol["symbol_key"].tolist()
+    assert dim_symbol["company"].tolist() == ["Jerónimo Martins"]
+
+    fact_news = pd.read_parquet(export_dir / "fact_news" / "period=2024-02" / "part-0.parquet")
+    assert fact_news["symbol_key"].tolist() == dim_symbol["symbol_key"].tolist()
+    assert os.path.exists(export_dir / "fact_fx" / "period=2024-02" / "part-0.parquet")
+
+def test_export_rewrites_only_changed_partitions(tmp_path):
+    """Test that a second export only touches the partitions whose period changed"""
+    export_dir = tmp_path / "powerbi"
+    write_sources(tmp_path)
+    export_star_schema(str(tmp_path), str(export_dir))
+
+    assert sum(export_star_schema(str(tmp_path), str(export_dir)).values()) == 0
+
+    write_sources(tmp_path, march_close="12.5")
+    written = export_star_schema(str(tmp_path), str(export_dir))
+    assert written == {"dim_date": 0, "dim_symbol": 0, "dim_currency": 0, "fact_price": 1, "fact_fx": 0, "fact_news": 0}
+
+def test_export_removes_partitions_gone_from_source(tmp_path):
+    """Test that a period no longer in the source loses its partition folder and manifest entry"""
+    export_dir = tmp_path / "powerbi"
+    write_sources(tmp_path)
+    export_star_schema(str(tmp_path), str(export_dir))
+
+    prices = pd.read_csv(tmp_path / "JMT.LS_monthly_adjusted_data.csv")
+    prices[prices["date"] != "2024-01-31"].to_csv(tmp_path / "JMT.LS_monthly_adjusted_data.csv", index=False)
+    export_star_schema(str(tmp_path), str(export_dir))
+
+    assert sorted(os.listdir(export_dir / "fact_price")) == ["period=2024-02", "period=2024-03"]
+    manifest = (export_dir / "manifest.json").read_text(encoding="utf-8")
+    assert "fact_price/period=2024-01" not in manifest
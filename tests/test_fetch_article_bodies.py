@@ -0,0 +1,59 @@
+import asyncio
+import time
+import pandas as pd
+from unittest.mock import MagicMock
+import fetch_article_bodies
+from fetch_article_bodies import extract_main_text, select_links_to_fetch, fetch_body, hash_link, BODIES_COLUMNS
+
+def test_extract_main_text_prefers_article():
+    """Test that the article text is extracted without navigation and scripts"""
+    html = """
+        <html><body>
+            <nav><p>Menu</p></nav>
+            <article><p>First paragraph.</p><script>var x = 1;</script><p>Second paragraph.</p></article>
+            <footer><p>Copyright</p></footer>
+        </body></html>
+    """
+    assert extract_main_text(html) == "First paragraph.\n\nSecond paragraph."
+
+def test_select_links_to_fetch_skips_stored_hashes():
+    """Test that links already fetched successfully are skipped and failed ones are retried"""
+    news_df = pd.DataFrame({"Link": ["https://a.com/1", "https://a.com/2", "https://a.com/3", None]})
+    bodies_df = pd.DataFrame([
+        {"link_hash": hash_link("https://a.com/1"), "status": 200},
+        {"link_hash": hash_link("https://a.com/2"), "status": None},
+    ], columns=BODIES_COLUMNS)
+
+    assert select_links_to_fetch(news_df, bodies_df) == ["https://a.com/2", "https://a.com/3"]
+    assert len(select_links_to_fetch(news_df, bodies_df, refresh=True)) == 3
+
+def test_fetch_body_not_modified_keeps_previous_body():
+    """Test that a 304 answer to a conditional GET keeps the stored body"""
+    session = MagicMock()
+    session.get.return_value = MagicMock(status_code=304)
+    previous = {"etag": '"abc"', "last_modified": None, "article_body": "Stored body"}
+
+    record = fetch_body(session, "https://a.com/1", previous)
+
+    assert session.get.call_args.kwargs["headers"] == {"If-None-Match": '"abc"'}
+    assert record["status"] == 304
+    assert record["article_body"] == "Stored body"
+
+def test_busy_host_does_not_starve_other_hosts(monkeypatch):
+    """Test that links waiting on one host (or its delay) do not hold the global slots"""
+    monkeypatch.setattr(fetch_article_bodies, "MAX_CONCURRENCY", 2)
+    monkeypatch.setattr(fetch_article_bodies, "PER_HOST_CONCURRENCY", 1)
+    monkeypatch.setattr(fetch_article_bodies, "PER_HOST_DELAY", 0.3)
+    started = {}
+
+    def fake_fetch_body(session, link, previous=None):
+        started[link] = time.perf_counter()
+        return {"link": link}
+
+    monkeypatch.setattr(fetch_article_bodies, "fetch_body", fake_fetch_body)
+    began = time.perf_counter()
+    links = [f"https://busy.com/{n}" for n in range(4)] + ["https://other.com/1"]
+    records = asyncio.run(fetch_article_bodies.fetch_bodies(links))
+
+    assert [record["link"] for record in records] == links
+    assert started["https://other.com/1"] - began < 0.2
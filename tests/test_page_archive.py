@@ -0,0 +1,100 @@
+import os
+import subprocess
+import sys
+import pytest
+from utils import save_tools, page_archive
+from utils.page_archive import PageArchive
+from standin_servers import synthetic_x_rates, synthetic_news
+import reparse_archive
+
+CURRENCIES = ["EUR", "USD", "GBP", "CHF", "JPY", "PLN", "BRL", "CAD"]
+
+@pytest.fixture(autouse=True)
+def output_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(save_tools, "OUTPUT_DIR", str(tmp_path))
+    return tmp_path
+
+def archive_fx_pages(archive, count):
+    for i in range(count):
+        curr_from, curr_to = CURRENCIES[i % 8], CURRENCIES[(i + 1) % 8]
+        _, _, html = synthetic_x_rates({"from": curr_from, "to": curr_to})
+        archive.append(f"https://x-rates.com/calculator/?from={curr_from}&to={curr_to}&amount=1", html, fetched_at=1_700_000_000 + i)
+
+def test_pages_round_trip_and_truncated_record_is_ignored():
+    """Test that stored pages read back unchanged and a record cut by a crash is skipped"""
+    archive = PageArchive("x-rates")
+    archive.append("https://example.com/a", "<html>á</html>", fetched_at=1)
+    archive.append("https://example.com/b", "<html>b</html>", fetched_at=2)
+    with open(archive.path, "ab") as file:
+        file.write(b"\x00\x00\x01\x00\x00")     # crash in the middle of a header
+
+    pages = list(PageArchive("x-rates"))
+    assert pages == [
+        {"url": "https://example.com/a", "fetched_at": 1, "html": "<html>á</html>"},
+        {"url": "https://example.com/b", "fetched_at": 2, "html": "<html>b</html>"},
+    ]
+
+def test_dictionary_is_trained_and_used_for_new_pages(monkeypatch):
+    """Test that a dictionary is trained once enough pages are stored and older pages stay readable"""
+    monkeypatch.setattr(page_archive, "TRAIN_AFTER", 200)
+    monkeypatch.setattr(page_archive, "DICTIONARY_SIZE", 4096)
+    archive = PageArchive("x-rates")
+    archive_fx_pages(archive, 220)
+
+    versions = [version for version, _ in archive.iter_frames()]
+    assert versions[:200] == [0] * 200 and set(versions[200:]) == {1}
+    assert len(list(PageArchive("x-rates"))) == 220
+
+def test_dictionary_is_trained_once_across_instances(monkeypatch):
+    """Test that a writer that read the dictionaries before another one trained does not train a second version"""
+    monkeypatch.setattr(page_archive, "TRAIN_AFTER", 200)
+    monkeypatch.setattr(page_archive, "DICTIONARY_SIZE", 4096)
+    first, second = PageArchive("x-rates"), PageArchive("x-rates")
+    assert second.dictionaries() == {}
+    archive_fx_pages(first, 200)
+    assert list(first.dictionaries()) == [1]
+
+    scans = []
+    monkeypatch.setattr(PageArchive, "_count_records", lambda self: scans.append(1) or sum(1 for _ in self.iter_frames()))
+    archive_fx_pages(second, 3)
+    assert list(second.dictionaries()) == [1]
+    assert len(scans) == 1      # counted once, not on every append
+    assert not os.path.exists(os.path.join(first.directory, "x-rates.dict-2"))
+
+def test_reparse_fx_in_process_pool():
+    """Test that archived FX pages are parsed again across worker processes"""
+    archive = PageArchive("x-rates")
+    archive_fx_pages(archive, 16)
+
+    df = reparse_archive.reparse("fx", workers=2)
+
+    assert len(df) == 16
+    eur_usd = df[(df["from"] == "EUR") & (df["to"] == "USD")]
+    assert eur_usd["timestamp"].tolist() == [1_700_000_000, 1_700_000_008]
+    assert eur_usd["rate"].iloc[0] == pytest.approx(float(synthetic_x_rates({"from": "EUR", "to": "USD"})[2].split('Rslt">')[1].split("<")[0]))
+
+def test_reparse_news_and_save(output_dir):
+    """Test that archived news pages are parsed again and a page fetched twice is saved once"""
+    archive = PageArchive("news")
+    for page in [1, 2, 1]:
+        url = f"https://news.example.com/search?kw=%22jer%C3%B3nimo+martins%22&pg={page}"
+        archive.append(url, synthetic_news({"kw": '"jerónimo martins"', "pg": page}, news_pages=2)[2])
+
+    df = reparse_archive.reparse("news", workers=2)
+    reparse_archive.save_reparsed(df, "news")
+
+    assert len(df) == 30
+    first = df.iloc[0]
+    assert first["Title"] == "jerónimo martins article 1-0"
+    assert first["Date"] == "31-12-2024 00:00"
+    assert first["Link"] == "https://news.example.com/articles/1-0"
+    saved = save_tools.load_existing_dataframe("reparsed_jerónimo martins_news.csv", columns=["Title"])
+    assert len(saved) == 20
+
+def test_reparse_imports_without_scraper_environment():
+    """Test that the offline re-parse needs neither NEWS_PAGE_URL nor the browser packages"""
+    src_dir = os.path.dirname(os.path.abspath(reparse_archive.__file__))
+    env = {key: value for key, value in os.environ.items() if key != "NEWS_PAGE_URL"}
+    code = "import sys, reparse_archive; assert 'webscraping_selenium' not in sys.modules and 'undetected_chromedriver' not in sys.modules"
+    result = subprocess.run([sys.executable, "-c", code], cwd=src_dir, env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
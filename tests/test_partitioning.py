@@ -0,0 +1,48 @@
+import pandas as pd
+from contextlib import contextmanager
+from utils.sqlalchemy import partitioning
+import data_load_news
+
+class RecordingConnection:
+    def __init__(self):
+        self.statements = []
+
+    def execute(self, statement, params=None):
+        self.statements.append(str(statement))
+
+def test_month_partition_name():
+    """Test the partition naming the retention relies on"""
+    assert partitioning.month_partition_name("news", pd.Timestamp("2024-03-15")) == "news_y2024m03"
+    assert partitioning.PARTITION_NAME_PATTERN.search("news_y2024m03").groups() == ("2024", "03")
+    assert not partitioning.PARTITION_NAME_PATTERN.search(f"news_y2024m03{partitioning.DETACHED_SUFFIX}")
+
+def test_retention_cutoff_counts_the_current_month():
+    """Test that keeping N months keeps the current month and the N-1 before it"""
+    assert partitioning.retention_cutoff(1, today="2024-03-15") == pd.Timestamp("2024-03-01")
+    assert partitioning.retention_cutoff(3, today="2024-03-15") == pd.Timestamp("2024-01-01")
+    assert partitioning.retention_cutoff(24, today="2024-01-31") == pd.Timestamp("2022-02-01")
+
+def test_ensure_month_partitions_creates_missing_months(monkeypatch):
+    """Test that one partition is created per missing month, with its month bounds"""
+    conn = RecordingConnection()
+
+    @contextmanager
+    def begin():
+        yield conn
+
+    monkeypatch.setattr(partitioning.engine, "begin", begin)
+    monkeypatch.setattr(partitioning, "list_partitions", lambda table_name: ["news_y2024m01"])
+    dates = pd.to_datetime(["2024-01-05 10:00", "2024-02-10 08:00", "2024-02-20 09:30", "2023-12-31 23:00", None])
+
+    created = partitioning.ensure_month_partitions("news", dates)
+
+    assert created == ["news_y2023m12", "news_y2024m02"]
+    assert "FOR VALUES FROM ('2023-12-01') TO ('2024-01-01')" in conn.statements[0]
+    assert "FOR VALUES FROM ('2024-02-01') TO ('2024-03-01')" in conn.statements[1]
+
+def test_drop_expired_rows_skips_detached_months(monkeypatch):
+    """Test that reloading the full CSV does not bring back rows older than the retention window"""
+    monkeypatch.setattr(partitioning, "retention_cutoff", lambda keep_months: pd.Timestamp("2024-02-01"))
+    df = pd.DataFrame({"date": pd.to_datetime(["2024-01-31 10:00", "2024-02-01 00:00", "2024-03-02 12:00"]), "title": ["a", "b", "c"]})
+
+    assert data_load_news.drop_expired_rows(df, 2)["title"].tolist() == ["b", "c"]
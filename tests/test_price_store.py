@@ -0,0 +1,75 @@
+import os
+import numpy as np
+import pandas as pd
+from api_v2 import process_data
+from utils import save_tools, price_store
+from utils.price_store import PriceStore, to_days
+
+def time_series(months, close=10.0):
+    return {
+        f"2024-{month:02d}-28": {
+            "1. open": "9.5", "2. high": "11.0", "3. low": "9.0", "4. close": str(close + month),
+            "5. adjusted close": str(close + month), "6. volume": "1000", "7. dividend amount": "0.0000",
+        }
+        for month in months
+    }
+
+def test_range_read_is_a_memmap_slice(tmp_path):
+    """Test that a range read returns the stored values as views of the mapped files"""
+    store = PriceStore(str(tmp_path))
+    store.write("JMT.LS", process_data(time_series(range(1, 13))))
+
+    prices = store.read("JMT.LS", "2024-03-01", "2024-05-28", columns=["date", "close", "volume"])
+
+    assert prices["close"].tolist() == [13.0, 14.0, 15.0]
+    assert prices["volume"].dtype == np.int64 and prices["volume"].tolist() == [1000] * 3
+    assert prices["date"].tolist() == to_days(["2024-03-28", "2024-04-28", "2024-05-28"]).tolist()
+    assert isinstance(prices["close"].base, np.memmap) or isinstance(prices["close"], np.memmap)
+    assert store.read("JMT.LS", "2025-01-01")["close"].size == 0
+
+def test_rewrite_is_seen_by_open_store(tmp_path, monkeypatch):
+    """Test that a rewritten series replaces the mapped one and that the default folder is the data folder"""
+    monkeypatch.setattr(save_tools, "OUTPUT_DIR", str(tmp_path))
+    reader, writer = PriceStore(), PriceStore()
+    writer.write("JMT.LS", process_data(time_series([1, 2])))
+    assert len(reader.read("JMT.LS")["close"]) == 2
+
+    writer.write("JMT.LS", process_data(time_series([1, 2, 3], close=20.0)))
+    frame = reader.read_frame("JMT.LS", start="2024-02-01", columns=["adjusted_close"])
+
+    assert frame["adjusted_close"].tolist() == [22.0, 23.0]
+    assert frame.index[0] == pd.Timestamp("2024-02-28")
+    assert reader.symbols() == ["JMT.LS"]
+    assert (tmp_path / "price_store" / "JMT.LS" / "meta.json").exists()
+
+def test_mapped_symbols_are_bounded(tmp_path, monkeypatch):
+    """Test that reading more symbols than MAX_MAPPED_SYMBOLS keeps only the most recently read ones mapped"""
+    monkeypatch.setattr(price_store, "MAX_MAPPED_SYMBOLS", 2)
+    store = PriceStore(str(tmp_path))
+    for symbol in ["A", "B", "C"]:
+        store.write(symbol, process_data(time_series([1, 2])))
+        store.read(symbol)
+    store.read("B")
+    store.read("A")
+
+    assert list(store._maps) == ["B", "A"]
+    assert store.read("C")["close"].tolist() == [11.0, 12.0]
+
+def test_rewrite_publishes_new_column_files(tmp_path, monkeypatch):
+    """Test that a reader holding an old meta file never maps the columns of a newer write with its row count"""
+    writer, reader = PriceStore(str(tmp_path)), PriceStore(str(tmp_path))
+    writer.write("JMT.LS", process_data(time_series([1, 2])))
+    old_close = reader.read("JMT.LS")["close"]
+
+    original_load = price_store.json.load
+    def load_then_rewrite(file):
+        meta = original_load(file)
+        if meta["rows"] == 2:       # a write lands between reading the meta file and mapping its columns
+            writer.write("JMT.LS", process_data(time_series([1, 2, 3], close=20.0)))
+        return meta
+    monkeypatch.setattr(price_store.json, "load", load_then_rewrite)
+    reader._maps.clear()
+
+    assert reader.read("JMT.LS")["close"].tolist() == [21.0, 22.0, 23.0]
+    assert old_close.tolist() == [11.0, 12.0]       # views of the previous write stay valid
+    assert len([name for name in os.listdir(tmp_path / "JMT.LS") if name.endswith(".bin")]) == len(price_store.COLUMN_DTYPES)
@@ -0,0 +1,120 @@
+import pandas as pd
+import pytest
+import requests
+from sqlalchemy import create_engine, MetaData, Column, String, Text, DateTime, Float
+from utils import save_tools
+from utils.sqlalchemy import config
+import read_api
+import stream_stocks
+
+@pytest.fixture
+def read_server(tmp_path, monkeypatch):
+    """Serve the read API over a temporary embedded database and data folder"""
+    monkeypatch.setattr(config, "DB_BACKEND", "sqlite")
+    monkeypatch.setattr(config, "engine", create_engine(f"sqlite:///{tmp_path / 'test.db'}"))
+    monkeypatch.setattr(config, "metadata", MetaData())
+    monkeypatch.setattr(save_tools, "OUTPUT_DIR", str(tmp_path))
+    server = read_api.start_server()
+    yield server
+    server.shutdown()
+
+def load_prices(symbol, months, close=10.0):
+    stream_stocks.create_prices_table()
+    config.insert_data(stream_stocks.TABLE_NAME, [
+        {"symbol": symbol, "date": pd.Timestamp(f"2024-{month:02d}-28").date(), "close": close + month, "volume": 1000}
+        for month in months
+    ], conflict_columns=["symbol", "date"])
+
+def test_prices_keyset_pagination_and_range(read_server):
+    """Test that pages follow each other through the cursor and respect the date range"""
+    load_prices("JMT.LS", range(1, 8))
+    load_prices("GALP.LS", [1])
+
+    url = f"{read_server.base_url}/prices"
+    first = requests.get(url, params={"symbol": "JMT.LS", "start": "2024-02-01", "end": "2024-06-28", "limit": 2}).json()
+    second = requests.get(url, params={"symbol": "JMT.LS", "start": "2024-02-01", "end": "2024-06-28", "limit": 2, "cursor": first["next_cursor"]}).json()
+    last = requests.get(url, params={"symbol": "JMT.LS", "start": "2024-02-01", "end": "2024-06-28", "limit": 2, "cursor": second["next_cursor"]}).json()
+
+    assert [row["close"] for row in first["items"] + second["items"] + last["items"]] == [12.0, 13.0, 14.0, 15.0, 16.0]
+    assert last["next_cursor"] is None
+    assert requests.get(url).status_code == 400
+    assert requests.get(url, params={"symbol": "JMT.LS", "cursor": "%%%"}).status_code == 400
+
+def test_etag_and_cache_invalidation_on_write(read_server):
+    """Test conditional responses and that a load invalidates the cached result"""
+    load_prices("JMT.LS", [1, 2])
+    url = f"{read_server.base_url}/prices?symbol=JMT.LS"
+
+    response = requests.get(url)
+    assert requests.get(url, headers={"If-None-Match": response.headers["ETag"]}).status_code == 304
+    assert read_server.cache.hits == 1
+
+    load_prices("JMT.LS", [3])
+    updated = requests.get(url, headers={"If-None-Match": response.headers["ETag"]})
+    assert updated.status_code == 200
+    assert len(updated.json()["items"]) == 3
+
+def create_news_table():
+    config.create_table_if_not_exists("news", [
+        Column("id", config.ID_TYPE, primary_key=True, autoincrement=True),
+        Column("date", DateTime, nullable=False), Column("title", String, nullable=False), Column("link", String),
+        Column("summary", Text), Column("sentiment", Float), Column("companies", String), Column("tickers", String),
+    ], unique_constraints=[("date", "title")])
+
+def test_news_search_pages_newest_first(read_server):
+    """Test the keyword search and the (date, id) cursor on rows sharing a date"""
+    create_news_table()
+    config.insert_data("news", [
+        {"date": pd.Timestamp("2024-03-01 10:00").to_pydatetime(), "title": f"Biedronka {n}", "summary": "", "link": ""} for n in range(3)
+    ] + [{"date": pd.Timestamp("2024-03-02 09:00").to_pydatetime(), "title": "Galp results", "summary": "Biedronka too", "link": ""},
+         {"date": pd.Timestamp("2024-04-01 09:00").to_pydatetime(), "title": "Other news", "summary": "", "link": ""}])
+
+    url = f"{read_server.base_url}/news"
+    titles, cursor = [], None
+    while True:
+        page = requests.get(url, params={"q": "BIEDRONKA", "end": "2024-03-31", "limit": 2, **({"cursor": cursor} if cursor else {})}).json()
+        titles += [item["title"] for item in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert titles == ["Galp results", "Biedronka 2", "Biedronka 1", "Biedronka 0"]
+
+def test_news_search_wildcards_are_literal(read_server):
+    """Test that "%" and "_" in the keyword are not LIKE wildcards"""
+    create_news_table()
+    config.insert_data("news", [
+        {"date": pd.Timestamp("2024-03-01 10:00").to_pydatetime(), "title": title, "summary": "", "link": ""}
+        for title in ["Lucro sobe 100%", "Lucro sobe 1000 euros", "Galp_Energia", "Galp Energia"]
+    ])
+
+    url = f"{read_server.base_url}/news"
+    assert [item["title"] for item in requests.get(url, params={"q": "100%"}).json()["items"]] == ["Lucro sobe 100%"]
+    assert [item["title"] for item in requests.get(url, params={"q": "galp_"}).json()["items"]] == ["Galp_Energia"]
+
+def test_cursor_of_another_endpoint_is_rejected(read_server):
+    """Test that cursors without the expected sort key are answered with 400 instead of a server error"""
+    load_prices("JMT.LS", [1, 2])
+    create_news_table()
+    news_cursor = read_api.encode_cursor(["2024-03-01 10:00:00", 3])
+    prices_cursor = read_api.encode_cursor(["2024-01-28"])
+
+    assert requests.get(f"{read_server.base_url}/prices", params={"symbol": "JMT.LS", "cursor": news_cursor}).status_code == 400
+    assert requests.get(f"{read_server.base_url}/news", params={"cursor": prices_cursor}).status_code == 400
+    assert requests.get(f"{read_server.base_url}/news", params={"cursor": read_api.encode_cursor({"date": 1})}).status_code == 400
+    assert requests.get(f"{read_server.base_url}/prices", params={"symbol": "JMT.LS", "cursor": prices_cursor}).json()["items"][0]["close"] == 12.0
+
+def test_fx_as_of_rates(read_server, tmp_path):
+    """Test as-of rates from the FX files, reloaded when a file changes"""
+    path = tmp_path / "currency_exchange_rate_EUR_USD.csv"
+    rates = pd.DataFrame({"timestamp": [1704067200, 1706745600], "insert_date": ["2024-01-01 00:00:00", "2024-02-01 00:00:00"],
+                          "from": "EUR", "to": "USD", "rate": [1.1, 1.2], "amount": 1})
+    rates.to_csv(path, index=False)
+
+    url = f"{read_server.base_url}/fx"
+    body = requests.get(url, params={"from": "eur", "to": "USD", "at": ["2024-01-15", "1706745600", "2023-12-01"]}).json()
+    assert [item["rate"] for item in body["items"]] == [1.1, 1.2, None]
+    assert requests.get(url, params={"from": "EUR", "to": "JPY"}).status_code == 404
+
+    rates.assign(rate=[1.1, 1.25]).to_csv(path, index=False)
+    assert requests.get(url, params={"from": "EUR", "to": "USD"}).json()["items"][0]["rate"] == 1.25
@@ -0,0 +1,69 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+import pytest
+from utils import save_tools
+
+@pytest.fixture(autouse=True)
+def output_dir(tmp_path, monkeypatch):
+    """Write the test files to a temporary data folder"""
+    monkeypatch.setattr(save_tools, "OUTPUT_DIR", str(tmp_path))
+    return tmp_path
+
+def test_concurrent_appends_write_one_header(output_dir):
+    """Test that parallel appends to a new file keep a single header and every row"""
+    def append(i):
+        save_tools.save_to_csv(pd.DataFrame({"rate": [i], "to": ["USD"]}), "rates.csv", append_data=True)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(append, range(40)))
+
+    df = pd.read_csv(output_dir / "rates.csv")
+    assert list(df.columns) == ["rate", "to"]
+    assert sorted(df["rate"]) == list(range(40))
+
+def test_overwrite_replaces_file_without_leftovers(output_dir):
+    """Test that an overwrite goes through a temporary file that is renamed over the target"""
+    save_tools.save_to_csv(pd.DataFrame({"a": [1, 2]}), "data.csv", ignore_overwrite=True)
+    save_tools.save_to_csv(pd.DataFrame({"a": [3]}), "data.csv", ignore_overwrite=True)
+
+    assert pd.read_csv(output_dir / "data.csv")["a"].tolist() == [3]
+    assert not [name for name in os.listdir(output_dir) if name.endswith(".tmp")]
+
+def test_rewrites_keep_file_mode_and_leave_no_lock_files(output_dir, tmp_path_factory, monkeypatch):
+    """Test that a rewritten CSV keeps its mode (not mkstemp's 0600) and the locks stay out of the data folder"""
+    monkeypatch.setattr(save_tools, "LOCK_DIR", str(tmp_path_factory.mktemp("locks")))
+    save_tools.save_to_csv(pd.DataFrame({"a": [1]}), "data.csv", ignore_overwrite=True)
+    umask = os.umask(0)
+    os.umask(umask)
+    assert os.stat(output_dir / "data.csv").st_mode & 0o777 == 0o666 & ~umask
+
+    os.chmod(output_dir / "data.csv", 0o640)
+    save_tools.save_to_csv(pd.DataFrame({"a": [2]}), "data.csv", ignore_overwrite=True)
+    save_tools.save_to_csv(pd.DataFrame({"a": [3]}), "data.csv", append_data=True)
+
+    assert os.stat(output_dir / "data.csv").st_mode & 0o777 == 0o640
+    assert os.listdir(output_dir) == ["data.csv"]
+
+def test_new_file_mode_does_not_touch_the_process_umask(tmp_path, monkeypatch):
+    """Test that the default mode of a new file is computed without setting the umask (other threads would see 0)"""
+    umask = os.umask(0o027)
+    try:
+        monkeypatch.setattr(os, "umask", lambda mask: pytest.fail("os.umask called"))
+        temp_path = tmp_path / "new.tmp"
+        temp_path.write_text("a")
+        save_tools.copy_file_mode(str(temp_path), str(tmp_path / "new.csv"))
+        assert os.stat(temp_path).st_mode & 0o777 == 0o640
+    finally:
+        monkeypatch.undo()
+        os.umask(umask)
+
+def test_csv_append_buffer_flushes_in_batches(output_dir, mocker):
+    """Test that the buffer batches small appends into few writes"""
+    spy = mocker.spy(save_tools, "_append_csv")
+    with save_tools.CsvAppendBuffer("buffered.csv", max_rows=5) as buffer:
+        for i in range(12):
+            buffer.append(pd.DataFrame({"a": [i]}))
+
+    assert spy.call_count == 3
+    assert pd.read_csv(output_dir / "buffered.csv")["a"].tolist() == list(range(12))
@@ -0,0 +1,65 @@
+import pandas as pd
+import pytest
+from utils import save_tools, schemas
+
+NEWS_CSV = (
+    "Title,Date,Link,Summary,sentiment,companies,tickers\n"
+    "Jerónimo Martins sobe,01-02-2024 10:30,https://a.pt/1,Resumo,0.5,Jerónimo Martins,JMT.LS\n"
+    "Sonae cai,02-02-2024 11:00,https://a.pt/2,,-0.25,,\n"
+)
+
+@pytest.fixture
+def news_path(tmp_path):
+    path = tmp_path / "news.csv"
+    path.write_text(NEWS_CSV, encoding="utf-8")
+    return path
+
+def test_read_dataset_applies_registered_types(news_path):
+    """Test that strings are Arrow-backed, tags categorical and dates parsed"""
+    df = schemas.read_dataset(news_path, "news")
+
+    assert df["Title"].dtype == "string[pyarrow]"
+    assert df["companies"].dtype == "category"
+    assert df["sentiment"].dtype == "float32"
+    assert df["Date"].tolist() == [pd.Timestamp("2024-02-01 10:30"), pd.Timestamp("2024-02-02 11:00")]
+    assert df["Summary"].isna().tolist() == [False, True]
+
+def test_read_dataset_projects_columns_and_skips_missing_ones(news_path):
+    """Test that usecols only reads the requested columns, even when some are absent from the file"""
+    df = schemas.read_dataset(news_path, "news", usecols=["Link", "not_in_file"])
+    assert list(df.columns) == ["Link"]
+
+def test_iter_dataset_yields_typed_chunks(news_path):
+    """Test that chunked reads keep the types and cover every row"""
+    chunks = list(schemas.iter_dataset(news_path, "news", chunksize=1, parse_dates=False))
+
+    assert len(chunks) == 2
+    assert all(chunk["Title"].dtype == "string[pyarrow]" for chunk in chunks)
+    assert chunks[1]["Date"].tolist() == ["02-02-2024 11:00"]
+
+def test_unknown_dataset_raises():
+    """Test that asking for a schema that is not registered fails loudly"""
+    with pytest.raises(ValueError):
+        schemas.get_schema("weather")
+
+def test_append_aligns_columns_to_existing_header(tmp_path, monkeypatch):
+    """Test that appended rows follow the column order of the existing file"""
+    monkeypatch.setattr(save_tools, "OUTPUT_DIR", str(tmp_path))
+    save_tools.save_to_csv(pd.DataFrame({"Title": ["a"], "Date": ["01-01-2024 00:00"], "sentiment": [0.1]}), "news.csv")
+    save_tools.save_to_csv(pd.DataFrame({"Date": ["02-01-2024 00:00"], "Title": ["b"]}), "news.csv", append_data=True)
+
+    df = save_tools.load_existing_dataframe("news.csv", columns=["Title"], dataset="news", parse_dates=False)
+    assert df["Title"].tolist() == ["a", "b"]
+    assert df["Date"].tolist() == ["01-01-2024 00:00", "02-01-2024 00:00"]
+    assert df["sentiment"].isna().tolist() == [False, True]
+
+def test_append_with_new_columns_keeps_them(tmp_path, monkeypatch):
+    """Test that appended rows with a column the file lacks are not silently cut down"""
+    monkeypatch.setattr(save_tools, "OUTPUT_DIR", str(tmp_path))
+    save_tools.save_to_csv(pd.DataFrame({"Title": ["a"], "Date": ["01-01-2024 00:00"]}), "news.csv")
+    save_tools.save_to_csv(pd.DataFrame({"Title": ["b"], "Date": ["02-01-2024 00:00"], "sentiment": [0.5]}), "news.csv", append_data=True)
+
+    df = pd.read_csv(tmp_path / "news.csv")
+    assert list(df.columns) == ["Title", "Date", "sentiment"]
+    assert df["Title"].tolist() == ["a", "b"]
+    assert df["sentiment"].isna().tolist() == [True, False]
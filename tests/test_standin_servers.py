@@ -0,0 +1,50 @@
+import pytest
+import api_v2
+import standin_servers
+import webscraping_beautifulsoup
+from standin_servers import start_standin_server, save_recording
+
+@pytest.fixture
+def standin(tmp_path, monkeypatch):
+    """Local stand-in server with recordings in a temporary folder"""
+    monkeypatch.setattr(standin_servers, "RECORDINGS_DIR", str(tmp_path))
+    servers = []
+
+    def start(**config):
+        server = start_standin_server(**config)
+        servers.append(server)
+        monkeypatch.setattr(api_v2, "URL", f"{server.base_url}/query")
+        monkeypatch.setattr(webscraping_beautifulsoup, "CURRENCY_PAGE_URL", f"{server.base_url}/calculator/")
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+
+def test_synthetic_stock_data_is_processed(standin):
+    """Test that the Alpha Vantage stand-in feeds fetch_stock_data and process_data"""
+    standin()
+    time_series = api_v2.fetch_stock_data("JMT.LS")
+    df = api_v2.process_data(time_series)
+    assert len(df) == 240
+    assert (df["close"].astype(float) > 0).all()
+
+def test_synthetic_currency_rate(standin):
+    """Test that the x-rates stand-in is parsed by fetch_currency_rates"""
+    standin()
+    df = webscraping_beautifulsoup.fetch_currency_rates("EUR", "USD")
+    assert df is not None
+    assert df.iloc[0]["rate"] > 0
+
+def test_throttling_payload(standin):
+    """Test that a throttled Alpha Vantage call is handled as a failure"""
+    standin(throttle_rate=1.0)
+    assert api_v2.fetch_stock_data("JMT.LS") is None
+
+def test_recorded_response_is_replayed(standin):
+    """Test that a recording takes precedence over the synthetic response (the API key is not part of the key)"""
+    save_recording("x_rates", {"from": "EUR", "to": "USD", "amount": "1"}, 200, "text/html",
+                   '<span class="ccOutputRslt">1.234500 USD</span>')
+    standin()
+    df = webscraping_beautifulsoup.fetch_currency_rates("EUR", "USD")
+    assert df.iloc[0]["rate"] == 1.2345
@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+import pytest
+from utils.stock_analytics import compute_analytics, select_new_periods, ANALYTICS_COLUMNS
+
+@pytest.fixture
+def prices():
+    """Monthly adjusted prices with one dividend and one drawdown"""
+    return pd.DataFrame({
+        "date": pd.to_datetime(["2024-01-31", "2024-02-29", "2024-03-31", "2024-04-30"]),
+        "open": ["10", "11", "12", "9"],
+        "high": ["11", "12", "13", "10"],
+        "low": ["9", "10", "11", "8"],
+        "close": ["10", "12", "9", "10"],
+        "adjusted_close": ["10", "12.5", "9.375", "10.4166"],
+        "volume": ["100", "200", "300", "400"],
+        "dividend_amount": ["0", "0.5", "0", "0"],
+    })
+
+def test_compute_analytics_columns(prices):
+    """Test that compute_analytics returns one row per period with the expected columns"""
+    analytics = compute_analytics(prices)
+    assert list(analytics.columns) == ANALYTICS_COLUMNS
+    assert len(analytics) == len(prices)
+
+def test_compute_analytics_returns(prices):
+    """Test price and total returns, including the dividend reconciliation"""
+    analytics = compute_analytics(prices)
+    assert np.isnan(analytics["price_return"].iloc[0])
+    assert analytics["price_return"].iloc[1] == pytest.approx(0.2)
+    assert analytics["total_return"].iloc[1] == pytest.approx(0.25)
+    # (12 + 0.5) / 10 - 1 == 0.25, so the adjusted close reconciles with close and dividends
+    assert analytics["reconciliation_gap"].iloc[1] == pytest.approx(0.0)
+
+def test_compute_analytics_drawdown_and_yield(prices):
+    """Test drawdown against the running peak and the trailing dividend yield"""
+    analytics = compute_analytics(prices)
+    assert analytics["drawdown"].iloc[1] == pytest.approx(0.0)
+    assert analytics["drawdown"].iloc[2] == pytest.approx(9.375 / 12.5 - 1)
+    assert analytics["trailing_dividend_yield"].iloc[2] == pytest.approx(0.5 / 9)
+
+def test_select_new_periods(prices):
+    """Test that only the last stored period and newer ones are kept"""
+    analytics = compute_analytics(prices)
+    assert len(select_new_periods(analytics, None)) == 4
+    assert len(select_new_periods(analytics, pd.Timestamp("2024-03-31"))) == 2
@@ -0,0 +1,49 @@
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, Column, String, Float, MetaData
+from utils.sqlalchemy import config
+
+@pytest.fixture
+def sqlite_backend(tmp_path, monkeypatch):
+    """Point the sqlalchemy helpers to a temporary embedded database"""
+    monkeypatch.setattr(config, "DB_BACKEND", "sqlite")
+    monkeypatch.setattr(config, "engine", create_engine(f"sqlite:///{tmp_path / 'test.db'}"))
+    monkeypatch.setattr(config, "metadata", MetaData())
+    return tmp_path
+
+def test_get_backend_without_postgres_variables(monkeypatch):
+    """Test that the embedded backend is used when PostgreSQL is not configured"""
+    monkeypatch.delenv("DB_BACKEND", raising=False)
+    for var in config.POSTGRES_ENV_VARS:
+        monkeypatch.delenv(var, raising=False)
+    assert config.get_backend() == "sqlite"
+
+def test_sqlite_upsert(sqlite_backend):
+    """Test create_table_if_not_exists and insert_data with ON CONFLICT on SQLite"""
+    columns = [
+        Column("id", config.ID_TYPE, primary_key=True, autoincrement=True),
+        Column("symbol", String, nullable=False),
+        Column("price", Float),
+    ]
+    config.create_table_if_not_exists("prices", columns, unique_constraints=[("symbol",)])
+    config.insert_data("prices", [{"symbol": "JMT.LS", "price": 1.0}, {"symbol": "GALP.LS", "price": 2.0}], conflict_columns=["symbol"])
+    config.insert_data("prices", [{"symbol": "JMT.LS", "price": 3.0}], conflict_columns=["symbol"])
+
+    df = config.query_dataframe("SELECT symbol, price FROM prices ORDER BY symbol")
+    assert df.to_dict(orient="records") == [{"symbol": "GALP.LS", "price": 2.0}, {"symbol": "JMT.LS", "price": 3.0}]
+
+def test_insert_without_table_columns_inserts_nothing(sqlite_backend):
+    """Test that records with no column of the table are reported as 0 rows instead of crashing"""
+    config.create_table_if_not_exists("t", [Column("id", config.ID_TYPE, primary_key=True, autoincrement=True), Column("symbol", String)])
+    assert config.insert_data("t", [{"zzz": 1}]) == 0
+    assert config.insert_data("t", [{"zzz": 1}, {"symbol": "JMT.LS"}]) == 1
+
+def test_load_file_as_table(sqlite_backend):
+    """Test that a project CSV can be queried with SQL"""
+    path = sqlite_backend / "currency_exchange_rate_EUR_USD.csv"
+    pd.DataFrame({"from": ["EUR", "EUR"], "to": ["USD", "USD"], "rate": [1.1, 1.2]}).to_csv(path, index=False)
+
+    table_name = config.load_file_as_table(str(path))
+    df = config.query_dataframe(f"SELECT MAX(rate) AS max_rate FROM {table_name}")
+    assert table_name == "currency_exchange_rate_eur_usd"
+    assert df["max_rate"].iloc[0] == 1.2
@@ -0,0 +1,65 @@
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, MetaData
+from utils import save_tools
+from utils.sqlalchemy import config
+import stream_stocks
+
+def time_series(months, close=10.0):
+    return {
+        f"2024-{month:02d}-28": {
+            "1. open": "9.5", "2. high": "11.0", "3. low": "9.0", "4. close": str(close + month),
+            "5. adjusted close": str(close + month), "6. volume": "1000", "7. dividend amount": "0.0000",
+        }
+        for month in months
+    }
+
+@pytest.fixture
+def sqlite_backend(tmp_path, monkeypatch):
+    """Point the loader to a temporary embedded database and data folder"""
+    monkeypatch.setattr(config, "DB_BACKEND", "sqlite")
+    monkeypatch.setattr(config, "engine", create_engine(f"sqlite:///{tmp_path / 'test.db'}"))
+    monkeypatch.setattr(config, "metadata", MetaData())
+    monkeypatch.setattr(save_tools, "OUTPUT_DIR", str(tmp_path))
+    return tmp_path
+
+def test_stream_loads_every_symbol_without_csv(sqlite_backend, monkeypatch):
+    """Test that fetched frames reach the table directly and a failed fetch does not stop the stream"""
+    responses = {"JMT.LS": time_series([1, 2, 3]), "GALP.LS": time_series([1, 2]), "BAD.LS": None}
+    monkeypatch.setattr(stream_stocks, "fetch_stock_data", lambda symbol, session=None: responses.get(symbol))
+
+    loaded = stream_stocks.stream_symbols(["JMT.LS", "BAD.LS", "GALP.LS"], queue_size=1)
+
+    df = config.query_dataframe(f"SELECT symbol, date, close, volume FROM {stream_stocks.TABLE_NAME} ORDER BY symbol, date")
+    assert loaded == 5
+    assert df.groupby("symbol").size().to_dict() == {"GALP.LS": 2, "JMT.LS": 3}
+    assert df["close"].iloc[-1] == 13.0 and df["volume"].iloc[-1] == 1000
+    assert not list(sqlite_backend.glob("*.csv"))
+
+def test_stream_upserts_and_archives_parquet(sqlite_backend, monkeypatch):
+    """Test that a second stream updates the rows and keeps a Parquet copy"""
+    monkeypatch.setattr(stream_stocks, "fetch_stock_data", lambda symbol, session=None: time_series([1, 2], close=20.0))
+    stream_stocks.stream_symbols(["JMT.LS"])
+    stream_stocks.stream_symbols(["JMT.LS"], archive_format="parquet")
+
+    df = config.query_dataframe(f"SELECT date, close FROM {stream_stocks.TABLE_NAME} ORDER BY date")
+    assert df["close"].tolist() == [21.0, 22.0]
+    archived = pd.read_parquet(sqlite_backend / "parquet" / "JMT.LS_monthly_adjusted_data.parquet")
+    assert archived["close"].tolist() == [21.0, 22.0]
+
+def test_loader_failure_stops_the_fetcher(sqlite_backend, monkeypatch):
+    """Test that a failing load is raised instead of leaving the fetcher blocked on a full queue"""
+    monkeypatch.setattr(stream_stocks, "fetch_stock_data", lambda symbol, session=None: time_series([1]))
+    monkeypatch.setattr(stream_stocks, "insert_data", lambda *args, **kwargs: 1 / 0)
+
+    with pytest.raises(ZeroDivisionError):
+        stream_stocks.stream_symbols([f"SYM{i}" for i in range(50)], queue_size=1)
+
+def test_bad_payload_and_failed_insert_are_not_counted(sqlite_backend, monkeypatch):
+    """Test that a payload process_data cannot parse skips the symbol and a failed insert adds no rows"""
+    responses = {"JMT.LS": time_series([1, 2]), "BAD.LS": {"2024-01-28": {"1. open": "1"}}, "GALP.LS": time_series([1])}
+    monkeypatch.setattr(stream_stocks, "fetch_stock_data", lambda symbol, session=None: responses[symbol])
+    assert stream_stocks.stream_symbols(["JMT.LS", "BAD.LS", "GALP.LS"]) == 3
+
+    monkeypatch.setattr(stream_stocks, "insert_data", lambda *args, **kwargs: 0)
+    assert stream_stocks.stream_symbols(["JMT.LS"]) == 0
@@ -0,0 +1,83 @@
+import symbol_universe
+from api_v2 import ApiThrottled
+from symbol_universe import plan_calls, record_fetch, record_call, calls_spent_today, state_key, MIN_REFRESH_INTERVAL
+from utils import save_tools
+
+NOW = 1_700_000_000
+DAY = 86400
+
+def test_plan_calls_prioritizes_new_then_stale_and_volatile():
+    """Test the order of the daily plan and the API budget"""
+    state = {
+        state_key("STALE.LS", "monthly_adjusted"): {"last_fetched": NOW - 10 * DAY, "fetches": 4, "changes": 4},
+        state_key("CALM.LS", "monthly_adjusted"): {"last_fetched": NOW - 10 * DAY, "fetches": 4, "changes": 0},
+        state_key("VOLATILE.LS", "monthly_adjusted"): {"last_fetched": NOW - 10 * DAY, "fetches": 4, "changes": 4, "volatility": 0.5},
+        state_key("FRESH.LS", "monthly_adjusted"): {"last_fetched": NOW - MIN_REFRESH_INTERVAL / 2, "fetches": 1, "changes": 1},
+    }
+    symbols = ["CALM.LS", "STALE.LS", "FRESH.LS", "NEW.LS", "VOLATILE.LS"]
+
+    plan = [symbol for symbol, _, _ in plan_calls(symbols, state, budget=10, now=NOW)]
+    assert plan == ["NEW.LS", "VOLATILE.LS", "STALE.LS", "CALM.LS"]   # FRESH.LS is not due
+
+    assert len(plan_calls(symbols, state, budget=2, now=NOW)) == 2
+
+def test_record_fetch_detects_changes():
+    """Test that unchanged payloads do not count as changes"""
+    state = {}
+    payload = {"2024-01-31": {"4. close": "10"}}
+    record_fetch(state, "JMT.LS", "monthly_adjusted", payload, now=NOW)
+    record_fetch(state, "JMT.LS", "monthly_adjusted", payload, now=NOW + DAY)
+
+    entry = state[state_key("JMT.LS", "monthly_adjusted")]
+    assert entry["fetches"] == 2
+    assert entry["changes"] == 1
+    assert entry["last_fetched"] == NOW + DAY
+    assert entry["last_changed"] == NOW
+
+def test_run_daily_respects_calls_spent_today(tmp_path, monkeypatch):
+    """Test that a second run on the same day only spends what is left of the budget and stops when throttled"""
+    monkeypatch.setattr(save_tools, "OUTPUT_DIR", str(tmp_path))
+    calls = []
+
+    def fake_fetch(symbol, raise_on_throttle=False):
+        calls.append(symbol)
+        if symbol == "THROTTLED.LS":
+            raise ApiThrottled("25 requests per day")
+        return None     # failed calls count against the budget too
+
+    monkeypatch.setattr(symbol_universe, "fetch_stock_data", fake_fetch)
+    symbol_universe.run_daily(["A.LS", "B.LS", "C.LS"], budget=2)
+    symbol_universe.run_daily(["A.LS", "B.LS", "C.LS"], budget=2)
+    assert len(calls) == 2
+    assert symbol_universe.calls_spent_today(symbol_universe.load_state()) == 2
+
+    calls.clear()
+    symbol_universe.run_daily(["THROTTLED.LS", "D.LS"], budget=5)
+    assert calls == ["THROTTLED.LS"]
+    assert symbol_universe.calls_spent_today(symbol_universe.load_state()) == 3
+
+def test_calls_spent_reset_on_a_new_utc_day():
+    """Test that yesterday's calls do not count against today's budget"""
+    state = {}
+    record_call(state, now=NOW)
+    record_call(state, now=NOW)
+    assert calls_spent_today(state, now=NOW) == 2
+    assert calls_spent_today(state, now=NOW + DAY) == 0
+
+def test_failed_save_does_not_record_the_fetch(tmp_path, monkeypatch):
+    """Test that a series whose CSV could not be written is saved again by the next run"""
+    monkeypatch.setattr(save_tools, "OUTPUT_DIR", str(tmp_path))
+    payload = {"2024-01-31": {"1. open": "9", "2. high": "11", "3. low": "9", "4. close": "10",
+                              "5. adjusted close": "10", "6. volume": "100", "7. dividend amount": "0"}}
+    monkeypatch.setattr(symbol_universe, "fetch_stock_data", lambda symbol, raise_on_throttle=False: payload)
+    monkeypatch.setattr(save_tools, "save_to_csv", lambda *args, **kwargs: False)
+
+    symbol_universe.run_daily(["JMT.LS"], budget=5)
+    assert state_key("JMT.LS", "monthly_adjusted") not in symbol_universe.load_state()
+
+    monkeypatch.undo()
+    monkeypatch.setattr(save_tools, "OUTPUT_DIR", str(tmp_path))
+    monkeypatch.setattr(symbol_universe, "fetch_stock_data", lambda symbol, raise_on_throttle=False: payload)
+    symbol_universe.run_daily(["JMT.LS"], budget=5)
+    assert (tmp_path / "JMT.LS_monthly_adjusted_data.csv").exists()
+    assert symbol_universe.load_state()[state_key("JMT.LS", "monthly_adjusted")]["content_hash"]
@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+import tag_news
+from tag_news import score_sentiment, find_entities, tag_untagged
+
+def test_score_sentiment_polarity():
+    """Test positive, negative and negated texts"""
+    assert score_sentiment("Jerónimo Martins com lucros recorde") > 0
+    assert score_sentiment("Ações da Galp em queda após prejuízo") < 0
+    assert score_sentiment("Lucro não sobe") < score_sentiment("Lucro sobe")
+    assert score_sentiment("Assembleia geral marcada") == 0
+
+def test_find_entities_matches_aliases_without_accents():
+    """Test that companies are found through their aliases and tickers"""
+    companies, tickers = find_entities("Dona do Pingo Doce e a GALP.LS no PSI")
+    assert companies == "Jerónimo Martins; Galp Energia"
+    assert tickers == "JMT.LS; GALP.LS"
+
+def test_find_entities_prefers_longest_alias():
+    """Test that an alias inside a longer one does not tag a second company"""
+    assert find_entities("EDP Renováveis fecha novo parque eólico") == ("EDP Renováveis", "EDPR.LS")
+    assert find_entities("EDP e EDP Renováveis sobem") == ("EDP; EDP Renováveis", "EDP.LS; EDPR.LS")
+
+def test_tag_untagged_only_touches_new_rows(monkeypatch):
+    """Test that rows already tagged are kept and new rows are tagged across chunks"""
+    monkeypatch.setattr(tag_news, "CHUNK_SIZE", 2)
+    df = pd.DataFrame({
+        "Title": ["Lucros da Jerónimo Martins", "Galp em queda", "Sonae cresce", "BCP sobe"],
+        "Summary": ["", "", "", ""],
+        "sentiment": [0.5, np.nan, np.nan, np.nan],
+        "companies": ["Kept", np.nan, np.nan, np.nan],
+        "tickers": ["KEPT", np.nan, np.nan, np.nan],
+    })
+
+    assert tag_untagged(df, workers=2) == 3
+    assert df.loc[0, "companies"] == "Kept"
+    assert df.loc[1, "tickers"] == "GALP.LS"
+    assert df["sentiment"].notna().all()
+    assert tag_untagged(df) == 0
+
+def test_registry_entities_reach_the_workers(monkeypatch):
+    """Test that companies of a JSON registry (aliases with accents) are recognised by the worker processes"""
+    for name in ["COMPANY_ENTITIES", "ALIAS_PATTERN", "ALIAS_COMPANIES", "CHUNK_SIZE"]:
+        monkeypatch.setattr(tag_news, name, getattr(tag_news, name))
+    tag_news.CHUNK_SIZE = 1
+    tag_news.use_entities(tag_news.build_entities([
+        {"name": "Petrobras", "tickers": ["PETR4.SA"], "aliases": ["petróleo brasileiro", "petrobras"]},
+    ]))
+    df = pd.DataFrame({"Title": ["Petróleo Brasileiro sobe", "Galp em queda"], "Summary": ["", ""]})
+
+    assert tag_untagged(df, workers=2) == 2
+    assert df["companies"].tolist() == ["Petrobras", ""]
@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+import pytest
+from utils import save_tools, validation
+
+def stock_frame(periods=5):
+    return pd.DataFrame({
+        "date": pd.date_range("2024-01-31", periods=periods, freq="ME"),
+        "open": 10.0, "high": 11.0, "low": 9.0, "close": 10.5, "adjusted_close": 10.2,
+        "volume": 1000, "dividend_amount": 0.0,
+    })
+
+def test_valid_frame_passes_untouched():
+    """Test that a frame without offending rows is returned as is"""
+    df = stock_frame()
+    valid, rejected = validation.validate(df, "stock")
+    assert valid is df
+    assert rejected.empty
+
+def test_offending_stock_rows_are_rejected_with_reasons():
+    """Test that each failing row is rejected with the names of the checks it failed"""
+    df = stock_frame()
+    df.loc[1, "close"] = -1.0
+    df.loc[2, "low"] = 12.0
+    df.loc[3, "date"] = df.loc[2, "date"]       # duplicate date
+    df.loc[4, "date"] = pd.NaT
+
+    valid, rejected = validation.validate(df, "stock")
+
+    assert valid.index.tolist() == [0]
+    assert rejected["rejection_reasons"].tolist() == [
+        "prices_positive", "low_not_above_high", "dates_increasing", "date_not_null;date_in_range",
+    ]
+
+def test_dates_increasing_is_checked_per_symbol():
+    """Test that dates only have to increase within each symbol"""
+    df = pd.concat([stock_frame(3).assign(symbol="A"), stock_frame(3).assign(symbol="B")], ignore_index=True)
+    valid, rejected = validation.validate(df, "stock")
+    assert rejected.empty
+
+def test_duplicate_news_keys_keep_the_last_row():
+    """Test that only the last row of a repeated (date, title) reaches the upsert"""
+    df = pd.DataFrame({
+        "date": pd.to_datetime(["2024-01-02 10:00", "2024-01-02 10:00", "2024-01-02 10:00"]),
+        "title": ["Galp sobe", "Galp sobe", "Galp desce"],
+        "summary": ["old", "new", "other"],
+    })
+    valid, rejected = validation.validate(df, "news")
+    assert valid["summary"].tolist() == ["new", "other"]
+    assert rejected["rejection_reasons"].tolist() == ["date_title_unique"]
+
+def test_fx_checks_currencies_and_rates():
+    """Test the currency and rate checks of the FX rows"""
+    df = pd.DataFrame({
+        "timestamp": [1_700_000_000] * 4,
+        "from": ["EUR", "EUR", "XXX", "USD"],
+        "to": ["USD", "EUR", "USD", "EUR"],
+        "rate": [1.08, 1.0, 1.0, np.nan],
+    }).astype({"from": "category", "to": "category"})
+
+    valid, rejected = validation.validate(df, "fx")
+
+    assert valid.index.tolist() == [0]
+    assert rejected["rejection_reasons"].tolist() == ["currencies_differ", "from_currency_allowed", "not_null;rate_positive"]
+
+def test_checks_on_missing_columns_are_skipped():
+    """Test that checks whose columns are not in the frame do not reject rows"""
+    df = pd.DataFrame({"date": [pd.Timestamp("2024-01-01")], "title": ["Jerónimo Martins sobe"]})
+    valid, rejected = validation.validate(df, "news")
+    assert len(valid) == 1 and rejected.empty
+
+def test_validate_and_quarantine_appends_rejected_rows(tmp_path, monkeypatch):
+    """Test that rejected rows are appended to the dataset's quarantine file"""
+    monkeypatch.setattr(save_tools, "OUTPUT_DIR", str(tmp_path))
+    df = pd.DataFrame({"date": [pd.Timestamp("2024-01-01"), pd.NaT], "title": ["ok", "no date"]})
+
+    valid = validation.validate_and_quarantine(df, "news")
+
+    assert valid["title"].tolist() == ["ok"]
+    quarantined = pd.read_csv(tmp_path / "quarantine_news.csv")
+    assert quarantined["title"].tolist() == ["no date"]
+    assert quarantined["rejection_reasons"].tolist() == ["date_not_null;date_in_range"]
+
+def test_unknown_dataset_raises():
+    """Test that a dataset without rules raises ValueError"""
+    with pytest.raises(ValueError):
+        validation.validate(pd.DataFrame(), "weather")
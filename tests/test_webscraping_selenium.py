@@ -11,9 +11,12 @@ from dotenv import load_dotenv
 from src.webscraping_selenium import (
     build_search_url,
     scrape_news,
-    load_existing_news
+    load_existing_news,
+    save_crawl,
+    crawl_search
 )
-from utils import save_tools
+import src.webscraping_selenium as webscraping_selenium
+from utils import save_tools, crawl_checkpoint
 
 # Automatically load test environment variables from `.env.test`
 @pytest.fixture(scope="session", autouse=True)
@@ -111,3 +114,38 @@ def test_save_news(mock_save_csv):
 
     save_tools.save_to_csv(news_data, "test_news.csv", ignore_overwrite=True, append_data=False)
     mock_save_csv.assert_called_once()
+
+def test_failed_save_keeps_the_checkpoint(tmp_path, monkeypatch):
+    """Test that the crawl checkpoint is only cleared once the staged articles are saved"""
+    monkeypatch.setattr(save_tools, "OUTPUT_DIR", str(tmp_path))
+    checkpoint_path = str(tmp_path / "test_news_crawl_checkpoint.jsonl")
+    articles = [{"Title": "A", "Date": "01-02-2024 10:00", "Link": "https://example.com/a", "Summary": "..."}]
+    crawl_checkpoint.append_page(checkpoint_path, {"last_page": 1, "pages_scraped": 1}, articles)
+
+    def failing_append(df, output_path, index):
+        raise OSError("No space left on device")
+
+    monkeypatch.setattr(save_tools, "_append_csv", failing_append)
+    assert save_crawl(articles, "test_news.csv", checkpoint_path) is False
+    assert os.path.exists(checkpoint_path)
+
+    monkeypatch.undo()
+    monkeypatch.setattr(save_tools, "OUTPUT_DIR", str(tmp_path))
+    assert save_crawl(articles, "test_news.csv", checkpoint_path) is True
+    assert not os.path.exists(checkpoint_path)
+    assert (tmp_path / "test_news.csv").exists()
+
+def test_crawl_search_stages_new_articles(tmp_path, monkeypatch):
+    """Test that each page of a keyword is staged in its checkpoint and known titles are skipped"""
+    pages = {1: [{"Title": "Known"}, {"Title": "A"}], 2: [{"Title": "B"}], 3: []}
+    monkeypatch.setattr(webscraping_selenium, "scrape_news", lambda driver, url, archive=None, wait_for_results=True: pages[int(url.rsplit("pg=", 1)[1])])
+    monkeypatch.setattr(webscraping_selenium.browser_profiles, "measure_page_load", lambda driver: {"bytes": 1024, "requests": 1})
+    checkpoint_path = str(tmp_path / "galp energia_news_galp_crawl_checkpoint.jsonl")
+    page_stats = {"bytes": 0, "seconds": 0.0, "pages": 0}
+
+    articles = crawl_search(None, '"galp"', checkpoint_path, None, 1, 5, {"Known"}, page_stats=page_stats)
+
+    assert [article["Title"] for article in articles] == ["A", "B"]
+    assert page_stats["pages"] == 3
+    cursor, staged = crawl_checkpoint.load_checkpoint(checkpoint_path)
+    assert cursor["last_page"] == 2 and [article["Title"] for article in staged] == ["A", "B"]